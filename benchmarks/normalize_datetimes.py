@@ -0,0 +1,103 @@
+""" Micro-benchmark of the normalization of DMS API responses (datetimes made JSON serializable). Compares the previous JSON
+round-trip (json.dumps with a datetime encoder followed by json.loads) with the single-pass normalizer and the key projection
+of the replication core layer, on a describe_replication_tasks response carrying the sample task settings and 300 mapping rules.
+
+Usage: python benchmarks/normalize_datetimes.py [--number N]
+"""
+
+import os
+import sys
+import copy
+import json
+import timeit
+import argparse
+from datetime import datetime, timezone
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_PATH, 'src', 'code', 'layers', 'replication_core', 'python'))
+
+from replication_core.serialization import normalize_datetimes, project
+
+# Constant: Represents the keys kept by persist_task_outputs from DMS task details
+REPLICATION_TASK_KEYS = [
+    'ReplicationTaskIdentifier', 'SourceEndpointArn', 'TargetEndpointArn', 'ReplicationInstanceArn',
+    'MigrationType', 'Status', 'StopReason', 'ReplicationTaskCreationDate', 'ReplicationTaskStartDate',
+    'CdcStopPosition', 'RecoveryCheckpoint', 'ReplicationTaskArn', 'ReplicationTaskStats'
+]
+
+# Constant: Number of selection rules of the sample table mappings
+MAPPING_RULES = 300
+
+def json_datetime_encoder(obj):
+    """ Previous datetime encoder used by the JSON round-trip """
+
+    if isinstance(obj, (datetime)): return obj.strftime("%Y-%m-%dT%H:%M:%S")
+
+def json_round_trip(dms_response):
+    """ Previous normalization: serialize and parse the whole response, then keep the task keys """
+
+    task_details = json.loads(json.dumps(dms_response, default=json_datetime_encoder))['ReplicationTasks'][0]
+    return {key: task_details[key] for key in REPLICATION_TASK_KEYS if key in task_details}
+
+def get_sample_response():
+    """ Function to build a describe_replication_tasks response with realistic settings, mappings and stats """
+
+    with open(os.path.join(ROOT_PATH, 'src', 'code', 'dms', 'mysql-postgres-job-01-full', 'settings.json')) as settings_file:
+        settings = json.load(settings_file)
+    mappings = {'rules': [
+        {
+            'rule-type': 'selection', 'rule-id': str(index), 'rule-name': str(index), 'rule-action': 'include',
+            'object-locator': {'schema-name': 'studentdb', 'table-name': f'table_{index:03d}'}
+        }
+        for index in range(1, MAPPING_RULES + 1)
+    ]}
+    now = datetime.now(timezone.utc)
+    arn = 'arn:aws:dms:eu-west-1:123456789012'
+
+    return {'ReplicationTasks': [{
+        'ReplicationTaskIdentifier': 'mysql-postgres-job-01-full',
+        'SourceEndpointArn': f'{arn}:endpoint:SOURCE',
+        'TargetEndpointArn': f'{arn}:endpoint:TARGET',
+        'ReplicationInstanceArn': f'{arn}:rep:INSTANCE',
+        'MigrationType': 'full-load',
+        'TableMappings': json.dumps(mappings),
+        'ReplicationTaskSettings': json.dumps(settings),
+        'Status': 'stopped',
+        'StopReason': 'Stop Reason FULL_LOAD_ONLY_FINISHED',
+        'ReplicationTaskCreationDate': now,
+        'ReplicationTaskStartDate': now,
+        'RecoveryCheckpoint': 'checkpoint:V1#1#mysql-bin-changelog.000001:4:-1:4:0#0#0#*#0#0',
+        'ReplicationTaskArn': f'{arn}:task:TASK',
+        'ReplicationTaskStats': {
+            'FullLoadProgressPercent': 100, 'ElapsedTimeMillis': 123456, 'TablesLoaded': MAPPING_RULES, 'TablesLoading': 0,
+            'TablesQueued': 0, 'TablesErrored': 0, 'FreshStartDate': now, 'StartDate': now, 'StopDate': now,
+            'FullLoadStartDate': now, 'FullLoadFinishDate': now
+        }
+    }]}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--number', type= int, default= 2000, help= 'calls per timed run')
+    number = parser.parse_args().number
+
+    dms_response = get_sample_response()
+    response_size = len(json.dumps(dms_response, default=json_datetime_encoder))
+    assert project(copy.deepcopy(dms_response)['ReplicationTasks'][0], REPLICATION_TASK_KEYS) == json_round_trip(dms_response)
+
+    candidates = {
+        'json round-trip + projection': lambda response: json_round_trip(response),
+        'normalize_datetimes (full response)': lambda response: normalize_datetimes(response),
+        'project(REPLICATION_TASK_KEYS)': lambda response: project(response['ReplicationTasks'][0], REPLICATION_TASK_KEYS)
+    }
+
+    print(f'Response size: {response_size / 1024:.1f} KB, {number} calls per run (best of 3)')
+    for name, candidate in candidates.items():
+        timings = []
+        for _ in range(3):
+            # Normalization is in place, so every call gets its own copy, made before the timed run
+            responses = iter([copy.deepcopy(dms_response) for _ in range(number)])
+            timings.append(timeit.timeit(lambda: candidate(next(responses)), number= number))
+        print(f'{name:40} {min(timings) / number * 1e6:8.1f} us per call')
+
+if __name__ == '__main__':
+    main()
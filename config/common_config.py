@@ -31,11 +31,21 @@ Supported properties are:
     - 'artifact_bucket_name': str. Name of the s3 bucket were artifacts will be deployed.
     - 'replication_jobs_config_prefix': str. String representing the prefix to the folder from within the s3 bucket 
     where DMS task files (settings and mappings) will be stored partitioned by job name.
+    - 'replication_shard_plans_prefix': str. String representing the prefix to the folder from within the s3 bucket where shard plans (tables of each shard
+    of a sharded job) will be stored partitioned by job checkpoint name. Should not be inside 'replication_jobs_config_prefix', which is replaced on every deployment.
     - 'replication_checkpoints_table_name': str. Name of the DynamoDB table where checkpoints will be stored.
-    - 'replication_metrics_table_name': str. Name of the DynamoDB table where metrics will be stored.
+    - 'replication_metrics_table_name': str. Name of the DynamoDB table where metrics will be stored. Besides the metrics of every task run
+    (keyed by job checkpoint name), per-table statistics of the run are stored keyed by '<job_checkpoint_name>#<schema>.<table>'.
     - 'replication_jobs_table_name': str. Name of the DynamoDB table where job definition will be stored.
     - 'replication_instances_table_name': str. Name of the DynamoDB table where instance definition will be stored.
+    - 'replication_durations_table_name': str. Name of the DynamoDB table where durations of long running operations (instance creation,
+    task execution...) will be stored. Used to seed the polling of subsequent executions of the same operation.
+    - 'replication_task_tokens_table_name': str. Name of the DynamoDB table where task tokens of workflows waiting for DMS task state changes will be stored.
+    - 'replication_progress_table_name': str. Name of the DynamoDB table where in-flight progress samples of DMS tasks (one per status poll) will be stored, expiring after a TTL.
+    - 'replication_job_queue_table_name': str. Name of the DynamoDB table where queued job runs will be stored (by queue, in priority and deadline order).
     - 'replication_event_bus_name': str. Name of the EventBridge event bus where completion events will be send for workflow choreography.
+    - 'max_concurrent_tasks_per_instance': int. Max concurrent tasks on a replication instance, unless the instance record defines 'max_concurrent_tasks'.
+    Shared by the 'execute_task' workflow (task slots) and the 'job_queue' (dispatch of queued job runs) so that both enforce the same limit.
     - 'dms_cloudwatch_logs_role': bool. If DMS role for interacting with ClodWatch logs needs to be created.
     - 'dms_vpc_role': bool. If DMS role for interacting with VPC needs to be created.
     - 'dms_secrets_common_role_name': str. Name of the role that will allow DMS to access secrets in Secrets Manager.
@@ -50,11 +60,17 @@ COMMON_PROPS = {
     ],
     'artifact_bucket_name': f"increp-{ACCOUNT_NUMBER}-{VPC_PROPS['region']}-artifact",
     'replication_jobs_config_prefix': 'increp-jobs-config',
+    'replication_shard_plans_prefix': 'increp-shard-plans',
     'replication_checkpoints_table_name': 'increp-checkpoints',
     'replication_metrics_table_name': 'increp-metrics',
     'replication_jobs_table_name': 'increp-jobs',
     'replication_instances_table_name': 'increp-instances',
+    'replication_durations_table_name': 'increp-durations',
+    'replication_task_tokens_table_name': 'increp-task-tokens',
+    'replication_progress_table_name': 'increp-progress',
+    'replication_job_queue_table_name': 'increp-job-queue',
     'replication_event_bus_name': 'increp-event-bus',
+    'max_concurrent_tasks_per_instance': 4,
     'dms_cloudwatch_logs_role': True, # Only leave as true if no dms-cloudwatch-logs-role role in your account
     'dms_vpc_role': True, # Only leave as true if no dms-vpc-logs-role role in your account
     'dms_secrets_common_role_name': 'increp-dms-secrets-common-role',
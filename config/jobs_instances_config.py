@@ -45,7 +45,8 @@ POSTGRES_TO_MYSQL_JOBS_INSTANCES_PROPS = {
         'artifact_bucket_name': COMMON_PROPS['artifact_bucket_name'],
         'replication_jobs_config_prefix': COMMON_PROPS['replication_jobs_config_prefix'],
         'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
-        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name']
+        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name'],
+        'artifacts_inline_max_bytes': 4096
     },
     'jobs_flow_config': [
         {
@@ -74,7 +75,10 @@ POSTGRES_TO_MYSQL_JOBS_INSTANCES_PROPS = {
                 }
             ],
 
+            'flow_mode': 'choreography',
+
             'eventbridge_replication_common_role_name': COMMON_PROPS['eventbridge_replication_common_role_name'],
+            'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
             'replication_event_bus_name' : COMMON_PROPS['replication_event_bus_name']
         },
         {
@@ -100,7 +104,10 @@ POSTGRES_TO_MYSQL_JOBS_INSTANCES_PROPS = {
                 }
             ],
 
+            'flow_mode': 'choreography',
+
             'eventbridge_replication_common_role_name': COMMON_PROPS['eventbridge_replication_common_role_name'],
+            'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
             'replication_event_bus_name' : COMMON_PROPS['replication_event_bus_name']
         }
     ] 
@@ -147,7 +154,8 @@ MYSQL_TO_POSTGRES_JOBS_INSTANCES_PROPS = {
         'artifact_bucket_name': COMMON_PROPS['artifact_bucket_name'],
         'replication_jobs_config_prefix': COMMON_PROPS['replication_jobs_config_prefix'],
         'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
-        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name']
+        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name'],
+        'artifacts_inline_max_bytes': 4096
     },
     'jobs_flow_config': [
         {
@@ -172,7 +180,10 @@ MYSQL_TO_POSTGRES_JOBS_INSTANCES_PROPS = {
                 }
             ],
 
+            'flow_mode': 'choreography',
+
             'eventbridge_replication_common_role_name': COMMON_PROPS['eventbridge_replication_common_role_name'],
+            'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
             'replication_event_bus_name' : COMMON_PROPS['replication_event_bus_name']
         },
         {
@@ -198,7 +209,10 @@ MYSQL_TO_POSTGRES_JOBS_INSTANCES_PROPS = {
                 }
             ],
 
+            'flow_mode': 'choreography',
+
             'eventbridge_replication_common_role_name': COMMON_PROPS['eventbridge_replication_common_role_name'],
+            'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
             'replication_event_bus_name' : COMMON_PROPS['replication_event_bus_name']
         }
     ] 
@@ -219,41 +233,94 @@ this section are:
         - 'publicly_accessible' str. If instance should be accessible or not. Possible values are 'true' or 'false'.
         - 'subnet_group': str. Id of the DMS subnet group where instance wil be deployed.
         - 'availability_zone': str. Name of the availability zone where the instance is going to be deployed.
+        - 'max_concurrent_tasks': str [OPTIONAL]. Max concurrent tasks (as a numeric string) on the instance. Defaults to 'max_concurrent_tasks_per_instance' of the common properties.
+    Instance records also hold the lease state of the instance ('lease_count', 'lease_generation' and 'lease_state'), managed by 'create_instance' and 'delete_instance' 
+    workflows to keep instances warm between consecutive jobs, and its task slots ('task_slot_holders', 'task_slot_waiters' and 'task_slot_version'), managed by 
+    the 'execute_task' workflow to bound concurrent tasks. Redeploying instance configurations only updates configuration attributes, so that lease state
+    and task slots are kept (attributes removed from a record are kept as well).
 
 2- 'jobs_config' includes all jobs configurations. This allows you to define replication tasks that will be executed on replication instances following a incremental approach and without any dependency on the
 underlying instance. Incremental means that all full replication tasks should be configured to stop after full replication, and cdc tasks will be stopped so that only cdc changes up to task start time are replicated.
 When a task successfully finishes; checkpoints and metrics will be persisted in DynamoDB so that task and underlying instance can be eliminated and tasks can be resumed from the point that it should. Configurations defined 
-here will be stored in DynamoDB table via a CDK managed lambda function on deployment. Additionally, settings and mappings json files will be synced to specified S3 bucket and prefix, partitioned by job name.
+here will be stored in DynamoDB table via a CDK managed lambda function on deployment. Additionally, settings and mappings json files will be synced to specified S3 bucket and prefix, partitioned by job name
+(settings profiles are synced to the 'profiles' folder).
 The properties of this section are:
     - 'artifact_bucket_name': str. Representing the name of the bucket where settings and mapping files will be stored.
     - 'replication_jobs_config_prefix': str. Representing the prefix of the bucket where settings and mapping files will be stored, partitioned by job name.
     - 'lambda_replication_common_role_name': str. Representing the name of the role to be assigned to the lambda function that will store instance configuration records in the DynamoDB table.
     - 'replication_jobs_table_name': str. Representing the name of the DynamoDB table where records are going to be stored.
+    - 'artifacts_inline_max_bytes': int [OPTIONAL]. Settings and mappings files of each job are compiled on deployment into a single minified and compressed 
+    artifact (with a content hash) that is stored in the job record, so that task creation retrieves everything with a single read. Artifacts bigger than 
+    this size (in bytes, after encoding) are not stored inline and are read from S3 instead. Defaults to 4096. Records are embedded in the CloudFormation template
+    and written in chunks of up to 25 records and 120 KB, so that deployment (synth) fails when a record exceeds 120 KB or all records exceed 512 KB.
     - 'replication_jobs_records': list. Every dict in this list represent a DynamoDB record for a job configuration. Properties include:
         - 'job_name': str. Name of the job. Will be used to identify replication task on creation and refer to it on execution. Should be unique.
         - 'job_checkpoint_name': str. Name of the checkpoint that the job will update. Should be unique. Note that full and cdc jobs of the same source objects should share the same 'job_checkpoint_name'.
         - 'migration_type' str. Type of replication task. Possible values are 'full-load-and-cdc' or 'cdc'.
         - 'source_endpoint_id': str. Id of the DMS source endpoint.
         - 'target_endpoint_id': str. Id of the DMS target endpoint.
+        - 'job_set': str [OPTIONAL]. Name of the set of jobs the job belongs to. Used by the 'execute_job_set' workflow to execute all jobs of a set.
+        - 'estimated_memory_mb': str [OPTIONAL]. Memory (MB, as a numeric string) the task of the job is expected to use. Used by the 'execute_job_set' workflow when scheduling jobs onto instances 
+        instead of the estimation based on previous executions.
+        - 'estimated_vcpu': str [OPTIONAL]. vCPUs (as a numeric string) the task of the job is expected to use. Used as 'estimated_memory_mb'.
+        - 'task_mode': str [OPTIONAL]. Either 'transient' (default) or 'persistent'. Applies to 'cdc' jobs only. In 'persistent' mode, when a stopped task of 
+        the job already exists in the instance, it is modified with new CDC start / stop positions (and current settings and mappings) and resumed 
+        instead of creating a new task. Falls back to task creation when there is no task of the job. Job executions fail when the task of the job is running, 
+        failed (it should be deleted first) or in another instance. Job flows including a 'delete_task' workflow step of a persistent job
+        are rejected on deployment (synth), and instance should be kept between executions since DMS requires tasks to be deleted before deleting their instance.
+        - 'shard_count': str [OPTIONAL]. Number of shards (as a numeric string) the tables of the job are split into by the 'execute_sharded_job' workflow, each one replicated
+        by its own DMS task (named after the job followed by '-shard-' and the shard index) with its own checkpoint lineage (checkpoint name followed by the same suffix). Tables and their
+        size are read from a 'catalog.json' file synced with settings and mappings of the job (with a 'tables' list of dicts with 'schema_name', 'table_name' and 'size' keys). Only
+        relevant for 'full-load-and-cdc' jobs, 'cdc' jobs reuse the shards of their checkpoint. Defaults to 'default_shard_count' of the 'execute_sharded_job' workflow.
+        - 'settings_tuning': str [OPTIONAL]. Either 'static' (default) or 'auto'. In 'auto' mode, task settings are tuned on every run and tuned values are merged over the
+        job settings: 'MaxFullLoadSubTasks', 'CommitRate', 'ParallelLoadThreads' and 'ParallelLoadBufferSize' on full load runs from table sizes of the catalog snapshot (and tables
+        loaded on previous runs), and batch apply 'ChangeProcessingTuning' settings on cdc runs from the planned backlog to drain. Settings are kept closer to the conservative
+        values when tables errored on the previous run. Tuned values are recorded with the metrics of the run ('settings_tuning_values', 'settings_tuning_load' and 'settings_tuning_reason').
+        - 'settings_profile': str [OPTIONAL]. Name of the settings profile of the job, a json file with complete task settings stored once in the 'src/code/dms/profiles' folder 
+        (for example 'bulk-full-load', 'low-latency-cdc' or 'lob-heavy'). When specified, the settings file of the job is optional and only includes the settings overriding the profile. 
+        Task settings are resolved on task creation: dicts are merged key by key and any other value (lists included) is replaced by the job value. Note that 'profiles' can't be used as job name.
 
 3- 'jobs_flow_config' defines the workflow sequence for each job defined in 'jobs_config'. Workflows are decoupled to allow different execution patterns. For example, executing two or more tasks in the same instance before
-instance deletion, or adding new custom workflows in between the sequence (as done with the 'post_full_task_postgres' workflow for instance). As of by now, definition only allows sequential execution of workflows, and definitions
-are independent between jobs. Each element of the list is a dict that represent a workflow sequence configuration and should be associated to a job. 
+instance deletion, or adding new custom workflows in between the sequence (as done with the 'post_full_task_postgres' workflow for instance). Definition is sequential and independent between jobs, 
+except for 'orchestrated' flows where parallel steps are supported (see below). Each element of the list is a dict that represent a workflow sequence configuration and should be associated to a job. 
 
 Note that workflow choreography is based on an event-driven architecture leveraging EventBridge's event bus, rules and targets. Messages between workflows follow a standard in which output message of a successfully executed
 workflow is sent as input message for the execution of the subsequent workflow.
 
+Alternatively, the workflow sequence can be orchestrated by a single parent state machine (named after the job) that executes each workflow as a nested execution and waits for its
+completion. This avoids event delivery latency and a new execution start on every step, and keeps a single execution history per job run. In this case each workflow receives 'JobName' 
+and 'InstanceName' as input message, the sequence ends after the first disabled workflow, and only the first workflow can have a schedule (applied to the parent state machine).
+Orchestrated flows can also be expressed as a DAG with parallel steps: a step with a 'parallel' key runs each of its branches (sequences of steps) concurrently and
+waits for all of them to finish before next step (fan-in). Together with step level 'job_name', this allows for example creating an instance once, executing several jobs in
+parallel on it and deleting it after all of them are finished:
+    [create_instance] -> parallel([execute_task job_a -> delete_task job_a], [execute_task job_b -> delete_task job_b]) -> [delete_instance]
+
 The properties supported by each dict are:
     - 'job_name': str. Name of the job associated to the workflow sequence.
     - 'instance_name': str. Name of the instance where the job will be executed.
+    - 'flow_mode': str [OPTIONAL]. Either 'choreography' (default) or 'orchestrated'. 
+    - 'flow_state_machine_name': str [OPTIONAL]. Name of the parent state machine when 'orchestrated'. Defaults to '<job_name>-flow'.
     - 'eventbridge_replication_common_role_name': str. Name of the eventbridge role to be used on event bus rules for executing actions and targets (subsequent state machines)
+    - 'workflow_replication_common_role_name': str. Name of the role that the parent state machine will be assuming on execution when 'orchestrated'.
     - 'replication_event_bus_name': str. Name of the event bus where rules and targets will be deployed.
+    - 'job_queue_function_name': str [OPTIONAL]. Name of the 'job_queue' lambda function targeted by cron rules of steps with a 'queue' definition. Defaults to 'job_queue'.
+    - 'delete_task_state_machine_name': str [OPTIONAL]. Name of the state machine of the 'delete_task' workflow, used to reject steps deleting the task of 'persistent' jobs. Defaults to 'delete_task_workflow'.
     - 'job_steps_details': list. Ordered list with sequence of workflow execution. Each element in the list is a dict representing the workflow to be executed. Properties of each element are:
         - 'state_machine_name': Name of the state machine to execute on current step.
+        - 'job_name': str [OPTIONAL]. Name of the job to use as input message of the state machine on current step. Defaults to the job of the sequence. Only for 'orchestrated' flows.
+        - 'parallel': list [OPTIONAL]. Used instead of 'state_machine_name'. List of branches, each one being a list of steps (with the same properties described here) that will
+        be executed concurrently. Next step starts when all branches finish. Only for 'orchestrated' flows.
         - 'enabled': bool. If finish rule of this workflow is enabled or not. When disabled means that no subsequent workflows will be executed when successfully finished.
         - 'cron': dict [OPTIONAL]. Representing if the workflow should be executed on a schedule instead of a previous workflow execution. Normally used for first step on CDC jobs. Possible keys of dict are described in 
         https://docs.aws.amazon.com/cdk/api/v1/python/aws_cdk.aws_events/CronOptions.html. When specified, and additional rule following cron definition will be created in default event bus. Current workflow will be defined as target
         and input messages will include 'JobName' and 'InstanceName'. Status of this event will be the same as defined in 'enabled'.
+        - 'provisioning_lead_minutes': int [OPTIONAL]. Only used with 'cron' on a create_instance_workflow step. Minutes before the cron schedule when the rule will be triggered, so that the replication 
+        instance is created ahead of time and available at the original schedule. Input messages will also include 'ScheduledTime' and 'ProvisioningLeadSeconds', and the workflow will 
+        wait to start creation based on historical creation durations. Cron must have a single 'hour' and 'minute', and it can only move to the previous day when it runs every day.
+        On 'orchestrated' flows, on demand executions must include 'ScheduledTime' and 'ProvisioningLeadSeconds' in the input message.
+        - 'queue': dict [OPTIONAL]. Only used with 'cron'. When specified, the cron rule enqueues the job run in the 'job_queue' instead of starting the workflow, and the job run 
+        is dispatched when its instance has free task slots, in priority and earliest deadline order. Keys of dict are 'priority' (int, lower values are dispatched first),
+        'deadline_minutes' (int, minutes after the cron schedule by which the job run should be dispatched) and 'queue_name' (str [OPTIONAL], defaults to the first queue).
 
 """
 JOBS_INSTANCES_PROPS = POSTGRES_TO_MYSQL_JOBS_INSTANCES_PROPS
\ No newline at end of file
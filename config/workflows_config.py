@@ -5,10 +5,53 @@ represents a single workflow configuration. The key is the id that will be used
 value is a dict with the set of properties for that particular workflow. 
 
 Properties are described per workflow:
+- 'replication_core_layer' is not a workflow but the lambda layer with the shared runtime (lazy boto3 clients, caches and DMS helpers) 
+used by all workflow lambda functions. Properties include:
+    - 'layer_name': str. Representing the name of the lambda layer. Layer version description includes the version of the replication_core package.
+
+- 'adaptive_poller' is not a workflow but the lambda function used by workflows to compute the wait before polling again the status of long running
+operations (instance creation and deletion, task execution and deletion). First waits are seeded with the median historical duration of the operation
+and, once exceeded, waits grow exponentially (with jitter) up to a max interval. Durations are recorded on completion. Properties include:
+    - 'function_name': str. Representing the name of the lambda function.
+    - 'lambda_replication_common_role_name': str. Representing the name of the role that lambda functions will be assuming on execution.
+    - 'replication_durations_table_name': str. Name of the DynamoDB table where operation durations are going to be stored.
+    - 'base_interval_seconds': int. Wait before the first poll once the expected duration is exceeded (or when there is no history).
+    - 'backoff_factor': float. Factor applied to the wait on every poll once the expected duration is exceeded.
+    - 'max_interval_seconds': int. Max wait between polls, both before and after the expected duration is exceeded, so that failures of long operations are noticed in time.
+    - 'jitter_ratio': float. Max ratio of the wait randomly removed (on every poll) so that concurrent executions do not poll in sync.
+    - 'history_size': int. Number of most recent durations of the operation used to compute its expected duration.
+
+- 'job_queue' is not a workflow but the lambda function used to queue job runs. Cron rules of job flow steps with a 'queue' definition enqueue the job run with a priority
+and deadline instead of starting the workflow, and a rate rule per queue dispatches queued job runs (priority first, then earliest deadline) while their instance
+has free task slots. Queue wait times ('job_queue_wait#<queue name>', with priority and deadline miss), and the depth, overdue job runs and oldest wait of every 
+dispatch ('job_queue_depth#<queue name>') are recorded in the durations table. Properties include:
+    - 'function_name': str. Representing the name of the lambda function.
+    - 'lambda_replication_common_role_name': str. Representing the name of the role that lambda functions will be assuming on execution.
+    - 'replication_job_queue_table_name': str. Name of the DynamoDB table where queued and dispatched (still running) job runs are going to be stored.
+    - 'replication_instances_table_name': str. Name of the DynamoDB table where instance configurations and task slots are stored.
+    - 'replication_durations_table_name': str. Name of the DynamoDB table where queue metrics are going to be stored.
+    - 'queue_names': list. Names of the queues. A dispatch rule is created for each one. First one is the default queue.
+    - 'dispatch_rate_minutes': int. Minutes between dispatches of a queue.
+    - 'default_priority': int. Priority of job runs enqueued without one. Lower values are dispatched first.
+    - 'default_deadline_minutes': int. Minutes after enqueue time by which job runs enqueued without deadline should be dispatched.
+    - 'max_concurrent_tasks_per_instance': int. Max concurrent tasks on a replication instance, unless the instance record defines 'max_concurrent_tasks'. Shared with
+    the 'execute_task' workflow through COMMON_PROPS.
+
 - 'create_instance' workflow will be used to ramp-up new DMS replication instances based on instance definition stored in DynamoDB.
-Note that this is a workflow that is fully based on a step function state machine. Properties for this workflow include:
+Every execution acquires a lease on the instance (lease counters are kept in the instance record), waiting while a 'delete_instance' execution is deleting it, and releases
+the lease when the instance cannot be created or found available. When the instance already exists and is available (kept warm by a previous job) it is reused instead of created.
+When executed by a schedule with provisioning lead (input includes 'ScheduledTime' and 'ProvisioningLeadSeconds'),
+instance creation is delayed so that the instance is available at the target start time of the job (scheduled time + lead) based on historical creation durations 
+for the instance type and availability zone, and the start time SLO of the job is recorded. Note that this is a workflow that is based on a step function state machine 
+and supporting lambda functions. Properties for this workflow include:
     - 'state_machine_name': str. Representing the name of the state machine that will be orchestrating all the process. 
     - 'workflow_replication_common_role_name': str. Representing the name of the role that the state machine will be assuming on execution.
+    - 'lambda_replication_common_role_name': str. Representing the name of the role that lambda functions will be assuming on execution.
+    - 'replication_durations_table_name': str. Name of the DynamoDB table where instance creation durations and start time SLO records are stored.
+    - 'provisioning_percentile': float. Percentile of historical creation durations used as expected creation duration.
+    - 'provisioning_safety_seconds': int. Seconds added to the expected creation duration.
+    - 'provisioning_history_size': int. Number of most recent creation durations considered.
+    - 'start_slo_seconds': int. Max seconds the instance can be available after the target start time of the job to meet the start time SLO.
     - 'replication_instances_table_name': str. Name of the DynamoDB table where instance configurations are going to be stored.
     - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
 
@@ -24,6 +67,82 @@ Note that this is a workflow that is based on a step function state machine and
     - 'replication_jobs_config_prefix': str. Prefix inside S3 bucket where task settings and mappings json files are stored.
     - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
     - 'notifications_topic_name': str. Name of the SNS topic where notifications are going to be sent.
+    - 'cdc_window_default_seconds': int. Seconds between cdc task creation and its stop position when there is no execution history for the job checkpoint.
+    - 'cdc_window_min_seconds': int. Min seconds between cdc task creation and its stop position. Stop position is planned from historical metrics so 
+    that the backlog accumulated since the last execution is drained in a single execution without idling.
+    - 'cdc_window_max_seconds': int. Max seconds between cdc task creation and its stop position.
+    - 'settings_tuning_small_table_bytes': int. Size (bytes) of the largest table of a full load run up to which tuned task settings (jobs with 'auto' settings tuning)
+    are the most conservative ones (lowest commit rate, no parallel load threads). Tuned values are interpolated (on log scale of the largest table size) up to
+    'settings_tuning_large_table_bytes', from which they are the most aggressive ones.
+    - 'settings_tuning_large_table_bytes': int. Size (bytes) of the largest table of a full load run from which tuned task settings are the most aggressive ones.
+    - 'settings_tuning_cdc_high_backlog_ratio': float. Backlog seconds to drain per second of cdc window from which tuned batch apply settings (bigger and longer batches,
+    more memory) are the most aggressive ones.
+    - 'settings_tuning_max_full_load_subtasks': int. Max tables loaded in parallel by tuned full load runs. Subtasks are otherwise set to the number of tables of the run.
+    - 'task_completion_mode': str. How DMS task completion is detected. Supported values are 'polling' (task status is described periodically) and 'callback'
+    (workflow waits with a task token until a DMS replication task state change event resumes it). Task creation is always polled.
+    - 'replication_task_tokens_table_name': str. Name of the DynamoDB table where task tokens of waiting workflows are going to be stored (callback mode).
+    - 'callback_timeout_seconds': int. Max seconds to wait for a DMS event before describing the task status as a safety net (callback mode).
+    - 'replication_progress_table_name': str. Name of the DynamoDB table where a progress sample (full load progress, tables loaded / errored, elapsed time,
+    throughput and estimated seconds to completion) is stored on every task status poll. In callback mode, samples are only taken on safety net polls.
+    - 'progress_sample_ttl_seconds': int. Seconds after which progress samples expire.
+    - 'progress_stall_samples': int. Consecutive samples without full load progress (task running) after which the task is flagged as stalled.
+    - 'replication_instances_table_name': str. Name of the DynamoDB table where instance configurations and their task slots (holders and queued waiters) are stored.
+    Tasks are created only after acquiring a task slot of the replication instance, and slots are released when the task finishes or the workflow fails.
+    - 'replication_durations_table_name': str. Name of the DynamoDB table where the wait time for a task slot is recorded ('instance_slot_wait#<instance name>').
+    - 'max_concurrent_tasks_per_instance': int. Max concurrent tasks on a replication instance, unless the instance record defines 'max_concurrent_tasks'. Shared with
+    the 'job_queue' through COMMON_PROPS.
+    - 'instance_slot_lease_seconds': int. Seconds after which a task slot not released (crashed or timed out workflows) is considered free. The lease is renewed
+    on every task status poll (and callback safety net timeout), so it must be longer than 'callback_timeout_seconds'. Expired slots of workflows still running are kept.
+    - 'instance_slot_retry_interval_seconds': int. Seconds before the first retry to acquire a task slot when none is free.
+    - 'instance_slot_retry_backoff_rate': float. Multiplier of the interval between consecutive retries to acquire a task slot.
+    - 'instance_slot_retry_max_delay_seconds': int. Max seconds between retries to acquire a task slot. Queued waiters not retrying for twice this time are dropped.
+    - 'instance_slot_retry_max_attempts': int. Max retries to acquire a task slot before the workflow fails.
+
+- 'execute_job_set' workflow will be used to execute a set of jobs, each one with the 'execute_task' workflow as a nested execution, under a distributed map with bounded
+concurrency. Job names are either provided as input ('JobNames' list) or retrieved from the jobs table, optionally filtered by the 'JobSet' (jobs 'job_set' attribute) and 
+'MigrationType' input keys. Input should also include 'InstanceName'. Results of all jobs are aggregated (succeeded / failed jobs, makespan and throughput) and notified, and the
+workflow fails if any job failed. With 'bin_packing' scheduling mode, jobs are packed onto the fewest instances based on their estimated memory and vCPU needs (job record
+'estimated_memory_mb' and 'estimated_vcpu' attributes, or tables loaded on previous executions), and every scheduled instance ('InstanceName' followed by a sequence number, 
+configured as 'InstanceName' with the selected class) is created, runs its jobs and is released with the 'create_instance' and 'delete_instance' workflows. 
+Note that this is a workflow that is based on a step function state machine and supporting lambda functions. Properties for this workflow include:
+    - 'state_machine_name': str. Representing the name of the state machine that will be orchestrating all the process. 
+    - 'workflow_replication_common_role_name': str. Representing the name of the role that the state machine will be assuming on execution.
+    - 'lambda_replication_common_role_name': str. Representing the name of the role that lambda functions will be assuming on execution.
+    - 'replication_jobs_table_name': str. Name of the DynamoDB table where jobs configurations are going to be stored.
+    - 'execute_job_state_machine_name': str. Name of the state machine of the 'execute_task' workflow.
+    - 'max_concurrency': int. Max number of jobs of the set executed concurrently.
+    - 'scheduling_mode': str. How jobs are assigned to instances. Supported values are 'fixed' (every job runs on the input instance) and 'bin_packing' (jobs are
+    packed onto scheduled instances).
+    - 'replication_metrics_table_name': str. Name of the DynamoDB table where metrics of previous executions are stored (bin packing mode).
+    - 'replication_instances_table_name': str. Name of the DynamoDB table where instance configurations are stored (bin packing mode).
+    - 'create_instance_state_machine_name': str. Name of the state machine of the 'create_instance' workflow (bin packing mode).
+    - 'delete_instance_state_machine_name': str. Name of the state machine of the 'delete_instance' workflow (bin packing mode).
+    - 'instance_classes': dict. Instance classes that can be scheduled, from smallest to largest, with their 'memory_mb', 'vcpu' and 'max_tasks' (max replication tasks
+    per instance) (bin packing mode).
+    - 'instance_capacity_ratio': float. Ratio of memory and vCPU of an instance class that can be used by tasks, leaving headroom for the replication engine (bin packing mode).
+    - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
+    - 'notifications_topic_name': str. Name of the SNS topic where notifications are going to be sent.
+
+- 'execute_sharded_job' workflow will be used to execute a job split into shards, so that its tables are replicated by several DMS tasks running concurrently instead of a single one.
+Tables selected by the job mappings are assigned to shards from their size in the catalog snapshot of the job (largest tables first, to the smallest shard) and the plan is stored in S3
+by job checkpoint, so that 'cdc' jobs of the same checkpoint reuse it. Every shard is executed with the 'execute_task' workflow as a nested execution (on the instance of the shard, 
+round-robin over the 'InstanceNames' input list or 'InstanceName') and its task is then deleted with the 'delete_task' workflow. The first shard keeps the selection rules of the job
+(excluding tables of other shards) so that tables created after planning are still replicated. Input should include 'JobName' and 'InstanceName', and optionally 'InstanceNames' and
+'ShardCount'. Results of all shards are aggregated (succeeded / failed shards, makespan and size imbalance) and notified, and the workflow fails if any shard failed.
+Note that this is a workflow that is based on a step function state machine and supporting lambda functions. Properties for this workflow include:
+    - 'state_machine_name': str. Representing the name of the state machine that will be orchestrating all the process. 
+    - 'workflow_replication_common_role_name': str. Representing the name of the role that the state machine will be assuming on execution.
+    - 'lambda_replication_common_role_name': str. Representing the name of the role that lambda functions will be assuming on execution.
+    - 'replication_jobs_table_name': str. Name of the DynamoDB table where jobs configurations are going to be stored.
+    - 'artifact_bucket_name': str. Name of the S3 bucket where task settings, mappings, catalog snapshots and shard plans are stored.
+    - 'replication_jobs_config_prefix': str. Prefix inside S3 bucket where task settings, mappings and catalog snapshot json files are stored.
+    - 'replication_shard_plans_prefix': str. Prefix inside S3 bucket where shard plans are going to be stored.
+    - 'execute_job_state_machine_name': str. Name of the state machine of the 'execute_task' workflow.
+    - 'delete_task_state_machine_name': str. Name of the state machine of the 'delete_task' workflow.
+    - 'default_shard_count': int. Number of shards of jobs without 'shard_count' attribute (and without 'ShardCount' input).
+    - 'max_concurrency': int. Max number of shards executed concurrently (0 for no limit). Concurrent tasks per instance are also bounded by its task slots.
+    - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
+    - 'notifications_topic_name': str. Name of the SNS topic where notifications are going to be sent.
 
 - 'post_full_task_postgres' workflow will be used to execute postgres specific tasks after a full load replication task termination. This includes the duplication
 of the replication slot so that it can be leveraged by subsequent cdc tasks. Note that in order to achieve such duplication, a lambda function needs to connect to the source db
@@ -48,16 +167,54 @@ Note that this is a workflow that is based on a step function state machine. Pro
     - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
 
 - 'delete_instance' workflow will be used to delete a DMS replication instances.
+Every execution releases a lease on the instance. Deletion only happens when no leases are left after an idle timeout and no lease was acquired meanwhile, so that 
+consecutive jobs reuse a warm instance. Instances are marked for deletion (so that 'create_instance' executions do not reuse them meanwhile) until deleted. Instances without
+lease records (for example created before this feature) are only deleted when no DMS task is left on them.
 Note that this is a workflow that is based on a step function state machine. Properties for this workflow include:
     - 'state_machine_name': str. Representing the name of the state machine that will be orchestrating all the process. 
     - 'workflow_replication_common_role_name': str. Representing the name of the role that the state machine will be assuming on execution.
+    - 'replication_instances_table_name': str. Name of the DynamoDB table where instance configurations and leases are stored.
+    - 'idle_timeout_seconds': int. Seconds an instance without leases is kept warm before deletion.
     - 'replication_event_bus_name': str. Name of the EventBridge event bus where success finish event will be sent for subsequent workflow execution.
 """
 WORKFLOW_PROPS = {
+    'replication_core_layer': {
+        'layer_name': 'replication_core'
+    },
+    'adaptive_poller': {
+        'function_name': 'adaptive_poller',
+
+        'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
+        'replication_durations_table_name': COMMON_PROPS['replication_durations_table_name'],
+        'base_interval_seconds': 15,
+        'backoff_factor': 2,
+        'max_interval_seconds': 300,
+        'jitter_ratio': 0.2,
+        'history_size': 20
+    },
+    'job_queue': {
+        'function_name': 'job_queue',
+
+        'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
+        'replication_job_queue_table_name': COMMON_PROPS['replication_job_queue_table_name'],
+        'replication_instances_table_name': COMMON_PROPS['replication_instances_table_name'],
+        'replication_durations_table_name': COMMON_PROPS['replication_durations_table_name'],
+        'queue_names': ['default'],
+        'dispatch_rate_minutes': 1,
+        'default_priority': 100,
+        'default_deadline_minutes': 60,
+        'max_concurrent_tasks_per_instance': COMMON_PROPS['max_concurrent_tasks_per_instance']
+    },
     'create_instance': {
         'state_machine_name': 'create_instance_workflow',
         
         'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
+        'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
+        'replication_durations_table_name': COMMON_PROPS['replication_durations_table_name'],
+        'provisioning_percentile': 0.9,
+        'provisioning_safety_seconds': 60,
+        'provisioning_history_size': 20,
+        'start_slo_seconds': 60,
         'replication_instances_table_name': COMMON_PROPS['replication_instances_table_name'],
         'replication_event_bus_name': COMMON_PROPS['replication_event_bus_name']
     },
@@ -72,6 +229,67 @@ WORKFLOW_PROPS = {
         'artifact_bucket_name': COMMON_PROPS['artifact_bucket_name'],
         'replication_jobs_config_prefix': COMMON_PROPS['replication_jobs_config_prefix'],
         'replication_event_bus_name': COMMON_PROPS['replication_event_bus_name'],
+        'notifications_topic_name': COMMON_PROPS['notifications_topic_name'],
+        'cdc_window_default_seconds': 300,
+        'cdc_window_min_seconds': 60,
+        'cdc_window_max_seconds': 3600,
+        'settings_tuning_small_table_bytes': 104857600,
+        'settings_tuning_large_table_bytes': 10737418240,
+        'settings_tuning_cdc_high_backlog_ratio': 4,
+        'settings_tuning_max_full_load_subtasks': 16,
+        'task_completion_mode': 'polling',
+        'replication_task_tokens_table_name': COMMON_PROPS['replication_task_tokens_table_name'],
+        'callback_timeout_seconds': 3600,
+        'replication_progress_table_name': COMMON_PROPS['replication_progress_table_name'],
+        'progress_sample_ttl_seconds': 604800,
+        'progress_stall_samples': 3,
+        'replication_instances_table_name': COMMON_PROPS['replication_instances_table_name'],
+        'replication_durations_table_name': COMMON_PROPS['replication_durations_table_name'],
+        'max_concurrent_tasks_per_instance': COMMON_PROPS['max_concurrent_tasks_per_instance'],
+        'instance_slot_lease_seconds': 21600,
+        'instance_slot_retry_interval_seconds': 30,
+        'instance_slot_retry_backoff_rate': 1.5,
+        'instance_slot_retry_max_delay_seconds': 300,
+        'instance_slot_retry_max_attempts': 100
+    },
+    'execute_job_set': {
+        'state_machine_name': 'execute_job_set_workflow',
+
+        'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
+        'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
+        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name'],
+        'execute_job_state_machine_name': 'execute_job_workflow',
+        'max_concurrency': 10,
+        'scheduling_mode': 'fixed',
+        'replication_metrics_table_name': COMMON_PROPS['replication_metrics_table_name'],
+        'replication_instances_table_name': COMMON_PROPS['replication_instances_table_name'],
+        'create_instance_state_machine_name': 'create_instance_workflow',
+        'delete_instance_state_machine_name': 'delete_instance_workflow',
+        'instance_classes': {
+            'dms.t3.small': {'memory_mb': 2048, 'vcpu': 2, 'max_tasks': 4},
+            'dms.t3.medium': {'memory_mb': 4096, 'vcpu': 2, 'max_tasks': 8},
+            'dms.t3.large': {'memory_mb': 8192, 'vcpu': 2, 'max_tasks': 12},
+            'dms.c5.xlarge': {'memory_mb': 8192, 'vcpu': 4, 'max_tasks': 16},
+            'dms.r5.xlarge': {'memory_mb': 32768, 'vcpu': 4, 'max_tasks': 24}
+        },
+        'instance_capacity_ratio': 0.8,
+        'replication_event_bus_name': COMMON_PROPS['replication_event_bus_name'],
+        'notifications_topic_name': COMMON_PROPS['notifications_topic_name']
+    },
+    'execute_sharded_job': {
+        'state_machine_name': 'execute_sharded_job_workflow',
+
+        'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
+        'lambda_replication_common_role_name': COMMON_PROPS['lambda_replication_common_role_name'],
+        'replication_jobs_table_name': COMMON_PROPS['replication_jobs_table_name'],
+        'artifact_bucket_name': COMMON_PROPS['artifact_bucket_name'],
+        'replication_jobs_config_prefix': COMMON_PROPS['replication_jobs_config_prefix'],
+        'replication_shard_plans_prefix': COMMON_PROPS['replication_shard_plans_prefix'],
+        'execute_job_state_machine_name': 'execute_job_workflow',
+        'delete_task_state_machine_name': 'delete_task_workflow',
+        'default_shard_count': 4,
+        'max_concurrency': 0,
+        'replication_event_bus_name': COMMON_PROPS['replication_event_bus_name'],
         'notifications_topic_name': COMMON_PROPS['notifications_topic_name']
     },
     'post_full_task_postgres': {
@@ -98,6 +316,8 @@ WORKFLOW_PROPS = {
         'state_machine_name': 'delete_instance_workflow',
         
         'workflow_replication_common_role_name': COMMON_PROPS['workflow_replication_common_role_name'],
+        'replication_instances_table_name': COMMON_PROPS['replication_instances_table_name'],
+        'idle_timeout_seconds': 900,
         'replication_event_bus_name': COMMON_PROPS['replication_event_bus_name']
     }
 }
\ No newline at end of file
@@ -0,0 +1,122 @@
+import os
+import random
+import statistics
+from datetime import datetime, timezone
+
+from replication_core.durations import get_recent_durations, put_duration
+from replication_core.logs import log
+
+# Constant: Supported actions. 'next' computes the wait before the next poll, 'complete' records the operation duration
+POLL_ACTIONS = ['next', 'complete']
+
+# Constants: Lambda environment variables
+REPLICATION_DURATIONS_TABLE_NAME = os.getenv('REPLICATION_DURATIONS_TABLE_NAME')
+POLL_BASE_INTERVAL_SECONDS = int(os.getenv('POLL_BASE_INTERVAL_SECONDS', '15'))
+POLL_BACKOFF_FACTOR = float(os.getenv('POLL_BACKOFF_FACTOR', '2'))
+POLL_MAX_INTERVAL_SECONDS = int(os.getenv('POLL_MAX_INTERVAL_SECONDS', '300'))
+POLL_JITTER_RATIO = float(os.getenv('POLL_JITTER_RATIO', '0.2'))
+POLL_HISTORY_SIZE = int(os.getenv('POLL_HISTORY_SIZE', '20'))
+
+def handler(event, context):
+    """ Function handler: 1/ On 'next' action will compute the seconds to wait before polling the status of a long running
+    operation again, seeding the first poll with the median historical duration of the operation. 2/ On 'complete' action
+    will record the duration of the operation so that subsequent executions are seeded with it. Timing of every poll is logged.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action' and 'Poll' keys. 'Poll' is the polling state kept by the state machine
+        with 'OperationKey', 'StartedAt' (ISO 8601), 'Attempt', 'BackoffAttempt', 'ExpectedSeconds' and 'WaitSeconds' keys
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        poll : dict
+            updated polling state. 'WaitSeconds' key holds the seconds to wait before next poll
+    """
+
+    # Get key elements from event
+    action = event['Action']
+    poll = event['Poll']
+
+    if action not in POLL_ACTIONS:
+        raise ValueError(f'Unsupported poll action {action}. Supported actions are {POLL_ACTIONS}')
+
+    operation_key = poll['OperationKey']
+    started_at = datetime.fromisoformat(poll['StartedAt'].replace('Z', '+00:00'))
+    elapsed_seconds = (datetime.now(timezone.utc) - started_at).total_seconds()
+
+    # Record operation duration when complete
+    if action == 'complete':
+        put_duration(REPLICATION_DURATIONS_TABLE_NAME, operation_key, elapsed_seconds, {'polls': poll['Attempt']})
+        log(
+            OperationKey= operation_key,
+            Action= action,
+            Polls= poll['Attempt'],
+            DurationSeconds= round(elapsed_seconds, 3),
+            ExpectedSeconds= poll['ExpectedSeconds']
+        )
+
+        return {**poll, 'DurationSeconds': round(elapsed_seconds, 3)}
+
+    # Seed expected duration from history on first poll
+    expected_seconds = poll['ExpectedSeconds']
+    if poll['Attempt'] == 0:
+        durations = get_recent_durations(REPLICATION_DURATIONS_TABLE_NAME, operation_key, POLL_HISTORY_SIZE)
+        expected_seconds = int(statistics.median(durations)) if durations else 0
+
+    # Compute next interval
+    backoff_attempt = poll['BackoffAttempt']
+    wait_seconds, phase = get_next_interval(elapsed_seconds, expected_seconds, backoff_attempt)
+    if phase == 'backoff': backoff_attempt += 1
+
+    log(
+        OperationKey= operation_key,
+        Action= action,
+        Attempt= poll['Attempt'] + 1,
+        Phase= phase,
+        ElapsedSeconds= round(elapsed_seconds, 3),
+        ExpectedSeconds= expected_seconds,
+        WaitSeconds= wait_seconds
+    )
+
+    return {
+        **poll,
+        'Attempt': poll['Attempt'] + 1,
+        'BackoffAttempt': backoff_attempt,
+        'ExpectedSeconds': expected_seconds,
+        'WaitSeconds': wait_seconds
+    }
+
+def get_next_interval(elapsed_seconds, expected_seconds, backoff_attempt):
+    """ Complementary function to compute the seconds to wait before the next poll. While the operation is running for less
+    than its expected (historical) duration, waits are half of the remaining expected time (so that polls concentrate around 
+    the expected completion). Afterwards, waits grow exponentially from POLL_BASE_INTERVAL_SECONDS. Waits of both phases are capped
+    at POLL_MAX_INTERVAL_SECONDS (so that failures of long operations are noticed in time) and get a random jitter of POLL_JITTER_RATIO
+    to avoid synchronized polls between concurrent executions.
+
+    Parameters
+    ----------
+    elapsed_seconds : float
+        seconds since the operation started
+    expected_seconds : int
+        expected duration of the operation in seconds. 0 when unknown
+    backoff_attempt : int
+        number of polls already done in backoff phase
+
+    Returns
+    -------
+        wait_seconds, phase : tuple
+            seconds to wait (int) and phase ('seeded' or 'backoff') used to compute them
+    """
+
+    if expected_seconds and elapsed_seconds < expected_seconds:
+        interval, phase = max(POLL_BASE_INTERVAL_SECONDS, (expected_seconds - elapsed_seconds) / 2), 'seeded'
+    else:
+        interval, phase = POLL_BASE_INTERVAL_SECONDS * POLL_BACKOFF_FACTOR ** backoff_attempt, 'backoff'
+
+    interval = min(POLL_MAX_INTERVAL_SECONDS, interval) * random.uniform(1 - POLL_JITTER_RATIO, 1)
+
+    return max(1, int(interval)), phase
@@ -1,10 +1,22 @@
 import os
 import json
-import boto3
-from boto3.dynamodb.types import TypeDeserializer
 import re
+import time
+import statistics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from replication_core.clients import get_client, get_dynamodb_deserializer
+from replication_core.dms import get_instance_details, get_endpoints_details, find_task_details, get_cache_stats, instance_details_cache
+from replication_core.s3 import s3_json_cache, read_s3_json_file
+from replication_core.artifacts import get_job_artifacts, get_catalog_snapshot
+from replication_core.metrics import get_metrics_history
+from replication_core.serialization import normalize_datetimes
+from replication_core.sharding import get_shard_mappings, get_selecting_rule
+from replication_core.settings_tuning import SETTINGS_TUNING_MODES, tune_task_settings
+from replication_core.profiles import get_settings_profile, resolve_settings
+from replication_core.logs import log
+
 # Constant: Represents the regex to use by engine type to format DMS checkpoint accordingly on task creation
 CHECKPOINT_REGEX_BY_SOURCE_TYPE = {
     'postgresql': '[A-Z|0-9]{3}\/[A-Z|0-9]*',
@@ -19,30 +31,55 @@ START_REPLICATION_TASK_TYPE_BY_MIGRATION_TYPE = {
     'cdc': 'start-replication'
 }
 
+# Constant: Task statuses from which an existing task can be modified and started again (persistent task mode). Failed tasks are
+# not reused, since modifying and resuming them carries their failed state forward
+REUSABLE_TASK_STATUSES = ['stopped', 'ready']
+
+# Constant: Represents the start operation of an existing task modified with new CDC positions (persistent task mode)
+REUSED_TASK_START_REPLICATION_TASK_TYPE = 'resume-processing'
+
 # Constant: Value to be used to identify mos recent checkpoint for a job in the job checkpoints table
 LATEST_CHECKPOINT_JOB_START_VALUE = 'latest'
 
+# Constant: Number of most recent metrics records used to plan the CDC window (stop position) and tune task settings of a job
+CDC_WINDOW_HISTORY_SIZE = 10
+
+# Constant: Max number of independent inputs (instance, endpoints, settings, mappings, checkpoint, catalog snapshot...) resolved concurrently
+CONTEXT_RESOLUTION_MAX_WORKERS = 8
+
 # Constants: Lambda environment variables
 REPLICATION_CHECKPOINTS_TABLE_NAME = os.getenv('REPLICATION_CHECKPOINTS_TABLE_NAME')
 ARTIFACTS_BUCKET_NAME = os.getenv('ARTIFACTS_BUCKET_NAME')
 REPLICATION_JOBS_CONFIG_PREFIX = os.getenv('REPLICATION_JOBS_CONFIG_PREFIX')
-
-# Boto3 Clients: DMS, S3, DynamoDB
-dms = boto3.client('dms')
-s3 = boto3.client('s3')
-dynamodb = boto3.client('dynamodb')
-dynamodb_deserializer = TypeDeserializer()
+REPLICATION_JOBS_TABLE_NAME = os.getenv('REPLICATION_JOBS_TABLE_NAME')
+REPLICATION_METRICS_TABLE_NAME = os.getenv('REPLICATION_METRICS_TABLE_NAME')
+CDC_WINDOW_DEFAULT_SECONDS = int(os.getenv('CDC_WINDOW_DEFAULT_SECONDS', '300'))
+CDC_WINDOW_MIN_SECONDS = int(os.getenv('CDC_WINDOW_MIN_SECONDS', '60'))
+CDC_WINDOW_MAX_SECONDS = int(os.getenv('CDC_WINDOW_MAX_SECONDS', '3600'))
+SETTINGS_TUNING_PROPS = {
+    'small_table_bytes': int(os.getenv('SETTINGS_TUNING_SMALL_TABLE_BYTES', '104857600')),
+    'large_table_bytes': int(os.getenv('SETTINGS_TUNING_LARGE_TABLE_BYTES', '10737418240')),
+    'cdc_high_backlog_ratio': float(os.getenv('SETTINGS_TUNING_CDC_HIGH_BACKLOG_RATIO', '4')),
+    'max_full_load_subtasks': int(os.getenv('SETTINGS_TUNING_MAX_FULL_LOAD_SUBTASKS', '16'))
+}
 
 def handler(event, context):
     """ Function handler: 1/ Will retrieve Job Details for task creation from event. 2/ Retrieve complementary values for
-    DMS instance and endpoints from DMS API. 3/ Retrieve task settings and mappings from S3. 4/ create a DMS task with all 
-    retrieved details. When creating a CDC task in DMS, checkpoint values will be retrieved and checkpoint data will be 
-    included as well.
+    DMS instance and endpoints from DMS API. 3/ Retrieve task settings and mappings from job record (compiled on deployment,
+    passed by the workflow in 'JobConfig') or S3 when not stored inline. Steps 2/ and 3/ (and the checkpoint retrieval on CDC tasks) are resolved concurrently. 
+    4/ create a DMS task with all retrieved details. When creating a CDC task in DMS, checkpoint values will be retrieved 
+    and checkpoint data will be included as well. For CDC jobs in 'persistent' task mode, an existing stopped task of the 
+    job in the same instance is modified (settings, mappings and CDC positions) instead of creating a new one. Existing tasks that can
+    not be reused (running, failed or in another instance) raise an error, since a new task with the same identifier can not be created. For shards of a job 
+    (sharded job workflow), mappings are derived from the job mappings and the shard plan, and the task is named after the shard.
+    Settings of jobs with a settings profile are resolved (deep merge of the job settings over the profile, cached by content hash).
+    For jobs in 'auto' settings tuning mode, tuned values (from table sizes and previous runs) are merged over task settings.
 
     Parameters
     ----------
     event : dict
-        input event dictionary. Should include 'JobName', 'InstanceName' and 'JobConfig' keys
+        input event dictionary. Should include 'JobName', 'InstanceName' and 'JobConfig' keys, and 'Shard' key (with 'Index', 
+        'TaskIdentifier' and 'PlanKey' keys) for shards of a job
 
     context: dict
         input context. Not used on function
@@ -51,7 +88,10 @@ def handler(event, context):
     -------
         replication_task_details : dict
             dict with all details of DMS created task as returned from DMS API and formatted for ease of use.
-            Also including a 'StartReplicationTaskType' key for starting task accordingly on next steps.
+            Also including a 'StartReplicationTaskType' key for starting task accordingly on next steps, a 'TaskReused' key
+            indicating if an existing task was modified instead of created, a 'CdcPositions' key with the planned 'CdcStartPosition'
+            and 'CdcStopPosition' (empty for full load tasks, used to resume reused tasks), a 'CdcPlan' key with the planned CDC window,
+            a 'SettingsTuning' key with the tuned task settings values and a 'ContextResolutionTimings' key with the elapsed milliseconds of each context fetch.
     """
     
     # Get key elements from event
@@ -63,107 +103,236 @@ def handler(event, context):
     job_target_endpoint_id = job_config['target_endpoint_id']
     job_migration_type = job_config['migration_type']
     job_checkpoint_name = job_config['job_checkpoint_name']
+    job_task_mode = job_config.get('task_mode', 'transient')
+    job_shard = event.get('Shard')
+    job_task_identifier = job_shard['TaskIdentifier'] if job_shard else job_name
+    job_task_persistent = (job_task_mode == 'persistent') and (job_migration_type == 'cdc') and not job_shard
+    job_settings_profile = job_config.get('settings_profile')
+    job_settings_tuning_mode = job_config.get('settings_tuning', 'static')
+    if job_settings_tuning_mode not in SETTINGS_TUNING_MODES:
+        raise ValueError(f'Unsupported settings tuning mode {job_settings_tuning_mode}. Supported modes are {SETTINGS_TUNING_MODES}')
+
+    # Resolve task context concurrently: instance, endpoints, job artifacts and checkpoint are independent inputs
+    context_fetchers = {
+        'instance_details': lambda: get_instance_details(instance_name),
+        'endpoints_details': lambda: get_endpoints_details([job_source_endpoint_id, job_target_endpoint_id]),
+        'job_artifacts': lambda: get_job_artifacts(REPLICATION_JOBS_TABLE_NAME, job_name, ARTIFACTS_BUCKET_NAME, REPLICATION_JOBS_CONFIG_PREFIX, job_record= job_config)
+    }
+    if job_migration_type == 'cdc':
+        context_fetchers['checkpoint_item'] = lambda: get_checkpoint_item(job_checkpoint_name)
+    if job_migration_type == 'cdc' or job_settings_tuning_mode == 'auto':
+        context_fetchers['metrics_history'] = lambda: get_metrics_history(REPLICATION_METRICS_TABLE_NAME, job_checkpoint_name, CDC_WINDOW_HISTORY_SIZE)
+    if job_settings_tuning_mode == 'auto' and not job_shard:
+        context_fetchers['catalog_snapshot'] = lambda: get_catalog_snapshot(ARTIFACTS_BUCKET_NAME, REPLICATION_JOBS_CONFIG_PREFIX, job_name)
+    if job_task_persistent:
+        context_fetchers['existing_task_details'] = lambda: find_task_details(job_name)
+    if job_settings_profile:
+        context_fetchers['settings_profile'] = lambda: get_settings_profile(ARTIFACTS_BUCKET_NAME, REPLICATION_JOBS_CONFIG_PREFIX, job_settings_profile)
+    if job_shard:
+        context_fetchers['shard_plan'] = lambda: read_s3_json_file(ARTIFACTS_BUCKET_NAME, job_shard['PlanKey'])
+
+    task_context, task_context_timings = resolve_task_context(context_fetchers)
 
     # Get instance details from DMS
-    instance_details = get_instance_details(instance_name)
-    instance_arn = instance_details['ReplicationInstanceArn']
+    instance_arn = task_context['instance_details']['ReplicationInstanceArn']
 
     # Get source endpoint details from DMS
-    job_source_endpoint_details = get_endpoint_details(job_source_endpoint_id)
+    job_source_endpoint_details = task_context['endpoints_details'][job_source_endpoint_id]
     job_source_endpoint_arn = job_source_endpoint_details['EndpointArn']
     job_source_type = job_source_endpoint_details['EngineName']
 
     # Get target endpoint details from DMS
-    job_target_endpoint_details = get_endpoint_details(job_target_endpoint_id)
-    job_target_endpoint_arn = job_target_endpoint_details['EndpointArn']
-
-    # Get DMS task settings from S3
-    job_settings_key = f'{REPLICATION_JOBS_CONFIG_PREFIX}/{job_name}/settings.json'
-    job_settings = read_s3_json_file(ARTIFACTS_BUCKET_NAME, job_settings_key)
-
-    # Get DMS task mappings from S3
-    job_mappings_key = f'{REPLICATION_JOBS_CONFIG_PREFIX}/{job_name}/mappings.json'
-    job_mappings = read_s3_json_file(ARTIFACTS_BUCKET_NAME, job_mappings_key)
-
-    # Set CDC parameters - Get strat checkpoint when cdc task and stablish stop commit
+    job_target_endpoint_arn = task_context['endpoints_details'][job_target_endpoint_id]['EndpointArn']
+
+    # Get DMS task settings and mappings (compiled inline in the job record or from S3), resolving settings over the profile of the job
+    job_artifacts = task_context['job_artifacts']
+    job_settings = job_artifacts['settings']
+    job_settings_hash = None
+    if job_settings_profile:
+        job_settings, job_settings_hash = resolve_settings(task_context['settings_profile'], job_settings)
+    job_mappings = job_artifacts['mappings']
+    job_tables = None
+    if job_shard:
+        job_mappings = get_shard_mappings(job_mappings, task_context['shard_plan']['shards'], job_shard['Index'])
+        job_tables = next(shard['tables'] for shard in task_context['shard_plan']['shards'] if shard['index'] == job_shard['Index'])
+    elif task_context.get('catalog_snapshot'):
+        job_tables = [
+            table for table in task_context['catalog_snapshot']['tables']
+            if get_selecting_rule(job_mappings, table['schema_name'], table['table_name'])
+        ]
+
+    # Set CDC parameters - Get strat checkpoint when cdc task and stablish stop commit (planned from job history)
     job_cdc_parameters = {}
+    job_cdc_plan = {'WindowSeconds': 0, 'BacklogSeconds': 0}
 
     if job_migration_type == 'cdc':
-        checkpoint_item = get_checkpoint_item(job_checkpoint_name)
+        checkpoint_item = task_context['checkpoint_item']
         checkpoint_regex = CHECKPOINT_REGEX_BY_SOURCE_TYPE[job_source_type]
         job_cdc_parameters['CdcStartPosition'] = re.findall(checkpoint_regex, checkpoint_item['checkpoint'])[0]
 
-        job_stop_commit_time = datetime.now() + timedelta(minutes=5)
+        now = datetime.utcnow()
+        job_cdc_plan = plan_cdc_window(task_context['metrics_history'], now)
+        log(JobName= job_name, CdcPlan= job_cdc_plan)
+
+        job_stop_commit_time = now + timedelta(seconds= job_cdc_plan['WindowSeconds'])
         job_stop_commit_time_str = job_stop_commit_time.strftime('%Y-%m-%dT%H:%M:%S')
         job_cdc_parameters['CdcStopPosition']= f'commit_time:{job_stop_commit_time_str}'
 
-    # Create DMS replication task
-    dms_response = dms.create_replication_task(
-        ReplicationTaskIdentifier= job_name,
-        SourceEndpointArn= job_source_endpoint_arn,
-        TargetEndpointArn= job_target_endpoint_arn,
-        ReplicationInstanceArn= instance_arn,
-        MigrationType= job_migration_type,
-        ReplicationTaskSettings= json.dumps(job_settings),
-        TableMappings= json.dumps(job_mappings),
-        **job_cdc_parameters
-    )
+    # Settings tuning: merge tuned values (from table sizes and previous runs) over task settings
+    job_settings_tuning = {'Mode': job_settings_tuning_mode}
+    if job_settings_tuning_mode == 'auto':
+        job_settings, job_settings_tuning = tune_task_settings(
+            job_settings, job_migration_type, job_tables, task_context['metrics_history'], job_cdc_plan, SETTINGS_TUNING_PROPS
+        )
+        log(JobName= job_name, SettingsTuning= job_settings_tuning)
+
+    # Persistent task mode: reuse the existing task of the job when it is in the same instance and not running
+    existing_task_details = task_context.get('existing_task_details')
+    if existing_task_details and existing_task_details['ReplicationInstanceArn'] != instance_arn:
+        instance_details_cache.invalidate(instance_name)
+        instance_arn = get_instance_details(instance_name)['ReplicationInstanceArn']
+
+    task_reused = False
+    if existing_task_details:
+        if existing_task_details['ReplicationInstanceArn'] != instance_arn:
+            raise RuntimeError(f'Task {job_task_identifier} of persistent job {job_name} exists in another replication instance. Delete it before running the job in instance {instance_name}')
+        if existing_task_details['Status'] not in REUSABLE_TASK_STATUSES:
+            raise RuntimeError(f'Task {job_task_identifier} of persistent job {job_name} is {existing_task_details["Status"]} and can not be reused. Reusable statuses are {REUSABLE_TASK_STATUSES}, failed tasks should be deleted')
+        task_reused = True
+
+    dms = get_client('dms')
+    if task_reused:
+        # Modify DMS replication task with new settings, mappings and CDC positions
+        dms_response = dms.modify_replication_task(
+            ReplicationTaskArn= existing_task_details['ReplicationTaskArn'],
+            MigrationType= job_migration_type,
+            ReplicationTaskSettings= json.dumps(job_settings),
+            TableMappings= json.dumps(job_mappings),
+            **job_cdc_parameters
+        )
+    else:
+        # Create DMS replication task (retrying once with fresh instance details if the cached instance is no longer valid)
+        create_replication_task_parameters = {
+            'ReplicationTaskIdentifier': job_task_identifier,
+            'SourceEndpointArn': job_source_endpoint_arn,
+            'TargetEndpointArn': job_target_endpoint_arn,
+            'MigrationType': job_migration_type,
+            'ReplicationTaskSettings': json.dumps(job_settings),
+            'TableMappings': json.dumps(job_mappings),
+            **job_cdc_parameters
+        }
+
+        try:
+            dms_response = dms.create_replication_task(ReplicationInstanceArn= instance_arn, **create_replication_task_parameters)
+        except (dms.exceptions.ResourceNotFoundFault, dms.exceptions.InvalidResourceStateFault):
+            instance_details_cache.invalidate(instance_name)
+            refreshed_instance_arn = get_instance_details(instance_name)['ReplicationInstanceArn']
+            if refreshed_instance_arn == instance_arn: raise
+
+            dms_response = dms.create_replication_task(ReplicationInstanceArn= refreshed_instance_arn, **create_replication_task_parameters)
 
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
+    log(
+        JobName= job_name,
+        JobArtifacts= {'hash': job_artifacts['hash'], 'location': job_artifacts['location'], 'settings_profile': job_settings_profile, 'settings_hash': job_settings_hash},
+        **get_cache_stats(),
+        S3JsonCache= s3_json_cache.stats()
+    )
 
     # Format response - Replication task details (formatting Status for state machine use and adding start replication task type)
-    replication_task_details = dms_response['ReplicationTask']
+    replication_task_details = normalize_datetimes(dms_response['ReplicationTask'])
     replication_task_details['Status'] = {'LatestStatus': replication_task_details['Status']}
-    replication_task_details['StartReplicationTaskType'] = START_REPLICATION_TASK_TYPE_BY_MIGRATION_TYPE[job_migration_type]
+    replication_task_details['StartReplicationTaskType'] = REUSED_TASK_START_REPLICATION_TASK_TYPE if task_reused else START_REPLICATION_TASK_TYPE_BY_MIGRATION_TYPE[job_migration_type]
+    replication_task_details['TaskReused'] = task_reused
+    replication_task_details['CdcPositions'] = job_cdc_parameters
+    replication_task_details['CdcPlan'] = job_cdc_plan
+    replication_task_details['SettingsTuning'] = job_settings_tuning
+    replication_task_details['ContextResolutionTimings'] = task_context_timings
 
     return replication_task_details
 
 
-def json_datetime_encoder(obj):
-    """ Complementary function to transform dict objects delivered by DMS API into JSONs """
-    
-    if isinstance(obj, (datetime)): return obj.strftime("%Y-%m-%dT%H:%M:%S")
+def resolve_task_context(fetchers):
+    """ Complementary function to run independent context fetchers concurrently so that task creation latency is bounded
+    by the slowest call instead of the sum of all of them.
 
-def get_instance_details(instance_id):
-    """ Complementary function to retrieve DMS instance details from DMS API """
+    Parameters
+    ----------
+    fetchers : dict
+        dict with the name of each context element as key and a callable without arguments that retrieves it as value
 
-    dms_response = dms.describe_replication_instances(
-        Filters= [{'Name': 'replication-instance-id', 'Values':[instance_id]}]
-    )
+    Returns
+    -------
+        context : dict
+            dict with the same keys as fetchers and the value returned by each callable
+        timings : dict
+            dict with the same keys as fetchers and the elapsed milliseconds of each callable, plus a 'total' key
+    """
 
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
-    instance_details = dms_response['ReplicationInstances'][0]
-    
-    return instance_details
+    def timed_fetch(fetcher):
+        fetch_start = time.perf_counter()
+        value = fetcher()
+        return value, round((time.perf_counter() - fetch_start) * 1000, 2)
 
-def get_endpoint_details(endpoint_id):
-    """ Complementary function to retrieve DMS endpoint details from DMS API """
+    resolution_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers= min(CONTEXT_RESOLUTION_MAX_WORKERS, len(fetchers))) as executor:
+        futures = {name: executor.submit(timed_fetch, fetcher) for name, fetcher in fetchers.items()}
+        results = {name: future.result() for name, future in futures.items()}
 
-    dms_response = dms.describe_endpoints(
-        Filters= [{'Name': 'endpoint-id', 'Values':[endpoint_id]}]
-    )
+    context = {name: value for name, (value, _) in results.items()}
+    timings = {name: elapsed for name, (_, elapsed) in results.items()}
+    timings['total'] = round((time.perf_counter() - resolution_start) * 1000, 2)
 
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
-    endpoint_details = dms_response['Endpoints'][0]
-    
-    return endpoint_details
+    return context, timings
 
-def read_s3_json_file(bucket_name, key_path):
-    """ Complementary function to retrieve json from S3 file """
-    
-    object = s3.get_object(
-        Bucket= bucket_name, 
-        Key= key_path
-    )
+def plan_cdc_window(metrics_history, now):
+    """ Complementary function to plan the CDC window (seconds between task creation and CdcStopPosition) of a cdc task.
+    The backlog is the time elapsed since the last execution of the checkpoint stopped. The replay rate is the median, over
+    previous cdc executions, of source seconds processed (backlog + window) per second of execution. A window W drains a 
+    backlog B without idling when B + W source seconds are replayed in W seconds, this is W = B / (rate - 1). Window is kept
+    within CDC_WINDOW_MIN_SECONDS and CDC_WINDOW_MAX_SECONDS, and CDC_WINDOW_DEFAULT_SECONDS is used when there is no history.
+
+    Parameters
+    ----------
+    metrics_history : list
+        most recent metrics records of the job checkpoint (newest first)
+
+    now : datetime
+        current UTC time
+
+    Returns
+    -------
+        cdc_plan : dict
+            dict with 'WindowSeconds', 'BacklogSeconds', 'ReplayRate' (None when not observed yet) and 'Reason' keys
+    """
+
+    last_stop_date = metrics_history[0].get('stop_date') if metrics_history else None
+    if not last_stop_date:
+        return {'WindowSeconds': CDC_WINDOW_DEFAULT_SECONDS, 'BacklogSeconds': 0, 'ReplayRate': None, 'Reason': 'no_history'}
+
+    backlog_seconds = max(0, int((now - datetime.strptime(last_stop_date, '%Y-%m-%dT%H:%M:%S')).total_seconds()))
+
+    replay_rates = [
+        (record['cdc_backlog_seconds'] + record['cdc_window_seconds']) / (record['elapsed_time_millis'] / 1000)
+        for record in metrics_history 
+        if record.get('cdc_window_seconds') and record.get('elapsed_time_millis')
+    ]
+    if not replay_rates:
+        return {'WindowSeconds': CDC_WINDOW_DEFAULT_SECONDS, 'BacklogSeconds': backlog_seconds, 'ReplayRate': None, 'Reason': 'no_cdc_history'}
+
+    replay_rate = statistics.median(replay_rates)
+    if replay_rate <= 1:
+        window_seconds, reason = CDC_WINDOW_MAX_SECONDS, 'replay_slower_than_changes'
+    else:
+        window_seconds, reason = int(backlog_seconds / (replay_rate - 1)), 'drain_backlog'
 
-    json_object = json.loads(object["Body"].read().decode())
+    window_seconds = min(CDC_WINDOW_MAX_SECONDS, max(CDC_WINDOW_MIN_SECONDS, window_seconds))
 
-    return json_object
+    return {'WindowSeconds': window_seconds, 'BacklogSeconds': backlog_seconds, 'ReplayRate': round(replay_rate, 4), 'Reason': reason}
 
 def get_checkpoint_item(checkpoint_name):
     """ Complementary function to retrieve latest checkpoint record for job from DynamoDB """
 
-    dynamodb_response = dynamodb.get_item(
+    dynamodb_response = get_client('dynamodb').get_item(
         TableName= REPLICATION_CHECKPOINTS_TABLE_NAME,
         Key= {
             'job_checkpoint_name': {
@@ -175,6 +344,7 @@ def get_checkpoint_item(checkpoint_name):
         }
     )
 
+    dynamodb_deserializer = get_dynamodb_deserializer()
     checkpoint_item = {key: dynamodb_deserializer.deserialize(value) for key, value in dynamodb_response['Item'].items()}
     
     return checkpoint_item
@@ -1,17 +1,15 @@
 
 import json
-import boto3
 import re
-from datetime import datetime
 import psycopg2
 
+from replication_core.clients import get_client
+from replication_core.dms import get_task_details, get_endpoint_details, get_cache_stats
+from replication_core.logs import log
+
 # Constant: Represents the postgres regex to use to format DMS checkpoint
 CHECKPOINT_REGEX = '[A-Z|0-9]{1}\/[A-Z|0-9]*'
 
-# Boto3 Clients: DMS, Secrets Manager
-dms = boto3.client('dms')
-secrets_manager = boto3.client('secretsmanager') 
-
 def handler(event, context):
     """ Function handler: Function that will duplicate postgres replication slot on source after full replication task 
     completion so that slot is not lost when eliminating DMS task and future CDC tasks are enabled.
@@ -53,6 +51,8 @@ def handler(event, context):
     job_source_endpoint_secret_arn = job_source_endpoint_details['PostgreSQLSettings']['SecretsManagerSecretId']
     job_source_endpoint_secret = get_secret(job_source_endpoint_secret_arn)
 
+    log(JobName= job_name, **get_cache_stats())
+
     # Connect to source database
     conn_source = psycopg2.connect(
         dbname= job_source_endpoint_details['DatabaseName'],
@@ -85,43 +85,13 @@ def handler(event, context):
     
     return response
 
-def json_datetime_encoder(obj):
-    """ Complementary function to transform dict objects delivered by DMS API into JSONs """
-    
-    if isinstance(obj, (datetime)): return obj.strftime("%Y-%m-%dT%H:%M:%S")
-
-def get_task_details(task_name):
-    """ Complementary function to retrieve DMS task details from DMS API """
-
-    dms_response = dms.describe_replication_tasks(
-        Filters= [{'Name': 'replication-task-id', 'Values':[task_name]}]
-    )
-
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
-    task_details = dms_response['ReplicationTasks'][0]
-    
-    return task_details
-
-def get_endpoint_details(endpoint_id):
-    """ Complementary function to retrieve DMS endpoint details from DMS API """
-
-    dms_response = dms.describe_endpoints(
-        Filters= [{'Name': 'endpoint-id', 'Values':[endpoint_id]}]
-    )
-
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
-    endpoint_details = dms_response['Endpoints'][0]
-    
-    return endpoint_details
-
 def get_secret(secret_arn):
     """ Complementary function to retrieve secret value from Secrets Manager """
     
-    secrets_manager_response = secrets_manager.get_secret_value(
+    secrets_manager_response = get_client('secretsmanager').get_secret_value(
         SecretId= secret_arn
     )
 
-    secrets_manager_response = json.loads(json.dumps(secrets_manager_response, default=json_datetime_encoder))
     secret_details = json.loads(secrets_manager_response['SecretString'])
     
     return secret_details
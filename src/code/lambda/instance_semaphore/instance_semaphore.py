@@ -0,0 +1,157 @@
+import os
+import time
+
+from replication_core.clients import get_client, get_dynamodb_serializer
+from replication_core.instance_slots import get_instance_slots
+from replication_core.durations import put_duration
+from replication_core.logs import log
+
+# Constant: Supported actions. 'acquire' takes a task slot of the instance (or queues for it), 'renew' extends its lease, 'release' frees it
+INSTANCE_SEMAPHORE_ACTIONS = ['acquire', 'renew', 'release']
+
+# Constant: Max number of optimistic (conditional) writes attempted when other workflows update the instance slots concurrently
+MAX_WRITE_ATTEMPTS = 5
+
+# Constants: Lambda environment variables
+REPLICATION_INSTANCES_TABLE_NAME = os.getenv('REPLICATION_INSTANCES_TABLE_NAME')
+REPLICATION_DURATIONS_TABLE_NAME = os.getenv('REPLICATION_DURATIONS_TABLE_NAME')
+DEFAULT_MAX_CONCURRENT_TASKS = int(os.getenv('DEFAULT_MAX_CONCURRENT_TASKS', '4'))
+SLOT_LEASE_SECONDS = int(os.getenv('SLOT_LEASE_SECONDS', '21600'))
+WAITER_LEASE_SECONDS = int(os.getenv('WAITER_LEASE_SECONDS', '600'))
+
+class InstanceSlotUnavailable(Exception):
+    """ Raised when all task slots of the instance are taken (or earlier waiters are queued). Workflows retry on it with backoff """
+    pass
+
+def handler(event, context):
+    """ Function handler: 1/ On 'acquire' action will take a task slot of the replication instance when one is free and the workflow
+    is first in the queue of waiters (raising InstanceSlotUnavailable and queueing it otherwise), recording its wait time. 2/ On 'renew'
+    action (every status poll of the workflow) will extend the lease of the task slot of the workflow. 3/ On 'release' action will free the
+    task slot of the workflow. Slots and waiters are stored in the instance record and expire after a lease time so that workflows that never
+    release them (crashes, timeouts) do not block the instance. Expired slots of workflows still running are kept (and renewed).
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action', 'InstanceName' and 'HolderId' (workflow execution id) keys. 'acquire' action
+        can include 'JobName' key for wait time metrics.
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        instance_slot : dict
+            dict with 'InstanceName', 'HolderId', 'Holders' (slots taken after the action) and, for 'acquire' action, 'WaitSeconds',
+            or for 'renew' action, 'Renewed' (False when the workflow holds no slot)
+    """
+
+    action = event['Action']
+    if action not in INSTANCE_SEMAPHORE_ACTIONS:
+        raise ValueError(f'Unsupported instance semaphore action {action}. Supported actions are {INSTANCE_SEMAPHORE_ACTIONS}')
+
+    instance_name = event['InstanceName']
+    holder_id = event['HolderId']
+
+    for _ in range(MAX_WRITE_ATTEMPTS):
+        instance_slots = get_instance_slots(REPLICATION_INSTANCES_TABLE_NAME, instance_name, DEFAULT_MAX_CONCURRENT_TASKS)
+        now = int(time.time())
+        holders = get_live_holders(instance_slots['Holders'], now)
+        waiters = {key: value for key, value in instance_slots['Waiters'].items() if value['expires_at'] > now}
+
+        slot_acquired = False
+        if action == 'release':
+            holders.pop(holder_id, None)
+            waiters.pop(holder_id, None)
+        elif action == 'renew':
+            if holder_id not in holders: break
+            holders[holder_id]['expires_at'] = now + SLOT_LEASE_SECONDS
+        elif holder_id in holders:
+            holders[holder_id]['expires_at'] = now + SLOT_LEASE_SECONDS
+        else:
+            waiter = waiters.get(holder_id, {'requested_at': now})
+            waiters[holder_id] = {'requested_at': waiter['requested_at'], 'expires_at': now + WAITER_LEASE_SECONDS}
+            queue = sorted(waiters, key= lambda key: waiters[key]['requested_at'])
+            free_slots = instance_slots['MaxConcurrentTasks'] - len(holders)
+            if holder_id in queue[:max(free_slots, 0)]:
+                waiters.pop(holder_id)
+                holders[holder_id] = {'acquired_at': now, 'expires_at': now + SLOT_LEASE_SECONDS}
+                slot_acquired = True
+
+        if put_instance_slots(instance_name, holders, waiters, instance_slots['Version']):
+            break
+    else:
+        if action == 'release':
+            raise RuntimeError(f'Could not release task slot of instance {instance_name} after {MAX_WRITE_ATTEMPTS} attempts')
+        raise InstanceSlotUnavailable(f'Could not update task slots of instance {instance_name} after {MAX_WRITE_ATTEMPTS} attempts')
+
+    if action == 'acquire' and holder_id not in holders:
+        queue_position = sorted(waiters, key= lambda key: waiters[key]['requested_at']).index(holder_id) + 1
+        log(Action= action, InstanceName= instance_name, Holders= len(holders), QueuePosition= queue_position)
+        raise InstanceSlotUnavailable(f'No task slot of instance {instance_name} available ({len(holders)} taken). Queue position {queue_position}')
+
+    instance_slot = {'InstanceName': instance_name, 'HolderId': holder_id, 'Holders': len(holders)}
+    if action == 'renew':
+        instance_slot['Renewed'] = holder_id in holders
+    if action == 'acquire':
+        wait_seconds = int(now - waiter['requested_at']) if slot_acquired else 0
+        instance_slot['WaitSeconds'] = wait_seconds
+        if slot_acquired:
+            put_duration(
+                REPLICATION_DURATIONS_TABLE_NAME,
+                f'instance_slot_wait#{instance_name}',
+                wait_seconds,
+                attributes= {'job_name': event.get('JobName', ''), 'holders': len(holders), 'waiters': len(waiters)}
+            )
+
+    log(Action= action, **instance_slot)
+
+    return instance_slot
+
+def get_live_holders(holders, now):
+    """ Complementary function to drop expired task slot holders. Holders are workflow execution ids, so that an expired holder whose
+    execution is still running (its lease was not renewed in time) keeps its slot with a renewed lease instead of letting another task in
+    over the instance capacity
+    """
+
+    live_holders = {}
+    for holder_id, holder in holders.items():
+        if holder['expires_at'] > now:
+            live_holders[holder_id] = holder
+        elif is_execution_running(holder_id):
+            live_holders[holder_id] = {**holder, 'expires_at': now + SLOT_LEASE_SECONDS}
+
+    return live_holders
+
+def is_execution_running(execution_arn):
+    """ Complementary function to check if a workflow execution is still running. Unknown executions are not running """
+
+    stepfunctions = get_client('stepfunctions')
+    try:
+        return stepfunctions.describe_execution(executionArn= execution_arn)['status'] == 'RUNNING'
+    except (stepfunctions.exceptions.ExecutionDoesNotExist, stepfunctions.exceptions.InvalidArn):
+        return False
+
+def put_instance_slots(instance_name, holders, waiters, version):
+    """ Complementary function to write task slot holders and waiters of an instance only if no other workflow updated them
+    since they were read. Returns False when the conditional write fails so that the update can be attempted again
+    """
+
+    dynamodb_serializer = get_dynamodb_serializer()
+    try:
+        get_client('dynamodb').update_item(
+            TableName= REPLICATION_INSTANCES_TABLE_NAME,
+            Key= {'instance_name': {'S': instance_name}},
+            UpdateExpression= 'SET task_slot_holders = :holders, task_slot_waiters = :waiters, task_slot_version = :new_version',
+            ConditionExpression= 'attribute_not_exists(task_slot_version)' if version is None else 'task_slot_version = :version',
+            ExpressionAttributeValues= {
+                ':holders': dynamodb_serializer.serialize({key: {field: int(value) for field, value in slot.items()} for key, slot in holders.items()}),
+                ':waiters': dynamodb_serializer.serialize({key: {field: int(value) for field, value in slot.items()} for key, slot in waiters.items()}),
+                ':new_version': {'N': str((version or 0) + 1)},
+                **({} if version is None else {':version': {'N': str(version)}})
+            }
+        )
+    except get_client('dynamodb').exceptions.ConditionalCheckFailedException:
+        return False
+
+    return True
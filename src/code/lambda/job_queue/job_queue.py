@@ -0,0 +1,260 @@
+import os
+import re
+import json
+import time
+import hashlib
+from datetime import datetime, timezone, timedelta
+
+from replication_core.clients import get_client
+from replication_core.durations import put_duration
+from replication_core.instance_slots import get_instance_slots
+from replication_core.logs import log
+
+# Constant: Supported actions. 'enqueue' adds a job run to the queue, 'dispatch' starts queued job runs on available instance capacity
+JOB_QUEUE_ACTIONS = ['enqueue', 'dispatch']
+
+# Constant: Suffix of the queue partition holding dispatched job runs until their execution finishes
+DISPATCHED_PARTITION_SUFFIX = '#dispatched'
+
+# Constant: Date format of enqueue times and deadlines. Sortable so that queue keys follow earliest deadline order
+QUEUE_DATE_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+
+# Constant: Seconds after which a dispatched job run whose execution does not exist is considered an abandoned claim (dispatch failed
+# between claiming the job run and starting its execution), so that the job run is dispatched again
+DISPATCH_CLAIM_GRACE_SECONDS = 300
+
+# Constants: Lambda environment variables
+REPLICATION_JOB_QUEUE_TABLE_NAME = os.getenv('REPLICATION_JOB_QUEUE_TABLE_NAME')
+REPLICATION_INSTANCES_TABLE_NAME = os.getenv('REPLICATION_INSTANCES_TABLE_NAME')
+REPLICATION_DURATIONS_TABLE_NAME = os.getenv('REPLICATION_DURATIONS_TABLE_NAME')
+DEFAULT_QUEUE_NAME = os.getenv('DEFAULT_QUEUE_NAME', 'default')
+DEFAULT_PRIORITY = int(os.getenv('DEFAULT_PRIORITY', '100'))
+DEFAULT_DEADLINE_MINUTES = int(os.getenv('DEFAULT_DEADLINE_MINUTES', '60'))
+DEFAULT_MAX_CONCURRENT_TASKS = int(os.getenv('DEFAULT_MAX_CONCURRENT_TASKS', '4'))
+
+def handler(event, context):
+    """ Function handler: 1/ On 'enqueue' action (cron rule of a job flow) will add a job run to the queue with its priority and deadline.
+    2/ On 'dispatch' action (rate rule) will start queued job runs in priority and earliest deadline order while their instance has free
+    task slots, and record queue wait time, depth and deadline misses.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action' key. 'enqueue' action expects 'StateMachineArn' and 'ExecutionInput' (with 'JobName'
+        and 'InstanceName') keys, and optional 'Queue', 'Priority' (lower is dispatched first), 'DeadlineMinutes' and 'EnqueuedTime' keys.
+        'dispatch' action expects optional 'Queue' key.
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        job_queue_details : dict
+            dict with the queued job run for 'enqueue' action, or with 'Dispatched', 'Queued', 'Overdue' and 'Running' counts for 'dispatch' action
+    """
+
+    action = event['Action']
+    if action not in JOB_QUEUE_ACTIONS:
+        raise ValueError(f'Unsupported job queue action {action}. Supported actions are {JOB_QUEUE_ACTIONS}')
+
+    queue_name = event.get('Queue', DEFAULT_QUEUE_NAME)
+    if action == 'enqueue':
+        return enqueue_job_run(queue_name, event)
+
+    return dispatch_job_runs(queue_name)
+
+def enqueue_job_run(queue_name, event):
+    """ Complementary function to add a job run to the queue. Queue keys start with the priority and deadline so that queued
+    job runs are read in dispatch order
+    """
+
+    execution_input = event['ExecutionInput']
+    enqueued_at = datetime.strptime(event['EnqueuedTime'], QUEUE_DATE_FORMAT).replace(tzinfo= timezone.utc) if 'EnqueuedTime' in event else datetime.now(timezone.utc)
+    priority = int(event.get('Priority', DEFAULT_PRIORITY))
+    deadline = enqueued_at + timedelta(minutes= int(event.get('DeadlineMinutes', DEFAULT_DEADLINE_MINUTES)))
+
+    job_run = {
+        'queue_name': queue_name,
+        'queue_key': f"{priority:04d}#{deadline.strftime(QUEUE_DATE_FORMAT)}#{enqueued_at.strftime(QUEUE_DATE_FORMAT)}#{execution_input['JobName']}",
+        'job_name': execution_input['JobName'],
+        'instance_name': execution_input['InstanceName'],
+        'state_machine_arn': event['StateMachineArn'],
+        'execution_input': json.dumps(execution_input),
+        'priority': str(priority),
+        'deadline': deadline.strftime(QUEUE_DATE_FORMAT),
+        'enqueued_at': enqueued_at.strftime(QUEUE_DATE_FORMAT)
+    }
+
+    get_client('dynamodb').put_item(
+        TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+        Item= {key: {'S': value} for key, value in job_run.items()}
+    )
+
+    log(Action= 'enqueue', **{key: value for key, value in job_run.items() if key != 'execution_input'})
+
+    return job_run
+
+def dispatch_job_runs(queue_name):
+    """ Complementary function to dispatch queued job runs. Dispatched job runs still running count as taken slots of their instance
+    (their tasks may not have acquired a slot yet), so an instance is available when it has more slots than max(holders + waiters,
+    running dispatched job runs). Job runs of unavailable instances stay queued without blocking job runs of other instances
+    """
+
+    started_at = time.time()
+    now = datetime.now(timezone.utc)
+    running_job_runs = get_running_job_runs(queue_name)
+    queued_job_runs = get_job_runs(queue_name)
+
+    free_slots_by_instance = {}
+    dispatched_job_runs = []
+    for job_run in queued_job_runs:
+        instance_name = job_run['instance_name']
+        if instance_name not in free_slots_by_instance:
+            free_slots_by_instance[instance_name] = get_free_slots(instance_name, running_job_runs, now)
+        if free_slots_by_instance[instance_name] <= 0: continue
+
+        if start_job_run(queue_name, job_run):
+            free_slots_by_instance[instance_name] -= 1
+            dispatched_job_runs.append(job_run)
+
+            wait_seconds = (now - datetime.strptime(job_run['enqueued_at'], QUEUE_DATE_FORMAT).replace(tzinfo= timezone.utc)).total_seconds()
+            deadline_missed = now.strftime(QUEUE_DATE_FORMAT) > job_run['deadline']
+            put_duration(
+                REPLICATION_DURATIONS_TABLE_NAME,
+                f'job_queue_wait#{queue_name}',
+                wait_seconds,
+                attributes= {'job_name': job_run['job_name'], 'priority': job_run['priority'], 'deadline_missed': deadline_missed}
+            )
+
+    remaining_job_runs = [job_run for job_run in queued_job_runs if job_run not in dispatched_job_runs]
+    overdue_job_runs = [job_run for job_run in remaining_job_runs if now.strftime(QUEUE_DATE_FORMAT) > job_run['deadline']]
+    oldest_wait_seconds = max([(now - datetime.strptime(job_run['enqueued_at'], QUEUE_DATE_FORMAT).replace(tzinfo= timezone.utc)).total_seconds() for job_run in remaining_job_runs], default= 0)
+
+    job_queue_details = {
+        'Dispatched': len(dispatched_job_runs),
+        'Queued': len(remaining_job_runs),
+        'Overdue': len(overdue_job_runs),
+        'Running': len(running_job_runs) + len(dispatched_job_runs)
+    }
+
+    put_duration(
+        REPLICATION_DURATIONS_TABLE_NAME,
+        f'job_queue_depth#{queue_name}',
+        oldest_wait_seconds,
+        attributes= {'depth': len(remaining_job_runs), 'dispatched': len(dispatched_job_runs), 'overdue': len(overdue_job_runs), 'dispatch_seconds': round(time.time() - started_at, 3)}
+    )
+
+    log(Action= 'dispatch', Queue= queue_name, **job_queue_details)
+
+    return job_queue_details
+
+def get_job_runs(partition_name):
+    """ Complementary function to retrieve (paginating) the job runs of a queue partition in queue key order """
+
+    job_runs = []
+    paginator = get_client('dynamodb').get_paginator('query')
+    for page in paginator.paginate(
+        TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+        KeyConditionExpression= 'queue_name = :name',
+        ExpressionAttributeValues= {':name': {'S': partition_name}},
+        ConsistentRead= True
+    ):
+        job_runs.extend([{key: value['S'] for key, value in item.items()} for item in page['Items']])
+
+    return job_runs
+
+def get_running_job_runs(queue_name):
+    """ Complementary function to retrieve dispatched job runs whose execution is still running. Finished ones, and claims whose
+    execution was never started, are removed from the dispatched partition
+    """
+
+    stepfunctions = get_client('stepfunctions')
+    dynamodb = get_client('dynamodb')
+    now = datetime.now(timezone.utc)
+
+    running_job_runs = []
+    for job_run in get_job_runs(f'{queue_name}{DISPATCHED_PARTITION_SUFFIX}'):
+        try:
+            job_run_running = stepfunctions.describe_execution(executionArn= job_run['execution_arn'])['status'] == 'RUNNING'
+        except stepfunctions.exceptions.ExecutionDoesNotExist:
+            dispatched_at = datetime.strptime(job_run['dispatched_at'], QUEUE_DATE_FORMAT).replace(tzinfo= timezone.utc)
+            job_run_running = (now - dispatched_at).total_seconds() < DISPATCH_CLAIM_GRACE_SECONDS
+
+        if job_run_running:
+            running_job_runs.append(job_run)
+        else:
+            dynamodb.delete_item(
+                TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+                Key= {'queue_name': {'S': job_run['queue_name']}, 'queue_key': {'S': job_run['queue_key']}}
+            )
+
+    return running_job_runs
+
+def get_free_slots(instance_name, running_job_runs, now):
+    """ Complementary function to compute the free task slots of an instance for dispatching """
+
+    instance_slots = get_instance_slots(REPLICATION_INSTANCES_TABLE_NAME, instance_name, DEFAULT_MAX_CONCURRENT_TASKS)
+    epoch = now.timestamp()
+    taken_slots = len([slot for slot in instance_slots['Holders'].values() if slot['expires_at'] > epoch])
+    taken_slots += len([slot for slot in instance_slots['Waiters'].values() if slot['expires_at'] > epoch])
+    running_slots = len([job_run for job_run in running_job_runs if job_run['instance_name'] == instance_name])
+
+    return instance_slots['MaxConcurrentTasks'] - max(taken_slots, running_slots)
+
+def start_job_run(queue_name, job_run):
+    """ Complementary function to dispatch a job run: 1/ claim it by writing it (conditionally, so that overlapping dispatches do not
+    start it twice) into the dispatched partition, where it is kept until its execution finishes, 2/ start its execution with a name derived
+    from the job run, so that starting it again after a failed dispatch does not start a second execution, and 3/ take it out of the queue.
+    When the execution cannot be started the claim is removed and the job run stays queued. Returns False when the job run was not dispatched
+    """
+
+    dynamodb = get_client('dynamodb')
+    stepfunctions = get_client('stepfunctions')
+
+    execution_name = get_execution_name(queue_name, job_run)
+    dispatched_job_run = {
+        **job_run,
+        'queue_name': f'{queue_name}{DISPATCHED_PARTITION_SUFFIX}',
+        'execution_arn': f"{job_run['state_machine_arn'].replace(':stateMachine:', ':execution:')}:{execution_name}",
+        'dispatched_at': datetime.now(timezone.utc).strftime(QUEUE_DATE_FORMAT)
+    }
+    try:
+        dynamodb.put_item(
+            TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+            Item= {key: {'S': value} for key, value in dispatched_job_run.items()},
+            ConditionExpression= 'attribute_not_exists(queue_key)'
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        return False
+
+    try:
+        stepfunctions.start_execution(
+            stateMachineArn= job_run['state_machine_arn'],
+            name= execution_name,
+            input= job_run['execution_input']
+        )
+    except stepfunctions.exceptions.ExecutionAlreadyExists:
+        pass # Started by a previous dispatch that failed before taking the job run out of the queue
+    except Exception as exception:
+        dynamodb.delete_item(
+            TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+            Key= {'queue_name': {'S': dispatched_job_run['queue_name']}, 'queue_key': {'S': job_run['queue_key']}}
+        )
+        log(Action= 'dispatch', Queue= queue_name, JobName= job_run['job_name'], Error= repr(exception))
+        return False
+
+    dynamodb.delete_item(
+        TableName= REPLICATION_JOB_QUEUE_TABLE_NAME,
+        Key= {'queue_name': {'S': queue_name}, 'queue_key': {'S': job_run['queue_key']}}
+    )
+
+    return True
+
+def get_execution_name(queue_name, job_run):
+    """ Complementary function to derive the execution name of a job run (job name and a hash of its queue key, within the 80 characters
+    and character set allowed by Step Functions), so that every job run maps to a single execution
+    """
+
+    job_run_hash = hashlib.sha256(f"{queue_name}#{job_run['queue_key']}".encode()).hexdigest()[:32]
+
+    return f"{re.sub('[^A-Za-z0-9_-]', '-', job_run['job_name'])[:40]}-{job_run_hash}"
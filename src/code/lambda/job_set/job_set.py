@@ -0,0 +1,115 @@
+import os
+from datetime import datetime, timezone
+
+from replication_core.clients import get_client
+from replication_core.logs import log
+
+# Constant: Supported actions. 'list' resolves the job names of the set, 'summarize' aggregates the results of the set execution
+JOB_SET_ACTIONS = ['list', 'summarize']
+
+# Constants: Lambda environment variables
+REPLICATION_JOBS_TABLE_NAME = os.getenv('REPLICATION_JOBS_TABLE_NAME')
+
+def handler(event, context):
+    """ Function handler: 1/ On 'list' action will retrieve the names of the jobs of a job set from DynamoDB jobs table 
+    (all jobs when no 'JobSet' is specified). 2/ On 'summarize' action will aggregate the results of every job execution of the set.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action' key. 'list' action expects 'Input' key with the workflow input, where
+        optional 'JobSet' and 'MigrationType' keys filter jobs. 'summarize' action expects 'JobResults' key with the list of results of each job execution
+        (or of each scheduled instance, holding the results of its jobs).
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        job_set_details : dict
+            dict with 'JobNames' key for 'list' action, or with the aggregated results for 'summarize' action
+    """
+
+    action = event['Action']
+    if action not in JOB_SET_ACTIONS:
+        raise ValueError(f'Unsupported job set action {action}. Supported actions are {JOB_SET_ACTIONS}')
+
+    if action == 'list':
+        job_set_input = event['Input']
+        job_names = get_job_names(job_set_input.get('JobSet'), job_set_input.get('MigrationType'))
+        log(Action= action, JobSet= job_set_input.get('JobSet'), Jobs= len(job_names))
+        return {'JobNames': job_names}
+
+    job_set_summary = get_job_set_summary(flatten_job_results(event['JobResults']))
+    log(Action= action, **{key: value for key, value in job_set_summary.items() if key not in ['SucceededJobs', 'FailedJobs']})
+
+    return job_set_summary
+
+def get_job_names(job_set, migration_type):
+    """ Complementary function to retrieve (paginating) the sorted names of the jobs matching the specified filters """
+
+    filters = {'job_set': job_set, 'migration_type': migration_type}
+    filters = {key: value for key, value in filters.items() if value}
+
+    scan_parameters = {
+        'TableName': REPLICATION_JOBS_TABLE_NAME,
+        'ProjectionExpression': 'job_name'
+    }
+    if filters:
+        scan_parameters['FilterExpression'] = ' AND '.join([f'#{key} = :{key}' for key in filters])
+        scan_parameters['ExpressionAttributeNames'] = {f'#{key}': key for key in filters}
+        scan_parameters['ExpressionAttributeValues'] = {f':{key}': {'S': value} for key, value in filters.items()}
+
+    job_names = []
+    for page in get_client('dynamodb').get_paginator('scan').paginate(**scan_parameters):
+        job_names.extend([item['job_name']['S'] for item in page['Items']])
+
+    return sorted(job_names)
+
+def flatten_job_results(job_results):
+    """ Complementary function to flatten the results of scheduled instances into job results. Jobs of an instance
+    that could not be created are considered failed
+    """
+
+    flat_job_results = []
+    for result in job_results:
+        if 'JobResults' in result:
+            flat_job_results.extend(result['JobResults'])
+        elif 'JobNames' in result:
+            flat_job_results.extend([{'JobName': job_name, 'Status': 'FAILED', 'Error': result.get('Error')} for job_name in result['JobNames']])
+        else:
+            flat_job_results.append(result)
+
+    return flat_job_results
+
+def get_job_set_summary(job_results):
+    """ Complementary function to aggregate job execution results. Makespan is the time between the first job start and 
+    the last job stop, and throughput the number of succeeded jobs per hour of makespan
+    """
+
+    succeeded_jobs = [result['JobName'] for result in job_results if result['Status'] == 'SUCCEEDED']
+    failed_jobs = [result['JobName'] for result in job_results if result['Status'] != 'SUCCEEDED']
+
+    start_dates = [parse_date(result['StartDate']) for result in job_results if result.get('StartDate')]
+    stop_dates = [parse_date(result['StopDate']) for result in job_results if result.get('StopDate')]
+    makespan_seconds = (max(stop_dates) - min(start_dates)).total_seconds() if start_dates and stop_dates else 0
+
+    job_set_summary = {
+        'Jobs': len(job_results),
+        'Succeeded': len(succeeded_jobs),
+        'Failed': len(failed_jobs),
+        'MakespanSeconds': round(makespan_seconds, 3),
+        'ThroughputJobsPerHour': round(len(succeeded_jobs) * 3600 / makespan_seconds, 3) if makespan_seconds else 0,
+        'SucceededJobs': succeeded_jobs,
+        'FailedJobs': failed_jobs
+    }
+
+    return job_set_summary
+
+def parse_date(value):
+    """ Complementary function to parse execution dates, either epoch milliseconds or ISO 8601 strings """
+
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz= timezone.utc)
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
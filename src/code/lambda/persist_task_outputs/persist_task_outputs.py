@@ -1,9 +1,11 @@
 import os
-import json
-import boto3
-from boto3.dynamodb.types import TypeSerializer
 import re
-from datetime import datetime
+from decimal import Decimal
+
+from replication_core.clients import get_dynamodb_serializer
+from replication_core.dms import get_task_details, get_table_statistics
+from replication_core.batch_writes import BatchWriter
+from replication_core.logs import log
 
 # Constant: Represents the keys to keep from DMS API response when requesting DMS task details.
 REPLICATION_TASK_KEYS = [
@@ -17,6 +19,16 @@ DEFAULT_OUTPUT_VALUES = {
     'CdcStopPosition': ''
 }
 
+# Constant: Represents the DMS table statistics keys stored on per-table metrics items (only when not zero), by metrics attribute name
+TABLE_STATISTICS_KEYS = {
+    'inserts': 'Inserts',
+    'updates': 'Updates',
+    'deletes': 'Deletes',
+    'ddls': 'Ddls',
+    'full_load_rows': 'FullLoadRows',
+    'full_load_error_rows': 'FullLoadErrorRows'
+}
+
 # Constant: Value to be used to identify mos recent checkpoint for a job in the job checkpoints table
 LATEST_CHECKPOINT_JOB_START_VALUE = 'latest'
 
@@ -24,14 +36,11 @@ LATEST_CHECKPOINT_JOB_START_VALUE = 'latest'
 REPLICATION_METRICS_TABLE_NAME = os.getenv('REPLICATION_METRICS_TABLE_NAME')
 REPLICATION_CHECKPOINTS_TABLE_NAME = os.getenv('REPLICATION_CHECKPOINTS_TABLE_NAME')
 
-# Boto3 Clients: DMS, DynamoDB
-dms = boto3.client('dms')
-dynamodb = boto3.client('dynamodb')
-dynamodb_serializer = TypeSerializer()
-
 def handler(event, context):
     """ Function handler: 1/ Will retrieve Task details from DMS API. 2/ Persist checkpoint value in DynamoDB (preserving DMS
-    original value). 3/ Persist task metrics in DynamoDB. 4/ Format DMS API response and return DMS task details.
+    original value). 3/ Persist task metrics in DynamoDB (with the CDC plan and tuned task settings of the run). 4/ Persist per-table
+    statistics of the task in DynamoDB metrics table (one item per table keyed by job checkpoint and table). Checkpoints and then metrics are
+    written with a batch writer retrying unprocessed items, so that a throttled write fails the step instead of being lost. 5/ Format DMS API response and return DMS task details.
 
     Parameters
     ----------
@@ -54,67 +63,55 @@ def handler(event, context):
 
     # Get final task details from DMS
     replication_task_arn = job_details['ReplicationTaskArn']
-    dms_response = dms.describe_replication_tasks(
-        Filters= [{'Name': 'replication-task-arn', 'Values':[replication_task_arn]}]
-    )
-
-    dms_response = json.loads(json.dumps(dms_response, default=json_datetime_encoder))
-    job_task_details = {
-        key: dms_response['ReplicationTasks'][0][key] for key in REPLICATION_TASK_KEYS if key in dms_response['ReplicationTasks'][0]
-    }
+    job_task_details = get_task_details(replication_task_arn, task_filter_name= 'replication-task-arn', keys= REPLICATION_TASK_KEYS)
 
     # Save checkpoints in DynamoDB (both for current execution and latest)
     job_checkpoint_name = job_config['job_checkpoint_name']
     job_start = job_task_details['ReplicationTaskStartDate'] 
     job_checkpoint = job_task_details['RecoveryCheckpoint'] 
 
-    dynamo_response = dynamodb.batch_write_item(
-        RequestItems= {
-            REPLICATION_CHECKPOINTS_TABLE_NAME: [
-                {
-                    'PutRequest': {
-                        'Item': {
-                            'job_checkpoint_name': dynamodb_serializer.serialize(job_checkpoint_name),
-                            'job_start':  dynamodb_serializer.serialize(job_start),
-                            'job_name': dynamodb_serializer.serialize(job_name),
-                            'checkpoint': dynamodb_serializer.serialize(job_checkpoint)
-                        }
-                    }
-                },
-                {
-                    'PutRequest': {
-                        'Item': {
-                            'job_checkpoint_name': dynamodb_serializer.serialize(f'{job_checkpoint_name}'),
-                            'job_start':  dynamodb_serializer.serialize(LATEST_CHECKPOINT_JOB_START_VALUE),
-                            'job_name': dynamodb_serializer.serialize(job_name),
-                            'checkpoint': dynamodb_serializer.serialize(job_checkpoint)
-                        }
-                    }
-                } 
-            ]
-                
-        }
-    )
+    dynamodb_serializer = get_dynamodb_serializer()
+    batch_writer = BatchWriter()
+    for checkpoint_job_start in [job_start, LATEST_CHECKPOINT_JOB_START_VALUE]:
+        batch_writer.put(REPLICATION_CHECKPOINTS_TABLE_NAME, {
+            'job_checkpoint_name': dynamodb_serializer.serialize(job_checkpoint_name),
+            'job_start':  dynamodb_serializer.serialize(checkpoint_job_start),
+            'job_name': dynamodb_serializer.serialize(job_name),
+            'checkpoint': dynamodb_serializer.serialize(job_checkpoint)
+        })
+    # Checkpoints are flushed on their own, so that failing to write metrics never leaves a stale checkpoint for the next run
+    batch_writer.flush()
+
+    # Save per-table metrics in DynamoDB
+    table_metrics_items = [
+        get_table_metrics_item(job_checkpoint_name, job_start, job_name, table_statistics, dynamodb_serializer)
+        for table_statistics in get_table_statistics(replication_task_arn)
+    ]
 
     # Save metrics in DynamoDB
     job_metrics = {camel_to_snake(key): value for key, value in job_task_details['ReplicationTaskStats'].items()}
-    dynamo_response = dynamodb.batch_write_item(
-        RequestItems= {
-            REPLICATION_METRICS_TABLE_NAME: [
-                {
-                    'PutRequest': {
-                        'Item': {
-                            'job_checkpoint_name': dynamodb_serializer.serialize(job_checkpoint_name),
-                            'job_start':  dynamodb_serializer.serialize(job_start),
-                            'job_name': dynamodb_serializer.serialize(job_name),
-                            **{key: dynamodb_serializer.serialize(value) for key, value in job_metrics.items()}
-                        }
-                    }
-                } 
-            ]
-                
-        }
-    )
+    job_metrics['tables_captured'] = len(table_metrics_items)
+    if 'CdcPlan' in job_details:
+        job_metrics['cdc_window_seconds'] = job_details['CdcPlan']['WindowSeconds']
+        job_metrics['cdc_backlog_seconds'] = job_details['CdcPlan']['BacklogSeconds']
+    if job_details.get('SettingsTuning', {}).get('Mode') == 'auto':
+        job_settings_tuning = job_details['SettingsTuning']
+        job_metrics['settings_tuning_reason'] = job_settings_tuning['Reason']
+        job_metrics['settings_tuning_values'] = job_settings_tuning['Values']
+        if job_settings_tuning['Load'] is not None:
+            job_metrics['settings_tuning_load'] = Decimal(str(job_settings_tuning['Load']))
+    batch_writer.put(REPLICATION_METRICS_TABLE_NAME, {
+        'job_checkpoint_name': dynamodb_serializer.serialize(job_checkpoint_name),
+        'job_start':  dynamodb_serializer.serialize(job_start),
+        'job_name': dynamodb_serializer.serialize(job_name),
+        **{key: dynamodb_serializer.serialize(value) for key, value in job_metrics.items()}
+    })
+    for table_metrics_item in table_metrics_items:
+        batch_writer.put(REPLICATION_METRICS_TABLE_NAME, table_metrics_item)
+
+    # Write metrics in as few requests as possible, retrying unprocessed items
+    batch_write_stats = batch_writer.flush()
+    log(JobName= job_name, JobCheckpointName= job_checkpoint_name, BatchWrite= batch_write_stats)
 
     # Create and return response with all final details (merge of details and dms task describe results)
     replication_task_details = {
@@ -128,11 +125,25 @@ def handler(event, context):
 
     return replication_task_details
 
+def get_table_metrics_item(job_checkpoint_name, job_start, job_name, table_statistics, dynamodb_serializer):
+    """ Complementary function to build the metrics item of a table from its DMS table statistics. Items are kept compact:
+    only counters other than zero are stored, and full load elapsed time when DMS reports both full load start and end times
+    """
+
+    table_metrics = {
+        'job_checkpoint_name': f"{job_checkpoint_name}#{table_statistics['SchemaName']}.{table_statistics['TableName']}",
+        'job_start': job_start,
+        'job_name': job_name,
+        'table_state': table_statistics.get('TableState', '')
+    }
+    for key, statistics_key in TABLE_STATISTICS_KEYS.items():
+        if table_statistics.get(statistics_key): table_metrics[key] = table_statistics[statistics_key]
+
+    if table_statistics.get('FullLoadStartTime') and table_statistics.get('FullLoadEndTime'):
+        full_load_elapsed = table_statistics['FullLoadEndTime'] - table_statistics['FullLoadStartTime']
+        table_metrics['full_load_elapsed_seconds'] = Decimal(str(round(full_load_elapsed.total_seconds(), 3)))
 
-def json_datetime_encoder(obj):
-    """ Complementary function to encode JSON values into DynamoDB attribute values """
-    
-    if isinstance(obj, (datetime)): return obj.strftime("%Y-%m-%dT%H:%M:%S")
+    return {key: dynamodb_serializer.serialize(value) for key, value in table_metrics.items()}
 
 def camel_to_snake(name):
     """ Complementary function to transform a string from Camel to Snake format """
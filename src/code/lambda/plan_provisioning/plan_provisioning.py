@@ -0,0 +1,82 @@
+import os
+import math
+from datetime import datetime, timedelta, timezone
+
+from replication_core.durations import get_recent_durations, put_duration
+from replication_core.logs import log
+
+# Constant: Supported actions. 'plan' computes when to start instance creation, 'report' records the start time SLO of the job
+PROVISIONING_ACTIONS = ['plan', 'report']
+
+# Constants: Lambda environment variables
+REPLICATION_DURATIONS_TABLE_NAME = os.getenv('REPLICATION_DURATIONS_TABLE_NAME')
+PROVISIONING_PERCENTILE = float(os.getenv('PROVISIONING_PERCENTILE', '0.9'))
+PROVISIONING_SAFETY_SECONDS = int(os.getenv('PROVISIONING_SAFETY_SECONDS', '60'))
+PROVISIONING_HISTORY_SIZE = int(os.getenv('PROVISIONING_HISTORY_SIZE', '20'))
+START_SLO_SECONDS = int(os.getenv('START_SLO_SECONDS', '60'))
+
+def handler(event, context):
+    """ Function handler: 1/ On 'plan' action will compute the seconds to wait before creating the instance so that it is
+    available at the target start time of the job (scheduled time + provisioning lead), based on historical creation durations
+    for the instance type and availability zone. 2/ On 'report' action will record how late (or early) the instance was available
+    compared to the target start time of the job, and if start time SLO was met.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action', 'JobName', 'InstanceConfig', 'ScheduledTime' (ISO 8601 time of the
+        schedule event) and 'ProvisioningLeadSeconds' keys.
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        provisioning_plan : dict
+            dict with 'TargetStartTime', 'ExpectedCreationSeconds' and 'WaitSeconds' keys for 'plan' action, or with 'StartDelaySeconds'
+            and 'SloMet' keys for 'report' action
+    """
+
+    action = event['Action']
+    if action not in PROVISIONING_ACTIONS:
+        raise ValueError(f'Unsupported provisioning action {action}. Supported actions are {PROVISIONING_ACTIONS}')
+
+    job_name = event['JobName']
+    instance_config = event['InstanceConfig']
+    scheduled_time = datetime.fromisoformat(event['ScheduledTime'].replace('Z', '+00:00'))
+    target_start_time = scheduled_time + timedelta(seconds= event['ProvisioningLeadSeconds'])
+    now = datetime.now(timezone.utc)
+
+    if action == 'report':
+        start_delay_seconds = round((now - target_start_time).total_seconds(), 3)
+        slo_met = start_delay_seconds <= START_SLO_SECONDS
+        put_duration(REPLICATION_DURATIONS_TABLE_NAME, f'start_slo#{job_name}', start_delay_seconds, 
+            {'target_start_time': target_start_time.isoformat(), 'slo_met': slo_met})
+
+        provisioning_report = {'TargetStartTime': target_start_time.isoformat(), 'StartDelaySeconds': start_delay_seconds, 'SloMet': slo_met}
+        log(JobName= job_name, Action= action, **provisioning_report)
+        return provisioning_report
+
+    operation_key = f"create_instance#{instance_config['instance_type']}#{instance_config['availability_zone']}"
+    durations = get_recent_durations(REPLICATION_DURATIONS_TABLE_NAME, operation_key, PROVISIONING_HISTORY_SIZE)
+    expected_creation_seconds = get_percentile(durations, PROVISIONING_PERCENTILE) + PROVISIONING_SAFETY_SECONDS if durations else event['ProvisioningLeadSeconds']
+
+    creation_start_time = target_start_time - timedelta(seconds= expected_creation_seconds)
+    wait_seconds = max(0, int((creation_start_time - now).total_seconds()))
+
+    provisioning_plan = {
+        'TargetStartTime': target_start_time.isoformat(),
+        'ExpectedCreationSeconds': int(expected_creation_seconds),
+        'WaitSeconds': wait_seconds
+    }
+    log(JobName= job_name, Action= action, OperationKey= operation_key, History= len(durations), **provisioning_plan)
+
+    return provisioning_plan
+
+def get_percentile(values, percentile):
+    """ Complementary function to compute the (nearest rank) percentile of a list of values """
+
+    sorted_values = sorted(values)
+    rank = max(1, math.ceil(percentile * len(sorted_values)))
+
+    return sorted_values[rank - 1]
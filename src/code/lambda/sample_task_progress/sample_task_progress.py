@@ -0,0 +1,128 @@
+import os
+import time
+from datetime import datetime, timezone
+
+from replication_core.clients import get_client
+from replication_core.dms import get_task_details
+from replication_core.logs import log
+
+# Constant: Represents the keys to keep from DMS API response when sampling DMS task progress.
+REPLICATION_TASK_KEYS = ['Status', 'MigrationType', 'ReplicationTaskStats']
+
+# Constant: Represents the DMS task stats stored on every progress sample, by sample attribute name
+PROGRESS_STATS_KEYS = {
+    'full_load_progress_percent': 'FullLoadProgressPercent',
+    'tables_loaded': 'TablesLoaded',
+    'tables_loading': 'TablesLoading',
+    'tables_queued': 'TablesQueued',
+    'tables_errored': 'TablesErrored',
+    'elapsed_time_millis': 'ElapsedTimeMillis'
+}
+
+# Constants: Lambda environment variables
+REPLICATION_PROGRESS_TABLE_NAME = os.getenv('REPLICATION_PROGRESS_TABLE_NAME')
+PROGRESS_SAMPLE_TTL_SECONDS = int(os.getenv('PROGRESS_SAMPLE_TTL_SECONDS', '604800'))
+PROGRESS_STALL_SAMPLES = int(os.getenv('PROGRESS_STALL_SAMPLES', '3'))
+
+def handler(event, context):
+    """ Function handler: 1/ Will retrieve DMS task status and stats from DMS API. 2/ Compare them with the previous progress sample
+    of the task to compute the full load throughput (progress percent per second), the estimated seconds to completion and if the task
+    is stalled (full load progress unchanged on consecutive samples). 3/ Persist the progress sample in DynamoDB (expiring after the sample TTL).
+    Tasks without stats yet (creating, starting) are not sampled. Sampling is best effort: errors reading or writing progress samples are logged
+    and the task status (with the progress from DMS stats only) is still returned, since it drives the workflow.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'JobName' and 'ReplicationTaskArn' keys
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        task_status : dict
+            dict with 'LatestStatus' (DMS task status) and 'Progress' (sampled progress, empty when not sampled) keys
+    """
+
+    # Get key elements from event
+    job_name = event['JobName']
+    replication_task_arn = event['ReplicationTaskArn']
+
+    task_details = get_task_details(replication_task_arn, task_filter_name= 'replication-task-arn', keys= REPLICATION_TASK_KEYS)
+    task_status = task_details['Status']
+    task_stats = task_details.get('ReplicationTaskStats')
+    if not task_stats:
+        return {'LatestStatus': task_status, 'Progress': {}}
+
+    sampled_at = datetime.now(timezone.utc)
+    progress = {key: task_stats.get(stats_key, 0) for key, stats_key in PROGRESS_STATS_KEYS.items()}
+
+    # Sampling is best effort: the task status is returned even when the progress table can not be read or written
+    try:
+        progress.update(get_progress_trend(replication_task_arn, task_details['MigrationType'], task_status, progress, sampled_at))
+        put_progress_sample(job_name, replication_task_arn, task_status, progress, sampled_at)
+    except Exception as exception:
+        log(JobName= job_name, ReplicationTaskArn= replication_task_arn, Status= task_status, Error= repr(exception))
+        return {'LatestStatus': task_status, 'Progress': progress}
+
+    log(JobName= job_name, ReplicationTaskArn= replication_task_arn, Status= task_status, **progress)
+
+    return {'LatestStatus': task_status, 'Progress': progress}
+
+def put_progress_sample(job_name, replication_task_arn, task_status, progress, sampled_at):
+    """ Complementary function to persist a progress sample of a DMS task in DynamoDB, expiring after the sample TTL """
+
+    get_client('dynamodb').put_item(
+        TableName= REPLICATION_PROGRESS_TABLE_NAME,
+        Item= {
+            'replication_task_arn': {'S': replication_task_arn},
+            'sampled_at': {'S': sampled_at.strftime('%Y-%m-%dT%H:%M:%S.%f')},
+            'job_name': {'S': job_name},
+            'status': {'S': task_status},
+            **{key: {'N': str(value)} for key, value in progress.items() if value is not None and not isinstance(value, bool)},
+            'stalled': {'BOOL': progress['stalled']},
+            'expires_at': {'N': str(int(time.time()) + PROGRESS_SAMPLE_TTL_SECONDS)}
+        }
+    )
+
+def get_progress_trend(replication_task_arn, migration_type, task_status, progress, sampled_at):
+    """ Complementary function to compute the progress trend of a DMS task from its previous sample. Throughput is the full load
+    progress (percent) per second between both samples, and the estimated seconds to completion the remaining progress at that throughput.
+    The task is stalled when its full load is running and its progress did not change on the last PROGRESS_STALL_SAMPLES samples.
+    CDC tasks have no full load progress, so that only their stats are sampled.
+
+    Returns
+    -------
+        progress_trend : dict
+            dict with 'progress_per_second', 'eta_seconds' (None when unknown), 'unchanged_samples' and 'stalled' keys
+    """
+
+    progress_trend = {'progress_per_second': None, 'eta_seconds': None, 'unchanged_samples': 0, 'stalled': False}
+    if migration_type == 'cdc': return progress_trend
+
+    dynamodb_response = get_client('dynamodb').query(
+        TableName= REPLICATION_PROGRESS_TABLE_NAME,
+        KeyConditionExpression= 'replication_task_arn = :arn',
+        ExpressionAttributeValues= {':arn': {'S': replication_task_arn}},
+        ProjectionExpression= 'sampled_at, full_load_progress_percent, unchanged_samples',
+        ScanIndexForward= False,
+        Limit= 1
+    )
+    if not dynamodb_response['Items']: return progress_trend
+
+    previous_sample = dynamodb_response['Items'][0]
+    previous_sampled_at = datetime.fromisoformat(previous_sample['sampled_at']['S']).replace(tzinfo= timezone.utc)
+    previous_progress_percent = int(previous_sample['full_load_progress_percent']['N'])
+    progress_percent = progress['full_load_progress_percent']
+    seconds = (sampled_at - previous_sampled_at).total_seconds()
+
+    if seconds > 0 and progress_percent > previous_progress_percent:
+        progress_per_second = (progress_percent - previous_progress_percent) / seconds
+        progress_trend['progress_per_second'] = round(progress_per_second, 6)
+        progress_trend['eta_seconds'] = int((100 - progress_percent) / progress_per_second)
+    elif task_status == 'running' and progress_percent < 100:
+        progress_trend['unchanged_samples'] = int(previous_sample.get('unchanged_samples', {'N': '0'})['N']) + 1
+        progress_trend['stalled'] = progress_trend['unchanged_samples'] >= PROGRESS_STALL_SAMPLES
+
+    return progress_trend
@@ -0,0 +1,172 @@
+import os
+import json
+import statistics
+
+from replication_core.clients import get_client, get_dynamodb_deserializer
+from replication_core.metrics import get_metrics_history
+from replication_core.logs import log
+
+# Constant: Number of most recent metrics records used to estimate the resource needs of a job
+DEMAND_HISTORY_SIZE = 10
+
+# Constant: Instance attributes copied from the template instance record to the records of scheduled instances
+TEMPLATE_INSTANCE_ATTRIBUTES = ['subnet_group', 'security_group', 'availability_zone', 'publicly_accessible']
+
+# Constants: Lambda environment variables
+REPLICATION_JOBS_TABLE_NAME = os.getenv('REPLICATION_JOBS_TABLE_NAME')
+REPLICATION_METRICS_TABLE_NAME = os.getenv('REPLICATION_METRICS_TABLE_NAME')
+REPLICATION_INSTANCES_TABLE_NAME = os.getenv('REPLICATION_INSTANCES_TABLE_NAME')
+INSTANCE_CLASSES = json.loads(os.getenv('INSTANCE_CLASSES', '{}'))
+INSTANCE_CAPACITY_RATIO = float(os.getenv('INSTANCE_CAPACITY_RATIO', '0.8'))
+JOB_BASE_MEMORY_MB = float(os.getenv('JOB_BASE_MEMORY_MB', '256'))
+JOB_BASE_VCPU = float(os.getenv('JOB_BASE_VCPU', '0.25'))
+TABLE_MEMORY_MB = float(os.getenv('TABLE_MEMORY_MB', '64'))
+TABLE_VCPU = float(os.getenv('TABLE_VCPU', '0.05'))
+MAX_PARALLEL_TABLES = int(os.getenv('MAX_PARALLEL_TABLES', '8'))
+DEFAULT_PARALLEL_TABLES = int(os.getenv('DEFAULT_PARALLEL_TABLES', '8'))
+
+def handler(event, context):
+    """ Function handler: 1/ Will estimate the memory and vCPU needs of every job of the set from its job record or its historical
+    metrics. 2/ Pack jobs (first fit decreasing) onto the fewest instances, respecting capacity and max tasks of instance classes,
+    and pick the smallest suitable class for every instance. 3/ Store a record for every scheduled instance in the instances table,
+    based on the template instance, so that instances can be created and jobs executed on them.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'JobNames' and 'InstanceName' (name of the template instance) keys
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        job_schedule : dict
+            dict with 'Instances' key, a list of scheduled instances with 'InstanceName', 'InstanceClass', 'JobNames' and
+            the 'MemoryMb' and 'Vcpu' demand of the jobs assigned to them
+    """
+
+    job_names = event['JobNames']
+    template_instance_name = event['InstanceName']
+
+    job_demands = [get_job_demand(job_name) for job_name in job_names]
+    instance_bins = pack_jobs(job_demands, INSTANCE_CLASSES, INSTANCE_CAPACITY_RATIO)
+
+    template_instance = get_instance_record(template_instance_name)
+    scheduled_instances = []
+    for index, instance_bin in enumerate(instance_bins):
+        instance_name = f'{template_instance_name}-{index + 1:02d}'
+        put_instance_record(instance_name, instance_bin['InstanceClass'], INSTANCE_CLASSES[instance_bin['InstanceClass']]['max_tasks'], template_instance)
+        scheduled_instances.append({'InstanceName': instance_name, **instance_bin})
+
+    log(
+        Jobs= len(job_names),
+        Instances= len(scheduled_instances),
+        InstanceClasses= [scheduled_instance['InstanceClass'] for scheduled_instance in scheduled_instances]
+    )
+
+    return {'Instances': scheduled_instances}
+
+def get_job_demand(job_name):
+    """ Complementary function to estimate the memory (MB) and vCPU needs of a job. Explicit 'estimated_memory_mb' and 'estimated_vcpu'
+    job record attributes take precedence. Otherwise needs are derived from the median number of tables loaded on previous executions
+    of the job checkpoint (bounded by the tables DMS loads in parallel), or from the default number of parallel tables without history
+    """
+
+    dynamodb_response = get_client('dynamodb').get_item(
+        TableName= REPLICATION_JOBS_TABLE_NAME,
+        Key= {'job_name': {'S': job_name}}
+    )
+    dynamodb_deserializer = get_dynamodb_deserializer()
+    job_record = {key: dynamodb_deserializer.deserialize(value) for key, value in dynamodb_response['Item'].items()}
+
+    metrics_history = get_metrics_history(REPLICATION_METRICS_TABLE_NAME, job_record['job_checkpoint_name'], limit= DEMAND_HISTORY_SIZE)
+    tables_history = [metrics['tables_loaded'] + metrics.get('tables_errored', 0) for metrics in metrics_history if 'tables_loaded' in metrics]
+    tables = statistics.median(tables_history) if tables_history else DEFAULT_PARALLEL_TABLES
+    parallel_tables = min(max(tables, 1), MAX_PARALLEL_TABLES)
+
+    job_demand = {
+        'JobName': job_name,
+        'MemoryMb': float(job_record.get('estimated_memory_mb', JOB_BASE_MEMORY_MB + TABLE_MEMORY_MB * parallel_tables)),
+        'Vcpu': float(job_record.get('estimated_vcpu', JOB_BASE_VCPU + TABLE_VCPU * parallel_tables))
+    }
+
+    return job_demand
+
+def pack_jobs(job_demands, instance_classes, capacity_ratio):
+    """ Complementary function to pack jobs onto instances with first fit decreasing. Jobs are sorted by their dominant share of
+    the largest class, and placed on the first instance with enough remaining capacity and task slots (opening a new one otherwise).
+    Each instance then gets the first (smallest) class of the list able to hold its jobs. Jobs exceeding the largest class run alone on it
+    """
+
+    class_capacities = {
+        instance_class: {
+            'MemoryMb': class_props['memory_mb'] * capacity_ratio,
+            'Vcpu': class_props['vcpu'] * capacity_ratio,
+            'MaxTasks': class_props['max_tasks']
+        }
+        for instance_class, class_props in instance_classes.items()
+    }
+    largest_class = max(class_capacities, key= lambda instance_class: (class_capacities[instance_class]['MemoryMb'], class_capacities[instance_class]['Vcpu']))
+    largest_capacity = class_capacities[largest_class]
+
+    sorted_job_demands = sorted(
+        job_demands,
+        key= lambda job_demand: max(job_demand['MemoryMb'] / largest_capacity['MemoryMb'], job_demand['Vcpu'] / largest_capacity['Vcpu']),
+        reverse= True
+    )
+
+    instance_bins = []
+    for job_demand in sorted_job_demands:
+        instance_bin = next((instance_bin for instance_bin in instance_bins if fits(instance_bin, job_demand, largest_capacity)), None)
+        if instance_bin is None:
+            instance_bin = {'JobNames': [], 'MemoryMb': 0, 'Vcpu': 0}
+            instance_bins.append(instance_bin)
+        instance_bin['JobNames'].append(job_demand['JobName'])
+        instance_bin['MemoryMb'] += job_demand['MemoryMb']
+        instance_bin['Vcpu'] += job_demand['Vcpu']
+
+    for instance_bin in instance_bins:
+        instance_bin['InstanceClass'] = next(
+            (instance_class for instance_class, capacity in class_capacities.items() if fits(instance_bin, None, capacity)),
+            largest_class
+        )
+        instance_bin['MemoryMb'] = round(instance_bin['MemoryMb'], 3)
+        instance_bin['Vcpu'] = round(instance_bin['Vcpu'], 3)
+
+    return instance_bins
+
+def fits(instance_bin, job_demand, capacity):
+    """ Complementary function to check if an instance (plus a job when specified) fits a class capacity and task slots """
+
+    memory_mb = instance_bin['MemoryMb'] + (job_demand['MemoryMb'] if job_demand else 0)
+    vcpu = instance_bin['Vcpu'] + (job_demand['Vcpu'] if job_demand else 0)
+    tasks = len(instance_bin['JobNames']) + (1 if job_demand else 0)
+
+    return memory_mb <= capacity['MemoryMb'] and vcpu <= capacity['Vcpu'] and tasks <= capacity['MaxTasks']
+
+def get_instance_record(instance_name):
+    """ Complementary function to retrieve an instance configuration record from DynamoDB instances table """
+
+    dynamodb_response = get_client('dynamodb').get_item(
+        TableName= REPLICATION_INSTANCES_TABLE_NAME,
+        Key= {'instance_name': {'S': instance_name}}
+    )
+
+    return dynamodb_response['Item']
+
+def put_instance_record(instance_name, instance_class, max_tasks, template_instance):
+    """ Complementary function to store the configuration of a scheduled instance. Configuration attributes are updated
+    (not replaced) so that the lease state and task slots of an instance kept warm from a previous job set are preserved
+    """
+
+    instance_attributes = {'instance_type': {'S': instance_class}, 'max_concurrent_tasks': {'S': str(max_tasks)}}
+    instance_attributes.update({key: template_instance[key] for key in TEMPLATE_INSTANCE_ATTRIBUTES if key in template_instance})
+
+    get_client('dynamodb').update_item(
+        TableName= REPLICATION_INSTANCES_TABLE_NAME,
+        Key= {'instance_name': {'S': instance_name}},
+        UpdateExpression= 'SET ' + ', '.join([f'#{key} = :{key}' for key in instance_attributes]),
+        ExpressionAttributeNames= {f'#{key}': key for key in instance_attributes},
+        ExpressionAttributeValues= {f':{key}': value for key, value in instance_attributes.items()}
+    )
@@ -0,0 +1,177 @@
+import os
+import json
+import heapq
+from datetime import datetime, timezone
+
+from replication_core.clients import get_client, get_dynamodb_deserializer
+from replication_core.s3 import read_s3_json_file
+from replication_core.artifacts import get_job_artifacts, get_catalog_snapshot
+from replication_core.sharding import get_shard_name, get_selecting_rule
+from replication_core.logs import log
+
+# Constant: Supported actions. 'plan' splits the tables of a job into shards, 'summarize' aggregates the results of the shard executions
+SHARD_JOB_ACTIONS = ['plan', 'summarize']
+
+# Constants: Lambda environment variables
+REPLICATION_JOBS_TABLE_NAME = os.getenv('REPLICATION_JOBS_TABLE_NAME')
+ARTIFACTS_BUCKET_NAME = os.getenv('ARTIFACTS_BUCKET_NAME')
+REPLICATION_JOBS_CONFIG_PREFIX = os.getenv('REPLICATION_JOBS_CONFIG_PREFIX')
+REPLICATION_SHARD_PLANS_PREFIX = os.getenv('REPLICATION_SHARD_PLANS_PREFIX')
+DEFAULT_SHARD_COUNT = int(os.getenv('DEFAULT_SHARD_COUNT', '4'))
+
+def handler(event, context):
+    """ Function handler: 1/ On 'plan' action will split the tables selected by the job mappings into balanced shards (longest processing
+    time first on table sizes of the catalog snapshot of the job) and store the plan in S3 by job checkpoint. CDC jobs reuse the plan of their
+    checkpoint so that every shard resumes its own checkpoint lineage. Shards are assigned round-robin to the input instances.
+    2/ On 'summarize' action will aggregate the results of every shard execution.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Should include 'Action' key. 'plan' action expects 'Input' key with the workflow input, including 'JobName'
+        and 'InstanceName' keys, and optional 'InstanceNames' (instances to spread shards across) and 'ShardCount' keys. 'summarize' action
+        expects 'ShardResults' key with the list of results of each shard execution.
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        shard_details : dict
+            dict with 'Shards' (list of shards with 'Index', 'TaskIdentifier', 'CheckpointName', 'InstanceName', 'PlanKey', 'Tables' and 'Size' keys),
+            'ShardCount' and 'PlanKey' keys for 'plan' action, or with the aggregated results for 'summarize' action
+    """
+
+    action = event['Action']
+    if action not in SHARD_JOB_ACTIONS:
+        raise ValueError(f'Unsupported shard job action {action}. Supported actions are {SHARD_JOB_ACTIONS}')
+
+    if action == 'summarize':
+        shard_summary = get_shard_summary(event['ShardResults'])
+        log(Action= action, **{key: value for key, value in shard_summary.items() if key not in ['SucceededShards', 'FailedShards']})
+        return shard_summary
+
+    shard_input = event['Input']
+    job_name = shard_input['JobName']
+    instance_names = shard_input.get('InstanceNames') or [shard_input['InstanceName']]
+
+    job_record = get_job_record(job_name)
+    job_checkpoint_name = job_record['job_checkpoint_name']
+    plan_key = f'{REPLICATION_SHARD_PLANS_PREFIX}/{job_checkpoint_name}/plan.json'
+
+    if job_record['migration_type'] == 'cdc':
+        shard_plan = read_s3_json_file(ARTIFACTS_BUCKET_NAME, plan_key)
+    else:
+        shard_count = int(shard_input.get('ShardCount', job_record.get('shard_count', DEFAULT_SHARD_COUNT)))
+        shard_plan = plan_shards(job_name, job_checkpoint_name, shard_count)
+        get_client('s3').put_object(Bucket= ARTIFACTS_BUCKET_NAME, Key= plan_key, Body= json.dumps(shard_plan))
+
+    shards = [
+        {
+            'Index': shard['index'],
+            'TaskIdentifier': get_shard_name(job_name, shard['index']),
+            'CheckpointName': shard['checkpoint_name'],
+            'InstanceName': instance_names[shard['index'] % len(instance_names)],
+            'PlanKey': plan_key,
+            'Tables': len(shard['tables']),
+            'Size': shard['size']
+        }
+        for shard in shard_plan['shards']
+    ]
+
+    log(
+        Action= action,
+        JobName= job_name,
+        PlanKey= plan_key,
+        PlannedBy= shard_plan['job_name'],
+        Shards= [{key: shard[key] for key in ['Index', 'InstanceName', 'Tables', 'Size']} for shard in shards]
+    )
+
+    return {'Shards': shards, 'ShardCount': len(shards), 'PlanKey': plan_key}
+
+def get_job_record(job_name):
+    """ Complementary function to retrieve a job configuration record from DynamoDB jobs table """
+
+    dynamodb_response = get_client('dynamodb').get_item(
+        TableName= REPLICATION_JOBS_TABLE_NAME,
+        Key= {'job_name': {'S': job_name}}
+    )
+    dynamodb_deserializer = get_dynamodb_deserializer()
+    job_record = {key: dynamodb_deserializer.deserialize(value) for key, value in dynamodb_response['Item'].items()}
+
+    return job_record
+
+def plan_shards(job_name, job_checkpoint_name, shard_count):
+    """ Complementary function to split the tables of the catalog snapshot selected by the job mappings into shards. Tables are
+    placed, largest first, on the shard with the smallest total size (longest processing time first), so that the largest
+    shard (bounding the full load duration) is as small as possible. Shard count is bounded by the number of tables
+    """
+
+    catalog_snapshot = get_catalog_snapshot(ARTIFACTS_BUCKET_NAME, REPLICATION_JOBS_CONFIG_PREFIX, job_name)
+    if catalog_snapshot is None:
+        raise ValueError(f'No catalog snapshot found for job {job_name}. Sharded jobs require a catalog snapshot')
+
+    job_mappings = get_job_artifacts(REPLICATION_JOBS_TABLE_NAME, job_name, ARTIFACTS_BUCKET_NAME, REPLICATION_JOBS_CONFIG_PREFIX)['mappings']
+
+    tables = [
+        {'schema_name': table['schema_name'], 'table_name': table['table_name'], 'size': int(table.get('size', 0))}
+        for table in catalog_snapshot['tables']
+        if get_selecting_rule(job_mappings, table['schema_name'], table['table_name'])
+    ]
+    if not tables:
+        raise ValueError(f'No table of the catalog snapshot of job {job_name} is selected by its mappings')
+
+    shards = [
+        {'index': index, 'checkpoint_name': get_shard_name(job_checkpoint_name, index), 'size': 0, 'tables': []}
+        for index in range(max(1, min(shard_count, len(tables))))
+    ]
+    shard_heap = [(0, index) for index in range(len(shards))]
+    for table in sorted(tables, key= lambda table: table['size'], reverse= True):
+        _, index = heapq.heappop(shard_heap)
+        shards[index]['tables'].append(table)
+        shards[index]['size'] += table['size']
+        heapq.heappush(shard_heap, (shards[index]['size'], index))
+
+    shard_plan = {
+        'job_name': job_name,
+        'job_checkpoint_name': job_checkpoint_name,
+        'planned_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'shards': shards
+    }
+
+    return shard_plan
+
+def get_shard_summary(shard_results):
+    """ Complementary function to aggregate shard execution results. Makespan is the time between the first shard start and
+    the last shard stop, and size imbalance the ratio between the largest and the average shard size
+    """
+
+    succeeded_shards = [result['Index'] for result in shard_results if result['Status'] == 'SUCCEEDED']
+    failed_shards = [result['Index'] for result in shard_results if result['Status'] != 'SUCCEEDED']
+
+    start_dates = [parse_date(result['StartDate']) for result in shard_results if result.get('StartDate')]
+    stop_dates = [parse_date(result['StopDate']) for result in shard_results if result.get('StopDate')]
+    makespan_seconds = (max(stop_dates) - min(start_dates)).total_seconds() if start_dates and stop_dates else 0
+
+    sizes = [result['Size'] for result in shard_results]
+    average_size = sum(sizes) / len(sizes) if sizes else 0
+
+    shard_summary = {
+        'Shards': len(shard_results),
+        'Succeeded': len(succeeded_shards),
+        'Failed': len(failed_shards),
+        'MakespanSeconds': round(makespan_seconds, 3),
+        'SizeImbalance': round(max(sizes) / average_size, 3) if average_size else 0,
+        'SucceededShards': succeeded_shards,
+        'FailedShards': failed_shards
+    }
+
+    return shard_summary
+
+def parse_date(value):
+    """ Complementary function to parse execution dates, either epoch milliseconds or ISO 8601 strings """
+
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000, tz= timezone.utc)
+
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
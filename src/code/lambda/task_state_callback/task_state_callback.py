@@ -0,0 +1,116 @@
+import os
+import json
+import time
+
+from replication_core.clients import get_client
+from replication_core.dms import get_task_details
+from replication_core.logs import log
+
+# Constant: DMS task statuses for which the workflow keeps waiting. Any other status resumes the workflow
+WAITING_TASK_STATUSES = ['creating', 'starting', 'running', 'stopping']
+
+# Constant: Source of the DMS events delivered by EventBridge
+DMS_EVENT_SOURCE = 'aws.dms'
+
+# Constants: Lambda environment variables
+REPLICATION_TASK_TOKENS_TABLE_NAME = os.getenv('REPLICATION_TASK_TOKENS_TABLE_NAME')
+TASK_TOKEN_TTL_SECONDS = int(os.getenv('TASK_TOKEN_TTL_SECONDS', '86400'))
+
+def handler(event, context):
+    """ Function handler: 1/ When invoked by the execute job workflow (waitForTaskToken) will register the task token of the
+    workflow for the DMS task. 2/ When invoked by a DMS replication task state change event will resume the workflows waiting
+    on the DMS task (if the task is no longer running) with its latest status.
+
+    Parameters
+    ----------
+    event : dict
+        input event dictionary. Either a workflow event with 'TaskToken' and 'ReplicationTaskArn' keys or an EventBridge
+        DMS event with 'source' and 'resources' keys
+
+    context: dict
+        input context. Not used on function
+
+    Returns
+    -------
+        callback_details : dict
+            dict with the DMS task arn, latest status and if the workflow was resumed. For DMS events, a dict with
+            a 'Callbacks' key listing the details of every DMS task of the event
+    """
+
+    if event.get('source') == DMS_EVENT_SOURCE:
+        return {'Callbacks': [resume_task_workflow(replication_task_arn) for replication_task_arn in event['resources']]}
+
+    return register_task_token(event['ReplicationTaskArn'], event['TaskToken'])
+
+def register_task_token(replication_task_arn, task_token):
+    """ Complementary function to register the task token of a waiting workflow. Task status is checked after registration
+    so that a state change happened before registration does not leave the workflow waiting until the safety net timeout
+    """
+
+    get_client('dynamodb').put_item(
+        TableName= REPLICATION_TASK_TOKENS_TABLE_NAME,
+        Item= {
+            'replication_task_arn': {'S': replication_task_arn},
+            'task_token': {'S': task_token},
+            'expires_at': {'N': str(int(time.time()) + TASK_TOKEN_TTL_SECONDS)}
+        }
+    )
+
+    task_status = get_task_details(replication_task_arn, task_filter_name= 'replication-task-arn', keys= ['Status'])['Status']
+    task_resumed = False
+    if task_status not in WAITING_TASK_STATUSES:
+        task_resumed = send_task_status(replication_task_arn, task_token, task_status)
+
+    callback_details = {'ReplicationTaskArn': replication_task_arn, 'Status': task_status, 'Action': 'register', 'Resumed': task_resumed}
+    log(**callback_details)
+
+    return callback_details
+
+def resume_task_workflow(replication_task_arn):
+    """ Complementary function to resume the workflow waiting on a DMS task when the task is no longer running """
+
+    dynamodb_response = get_client('dynamodb').get_item(
+        TableName= REPLICATION_TASK_TOKENS_TABLE_NAME,
+        Key= {'replication_task_arn': {'S': replication_task_arn}},
+        ConsistentRead= True
+    )
+
+    task_status = None
+    task_resumed = False
+    if 'Item' in dynamodb_response:
+        task_status = get_task_details(replication_task_arn, task_filter_name= 'replication-task-arn', keys= ['Status'])['Status']
+        if task_status not in WAITING_TASK_STATUSES:
+            task_resumed = send_task_status(replication_task_arn, dynamodb_response['Item']['task_token']['S'], task_status)
+
+    callback_details = {'ReplicationTaskArn': replication_task_arn, 'Status': task_status, 'Action': 'resume', 'Resumed': task_resumed}
+    log(**callback_details)
+
+    return callback_details
+
+def send_task_status(replication_task_arn, task_token, task_status):
+    """ Complementary function to send the DMS task status to the waiting workflow and remove its task token.
+    Tokens already used (by a concurrent callback) or timed out (safety net) are discarded.
+    """
+
+    stepfunctions = get_client('stepfunctions')
+    try:
+        stepfunctions.send_task_success(
+            taskToken= task_token,
+            output= json.dumps({'LatestStatus': task_status})
+        )
+        task_resumed = True
+    except (stepfunctions.exceptions.TaskTimedOut, stepfunctions.exceptions.InvalidToken, stepfunctions.exceptions.TaskDoesNotExist):
+        task_resumed = False
+
+    dynamodb = get_client('dynamodb')
+    try:
+        dynamodb.delete_item(
+            TableName= REPLICATION_TASK_TOKENS_TABLE_NAME,
+            Key= {'replication_task_arn': {'S': replication_task_arn}},
+            ConditionExpression= 'task_token = :token',
+            ExpressionAttributeValues= {':token': {'S': task_token}}
+        )
+    except dynamodb.exceptions.ConditionalCheckFailedException:
+        pass
+
+    return task_resumed
@@ -0,0 +1,6 @@
+""" Replication core: shared runtime for the framework lambda functions, deployed as a lambda layer.
+Includes lazily created boto3 clients, warm container caches, DMS helpers and structured logging. Modules are kept free of heavy imports at 
+module level so that importing the package does not add to lambda cold starts.
+"""
+
+__version__ = '1.0.0'
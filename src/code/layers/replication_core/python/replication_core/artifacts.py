@@ -0,0 +1,116 @@
+""" Helpers to retrieve job artifacts (task settings and mappings). Artifacts are compiled on deployment by 
+JobConfigConstruct and stored inline in the job record, falling back to the S3 copy when they exceed the inline size limit.
+Catalog snapshots (tables of the source with their size) are optional and only synced to S3.
+"""
+
+import json
+import zlib
+import base64
+import threading
+from collections import OrderedDict
+
+from replication_core.clients import get_client
+from replication_core.s3 import read_s3_json_file
+
+# Constant: Encoding of compiled job artifacts stored inline in job records. Must match JobConfigConstruct
+JOB_ARTIFACTS_ENCODING = 'zlib+base64'
+
+# Constant: Name of the catalog snapshot file of a job, synced to S3 with its task settings and mappings
+CATALOG_SNAPSHOT_FILE_NAME = 'catalog.json'
+
+# Constant: Job record attributes holding the compiled job artifacts
+JOB_ARTIFACTS_ATTRIBUTES = ['job_artifacts', 'job_artifacts_location', 'job_artifacts_encoding', 'job_artifacts_hash']
+
+# Constant: Job record attribute with the settings profile of the job. Settings of jobs with a profile only hold overrides (optional file in S3)
+SETTINGS_PROFILE_ATTRIBUTE = 'settings_profile'
+
+# Constant: Max number of decoded artifacts kept in memory (one per distinct settings and mappings content)
+DECODED_ARTIFACTS_CACHE_MAX_ENTRIES = 64
+
+# Warm container cache: decoded artifacts by content hash, so that unchanged artifacts are only decompressed and parsed once
+_decoded_artifacts = OrderedDict()
+_decoded_artifacts_lock = threading.Lock()
+
+def get_job_artifacts(jobs_table_name, job_name, bucket_name, jobs_config_prefix, job_record=None):
+    """ Function to retrieve task settings and mappings of a job from its job record. The job record is only read when it is
+    not specified (or misses the artifacts attributes), so that workflows already retrieving it do not read it twice.
+    When artifacts are not stored inline, settings and mappings are read from S3. Settings of jobs with a settings profile
+    are the overrides of the profile (resolved by replication_core.profiles).
+
+    Parameters
+    ----------
+    jobs_table_name : str
+        name of the DynamoDB table where job records are stored
+    job_name : str
+        name of the job
+    bucket_name : str
+        name of the S3 bucket where artifacts are synced (fallback)
+    jobs_config_prefix : str
+        prefix inside S3 bucket where artifacts are synced partitioned by job name (fallback)
+    job_record : dict
+        job record already retrieved, with attribute values as strings. Should include JOB_ARTIFACTS_ATTRIBUTES and SETTINGS_PROFILE_ATTRIBUTE
+
+    Returns
+    -------
+        job_artifacts : dict
+            dict with 'settings', 'mappings', 'hash' (None if not compiled) and 'location' ('inline' or 's3') keys. 
+            Settings and mappings are shared between invocations and must be treated as read-only.
+    """
+
+    job_item = job_record
+    if not (job_item and all(attribute in job_item for attribute in JOB_ARTIFACTS_ATTRIBUTES)):
+        dynamodb_response = get_client('dynamodb').get_item(
+            TableName= jobs_table_name,
+            Key= {'job_name': {'S': job_name}},
+            ProjectionExpression= ', '.join(JOB_ARTIFACTS_ATTRIBUTES + [SETTINGS_PROFILE_ATTRIBUTE])
+        )
+        job_item = {key: value['S'] for key, value in dynamodb_response.get('Item', {}).items()}
+
+    job_artifacts_hash = job_item.get('job_artifacts_hash')
+
+    if job_item.get('job_artifacts_location') == 'inline' and job_item.get('job_artifacts_encoding') == JOB_ARTIFACTS_ENCODING:
+        job_artifacts = decode_job_artifacts(job_artifacts_hash, job_item['job_artifacts'])
+        return {**job_artifacts, 'hash': job_artifacts_hash, 'location': 'inline'}
+
+    settings_key = f'{jobs_config_prefix}/{job_name}/settings.json'
+    return {
+        'settings': (read_s3_json_file_if_exists(bucket_name, settings_key) or {}) if job_item.get(SETTINGS_PROFILE_ATTRIBUTE) else read_s3_json_file(bucket_name, settings_key),
+        'mappings': read_s3_json_file(bucket_name, f'{jobs_config_prefix}/{job_name}/mappings.json'),
+        'hash': job_artifacts_hash,
+        'location': 's3'
+    }
+
+def decode_job_artifacts(job_artifacts_hash, job_artifacts_encoded):
+    """ Function to decode inline job artifacts. Decoded artifacts are cached by content hash (least recently used evicted first) """
+
+    with _decoded_artifacts_lock:
+        if job_artifacts_hash in _decoded_artifacts:
+            _decoded_artifacts.move_to_end(job_artifacts_hash)
+            return _decoded_artifacts[job_artifacts_hash]
+
+    job_artifacts = json.loads(zlib.decompress(base64.b64decode(job_artifacts_encoded)))
+
+    with _decoded_artifacts_lock:
+        _decoded_artifacts[job_artifacts_hash] = job_artifacts
+        while len(_decoded_artifacts) > DECODED_ARTIFACTS_CACHE_MAX_ENTRIES:
+            _decoded_artifacts.popitem(last= False)
+
+    return job_artifacts
+
+def get_catalog_snapshot(bucket_name, jobs_config_prefix, job_name):
+    """ Function to retrieve the catalog snapshot of a job ('tables' list of dicts with 'schema_name', 'table_name' and 'size' keys).
+    Returns None when the job has no catalog snapshot
+    """
+
+    return read_s3_json_file_if_exists(bucket_name, f'{jobs_config_prefix}/{job_name}/{CATALOG_SNAPSHOT_FILE_NAME}')
+
+def read_s3_json_file_if_exists(bucket_name, key_path):
+    """ Function to retrieve json from an optional S3 file. Returns None when the file does not exist """
+
+    s3 = get_client('s3')
+    try:
+        return read_s3_json_file(bucket_name, key_path)
+    except s3.exceptions.ClientError as error:
+        if error.response['Error']['Code'] not in ['NoSuchKey', '404']: raise
+
+    return None
\ No newline at end of file
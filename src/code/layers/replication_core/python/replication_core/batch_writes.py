@@ -0,0 +1,111 @@
+""" Helpers to write items to DynamoDB in batches, retrying the items DynamoDB leaves unprocessed (throttling, partition limits) """
+
+import json
+import time
+import random
+
+from replication_core.clients import get_client
+
+# Constant: Max number of items per DynamoDB BatchWriteItem request
+BATCH_WRITE_MAX_ITEMS = 25
+
+# Constant: Max size (bytes) of a DynamoDB BatchWriteItem request. Item sizes are estimated from their serialized JSON, which overestimates them
+BATCH_WRITE_MAX_BYTES = 16 * 1024 * 1024
+
+# Constant: Max number of consecutive requests leaving items unprocessed before giving up
+BATCH_WRITE_MAX_ATTEMPTS = 6
+
+# Constant: Base delay (in seconds) of the exponential backoff (full jitter) between retries of unprocessed items
+BATCH_WRITE_BASE_DELAY_SECONDS = 0.05
+
+# Constant: Max delay (in seconds) between retries of unprocessed items, so that retries fit in short lambda timeouts
+BATCH_WRITE_MAX_DELAY_SECONDS = 1
+
+class BatchWriter:
+    """ Class representing a DynamoDB batch writer. Items are queued (for any number of tables) and written on flush, combining
+    items of every table into as few BatchWriteItem requests as the item count and request size limits allow. Unprocessed items
+    are retried (in front of the items not sent yet) with exponential backoff. Keeps request, retry and latency counters.
+    Items queued for the same table on a single flush must have different keys (a DynamoDB batch write constraint).
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.retried_items = 0
+        self.throttled_requests = 0
+        self.written_items = 0
+        self.latency_seconds = 0
+        self.max_request_latency_seconds = 0
+        self._pending = []
+
+    def put(self, table_name, item):
+        """ Queues an item, already serialized as DynamoDB attribute values, to be put into a table on next flush """
+
+        self._pending.append((table_name, {'PutRequest': {'Item': item}}))
+
+    def flush(self):
+        """ Writes every queued item. Raises RuntimeError when items remain unprocessed after BATCH_WRITE_MAX_ATTEMPTS consecutive
+        requests leaving items unprocessed, in which case items not written are kept queued
+        """
+
+        dynamodb = get_client('dynamodb')
+        attempt = 0
+
+        while self._pending:
+            batch = self._take_batch()
+            request_items = {}
+            for table_name, request in batch:
+                request_items.setdefault(table_name, []).append(request)
+
+            request_start = time.monotonic()
+            dynamodb_response = dynamodb.batch_write_item(RequestItems= request_items)
+            request_latency = time.monotonic() - request_start
+
+            self.requests += 1
+            self.latency_seconds += request_latency
+            self.max_request_latency_seconds = max(self.max_request_latency_seconds, request_latency)
+
+            unprocessed = [
+                (table_name, request)
+                for table_name, table_requests in (dynamodb_response.get('UnprocessedItems') or {}).items()
+                for request in table_requests
+            ]
+            self.written_items += len(batch) - len(unprocessed)
+            if not unprocessed:
+                attempt = 0
+                continue
+
+            self._pending = unprocessed + self._pending
+            self.retried_items += len(unprocessed)
+            self.throttled_requests += 1
+            attempt += 1
+            if attempt >= BATCH_WRITE_MAX_ATTEMPTS:
+                raise RuntimeError(f'{len(unprocessed)} items remained unprocessed after {BATCH_WRITE_MAX_ATTEMPTS} attempts')
+            time.sleep(random.uniform(0, min(BATCH_WRITE_MAX_DELAY_SECONDS, BATCH_WRITE_BASE_DELAY_SECONDS * 2 ** attempt)))
+
+        return self.stats()
+
+    def stats(self):
+        """ Returns the counters of the writer """
+
+        return {
+            'WrittenItems': self.written_items,
+            'Requests': self.requests,
+            'RetriedItems': self.retried_items,
+            'ThrottledRequests': self.throttled_requests,
+            'LatencyMillis': round(self.latency_seconds * 1000, 3),
+            'MaxRequestLatencyMillis': round(self.max_request_latency_seconds * 1000, 3)
+        }
+
+    def _take_batch(self):
+        """ Takes from the queue the items of the next request, within the item count and request size limits """
+
+        batch_size = 0
+        batch_bytes = 0
+        for table_name, request in self._pending:
+            request_bytes = len(table_name) + len(json.dumps(request, separators=(',', ':')))
+            if batch_size == BATCH_WRITE_MAX_ITEMS or (batch_size and batch_bytes + request_bytes > BATCH_WRITE_MAX_BYTES): break
+            batch_size += 1
+            batch_bytes += request_bytes
+
+        batch, self._pending = self._pending[:batch_size], self._pending[batch_size:]
+        return batch
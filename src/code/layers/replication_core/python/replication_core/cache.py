@@ -0,0 +1,48 @@
+""" In-memory caches that survive across warm invocations of the same lambda container """
+
+import time
+import threading
+
+class TTLCache:
+    """ Class representing a thread-safe in-memory cache with a time to live per entry. Declared at module level
+    so that entries survive across warm invocations of the same Lambda container. Keeps hit and miss counters.
+    """
+
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """ Returns cached value for key or None when key is not cached or its entry already expired """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[0]
+
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+    def set(self, key, value):
+        """ Stores value for key, expiring it after the cache time to live """
+
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, key=None):
+        """ Removes key from cache. When no key is specified the whole cache is cleared """
+
+        with self._lock:
+            if key is None: self._entries.clear()
+            else: self._entries.pop(key, None)
+
+    def stats(self):
+        """ Returns cache counters """
+
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
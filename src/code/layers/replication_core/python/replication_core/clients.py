@@ -0,0 +1,62 @@
+""" Lazily created, connection-pooled boto3 clients shared by all the framework lambda functions """
+
+import os
+import threading
+
+# Constant: Max number of pooled connections per client. Aligned with the max number of concurrent fetches on lambdas
+CLIENT_MAX_POOL_CONNECTIONS = int(os.getenv('CLIENT_MAX_POOL_CONNECTIONS', '10'))
+
+_clients = {}
+_clients_lock = threading.Lock()
+_dynamodb_serializer = None
+_dynamodb_deserializer = None
+
+def get_client(service_name):
+    """ Function to retrieve a boto3 client for the specified service. Client (and boto3 itself) is only created on first
+    use and reused afterwards, including across warm invocations of the same lambda container.
+
+    Parameters
+    ----------
+    service_name : str
+        name of the AWS service as expected by boto3. For example 'dms', 's3' or 'dynamodb'
+
+    Returns
+    -------
+        client : botocore.client.BaseClient
+            boto3 client for the specified service
+    """
+
+    client = _clients.get(service_name)
+    if client: return client
+
+    with _clients_lock:
+        if service_name not in _clients:
+            import boto3
+            from botocore.config import Config
+
+            _clients[service_name] = boto3.client(
+                service_name, 
+                config= Config(max_pool_connections= CLIENT_MAX_POOL_CONNECTIONS)
+            )
+
+    return _clients[service_name]
+
+def get_dynamodb_serializer():
+    """ Function to retrieve a (lazily created) DynamoDB type serializer """
+
+    global _dynamodb_serializer
+    if not _dynamodb_serializer:
+        from boto3.dynamodb.types import TypeSerializer
+        _dynamodb_serializer = TypeSerializer()
+
+    return _dynamodb_serializer
+
+def get_dynamodb_deserializer():
+    """ Function to retrieve a (lazily created) DynamoDB type deserializer """
+
+    global _dynamodb_deserializer
+    if not _dynamodb_deserializer:
+        from boto3.dynamodb.types import TypeDeserializer
+        _dynamodb_deserializer = TypeDeserializer()
+
+    return _dynamodb_deserializer
@@ -0,0 +1,119 @@
+""" DMS describe helpers shared by the framework lambda functions. Endpoint and instance details are cached across
+warm invocations since they are requested on every job execution.
+"""
+
+import os
+
+from replication_core.cache import TTLCache
+from replication_core.clients import get_client
+from replication_core.serialization import normalize_datetimes, project
+
+# Constant: Max number of table statistics per DMS API page (DMS limit)
+TABLE_STATISTICS_PAGE_SIZE = 500
+
+# Constants: Lambda environment variables
+DMS_ENDPOINT_CACHE_TTL_SECONDS = int(os.getenv('DMS_ENDPOINT_CACHE_TTL_SECONDS', '3600'))
+DMS_INSTANCE_CACHE_TTL_SECONDS = int(os.getenv('DMS_INSTANCE_CACHE_TTL_SECONDS', '300'))
+
+# Warm container caches: DMS endpoints never change between deploys, while instances are transient so their
+# entries are short lived and should be invalidated whenever DMS rejects the cached instance
+endpoint_details_cache = TTLCache(DMS_ENDPOINT_CACHE_TTL_SECONDS)
+instance_details_cache = TTLCache(DMS_INSTANCE_CACHE_TTL_SECONDS)
+
+def get_instance_details(instance_id):
+    """ Function to retrieve DMS instance details from DMS API. Only available instances are cached """
+
+    instance_details = instance_details_cache.get(instance_id)
+    if instance_details: return instance_details
+
+    dms_response = get_client('dms').describe_replication_instances(
+        Filters= [{'Name': 'replication-instance-id', 'Values':[instance_id]}]
+    )
+
+    instance_details = normalize_datetimes(dms_response['ReplicationInstances'][0])
+    if instance_details['ReplicationInstanceStatus'] == 'available': instance_details_cache.set(instance_id, instance_details)
+    
+    return instance_details
+
+def get_endpoints_details(endpoint_ids):
+    """ Function to retrieve details of several DMS endpoints from DMS API in a single paginated call. 
+    Endpoints already cached across warm invocations are not requested again.
+
+    Parameters
+    ----------
+    endpoint_ids : list
+        list of DMS endpoint ids (duplicates allowed)
+
+    Returns
+    -------
+        endpoints_details : dict
+            dict with endpoint id as key and endpoint details as returned from DMS API as value
+    """
+
+    endpoints_details = {}
+    for endpoint_id in set(endpoint_ids):
+        endpoint_details = endpoint_details_cache.get(endpoint_id)
+        if endpoint_details: endpoints_details[endpoint_id] = endpoint_details
+
+    missing_endpoint_ids = sorted(set(endpoint_ids) - set(endpoints_details))
+    if missing_endpoint_ids:
+        paginator = get_client('dms').get_paginator('describe_endpoints')
+        pages = paginator.paginate(
+            Filters= [{'Name': 'endpoint-id', 'Values': missing_endpoint_ids}]
+        )
+
+        for page in pages:
+            for endpoint_details in normalize_datetimes(page['Endpoints']):
+                endpoint_id = endpoint_details['EndpointIdentifier']
+                endpoint_details_cache.set(endpoint_id, endpoint_details)
+                endpoints_details[endpoint_id] = endpoint_details
+
+    not_found_endpoint_ids = set(endpoint_ids) - set(endpoints_details)
+    if not_found_endpoint_ids: raise ValueError(f'DMS endpoints not found: {sorted(not_found_endpoint_ids)}')
+
+    return endpoints_details
+
+def get_endpoint_details(endpoint_id):
+    """ Function to retrieve DMS endpoint details from DMS API (cached across warm invocations) """
+
+    return get_endpoints_details([endpoint_id])[endpoint_id]
+
+def get_task_details(task_filter_value, task_filter_name='replication-task-id', keys=None):
+    """ Function to retrieve DMS task details from DMS API. Not cached since task status changes constantly.
+    When keys are specified, only those keys are kept (and normalized) from the DMS API response.
+    """
+
+    dms_response = get_client('dms').describe_replication_tasks(
+        Filters= [{'Name': task_filter_name, 'Values':[task_filter_value]}]
+    )
+
+    task_details = dms_response['ReplicationTasks'][0]
+    task_details = project(task_details, keys) if keys else normalize_datetimes(task_details)
+    
+    return task_details
+
+def find_task_details(task_id):
+    """ Function to retrieve DMS task details from DMS API by task id. Returns None when the task does not exist """
+
+    dms = get_client('dms')
+    try:
+        return get_task_details(task_id)
+    except dms.exceptions.ResourceNotFoundFault:
+        return None
+
+def get_table_statistics(task_arn):
+    """ Function to retrieve the statistics of every table of a DMS task from DMS API (all pages). Dates are kept as returned by
+    DMS (datetime objects) so that elapsed times can be computed from them
+    """
+
+    paginator = get_client('dms').get_paginator('describe_table_statistics')
+    table_statistics = []
+    for page in paginator.paginate(ReplicationTaskArn= task_arn, PaginationConfig= {'PageSize': TABLE_STATISTICS_PAGE_SIZE}):
+        table_statistics.extend(page['TableStatistics'])
+
+    return table_statistics
+
+def get_cache_stats():
+    """ Function to retrieve counters of DMS caches """
+
+    return {'EndpointCache': endpoint_details_cache.stats(), 'InstanceCache': instance_details_cache.stats()}
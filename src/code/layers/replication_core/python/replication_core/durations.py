@@ -0,0 +1,58 @@
+""" Helpers to record and retrieve historical durations of long running operations (instance creation, task execution...) """
+
+from datetime import datetime, timezone
+
+from replication_core.clients import get_client
+
+def get_recent_durations(durations_table_name, operation_key, limit=20):
+    """ Function to retrieve the most recent recorded durations (in seconds) of an operation (newest first).
+
+    Parameters
+    ----------
+    durations_table_name : str
+        name of the DynamoDB table where durations are recorded
+    operation_key : str
+        key identifying the operation. For example 'create_instance#dms.t3.medium'
+    limit : int
+        max number of durations to retrieve
+
+    Returns
+    -------
+        durations : list
+            list of durations in seconds as floats
+    """
+
+    dynamodb_response = get_client('dynamodb').query(
+        TableName= durations_table_name,
+        KeyConditionExpression= 'operation_key = :key',
+        ExpressionAttributeValues= {':key': {'S': operation_key}},
+        ProjectionExpression= 'duration_seconds',
+        ScanIndexForward= False,
+        Limit= limit
+    )
+
+    return [float(item['duration_seconds']['N']) for item in dynamodb_response['Items']]
+
+def put_duration(durations_table_name, operation_key, duration_seconds, attributes=None):
+    """ Function to record the duration of a finished operation.
+
+    Parameters
+    ----------
+    durations_table_name : str
+        name of the DynamoDB table where durations are recorded
+    operation_key : str
+        key identifying the operation. For example 'create_instance#dms.t3.medium'
+    duration_seconds : float
+        duration of the operation in seconds
+    attributes : dict
+        optional additional string attributes to record with the duration
+    """
+
+    item = {
+        'operation_key': {'S': operation_key},
+        'recorded_at': {'S': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')},
+        'duration_seconds': {'N': str(round(duration_seconds, 3))},
+        **{key: {'S': str(value)} for key, value in (attributes or {}).items()}
+    }
+
+    get_client('dynamodb').put_item(TableName= durations_table_name, Item= item)
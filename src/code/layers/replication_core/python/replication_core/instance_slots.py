@@ -0,0 +1,42 @@
+""" Helpers to read the task slots (holders and queued waiters) of replication instances stored in the instances table """
+
+from replication_core.clients import get_client, get_dynamodb_deserializer
+
+def get_instance_slots(instances_table_name, instance_name, default_max_concurrent_tasks):
+    """ Function to retrieve task slot holders and waiters of an instance (with the version of the record for conditional 
+    writes), and the max concurrent tasks configured for it.
+
+    Parameters
+    ----------
+    instances_table_name : str
+        name of the DynamoDB table where instance configurations are stored
+    instance_name : str
+        name of the instance
+    default_max_concurrent_tasks : int
+        max concurrent tasks when the instance record does not define 'max_concurrent_tasks'
+
+    Returns
+    -------
+        instance_slots : dict
+            dict with 'Holders' and 'Waiters' (dicts by holder id with epoch 'expires_at' and 'acquired_at' / 'requested_at'),
+            'Version' (None when slots were never written) and 'MaxConcurrentTasks' keys
+    """
+
+    dynamodb_response = get_client('dynamodb').get_item(
+        TableName= instances_table_name,
+        Key= {'instance_name': {'S': instance_name}},
+        ProjectionExpression= 'task_slot_holders, task_slot_waiters, task_slot_version, max_concurrent_tasks',
+        ConsistentRead= True
+    )
+
+    dynamodb_deserializer = get_dynamodb_deserializer()
+    item = {key: dynamodb_deserializer.deserialize(value) for key, value in dynamodb_response.get('Item', {}).items()}
+
+    instance_slots = {
+        'Holders': {key: {field: float(value) for field, value in slot.items()} for key, slot in item.get('task_slot_holders', {}).items()},
+        'Waiters': {key: {field: float(value) for field, value in slot.items()} for key, slot in item.get('task_slot_waiters', {}).items()},
+        'Version': int(item['task_slot_version']) if 'task_slot_version' in item else None,
+        'MaxConcurrentTasks': int(item.get('max_concurrent_tasks', default_max_concurrent_tasks))
+    }
+
+    return instance_slots
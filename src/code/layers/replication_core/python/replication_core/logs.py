@@ -0,0 +1,45 @@
+""" Structured logging shared by the framework lambda functions. Every record is a single JSON line (one CloudWatch Logs event)
+so that records can be queried by field with CloudWatch Logs Insights.
+"""
+
+import os
+import sys
+import json
+import logging
+
+# Constants: Lambda environment variables
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+
+_logger = None
+
+def get_logger():
+    """ Function to retrieve the (lazily configured) logger of the framework. Records are written to stdout as they are and not
+    propagated to the root logger, so that they are not formatted again by the handler of the lambda runtime
+    """
+
+    global _logger
+    if not _logger:
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        _logger = logging.getLogger('replication')
+        _logger.addHandler(handler)
+        _logger.setLevel(LOG_LEVEL)
+        _logger.propagate = False
+
+    return _logger
+
+def log(level=logging.INFO, **fields):
+    """ Function to log a record with the specified fields as a JSON line. Fields are only serialized when the level is enabled.
+    Values that are not JSON serializable (dates, decimals...) are logged as strings.
+
+    Parameters
+    ----------
+    level : int
+        logging level of the record. Defaults to logging.INFO
+    fields : dict
+        fields of the record. For example JobName= 'job-01', Action= 'dispatch'
+    """
+
+    logger = get_logger()
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps(fields, default= str))
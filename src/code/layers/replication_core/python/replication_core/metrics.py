@@ -0,0 +1,37 @@
+""" Helpers to retrieve historical job execution metrics persisted in the metrics table """
+
+from replication_core.clients import get_client, get_dynamodb_deserializer
+
+def get_metrics_history(metrics_table_name, checkpoint_name, limit=10):
+    """ Function to retrieve the most recent metrics records of a job checkpoint (newest first).
+
+    Parameters
+    ----------
+    metrics_table_name : str
+        name of the DynamoDB table where metrics are persisted
+    checkpoint_name : str
+        job checkpoint name. Full and cdc jobs of the same source objects share it
+    limit : int
+        max number of records to retrieve
+
+    Returns
+    -------
+        metrics_history : list
+            list of metrics records as dicts (DynamoDB numbers are returned as floats)
+    """
+
+    dynamodb_response = get_client('dynamodb').query(
+        TableName= metrics_table_name,
+        KeyConditionExpression= 'job_checkpoint_name = :name',
+        ExpressionAttributeValues= {':name': {'S': checkpoint_name}},
+        ScanIndexForward= False,
+        Limit= limit
+    )
+
+    dynamodb_deserializer = get_dynamodb_deserializer()
+    metrics_history = []
+    for item in dynamodb_response['Items']:
+        record = {key: dynamodb_deserializer.deserialize(value) for key, value in item.items()}
+        metrics_history.append({key: float(value) if type(value).__name__ == 'Decimal' else value for key, value in record.items()})
+
+    return metrics_history
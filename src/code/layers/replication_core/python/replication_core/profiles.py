@@ -0,0 +1,76 @@
+""" Helpers to resolve DMS task settings of jobs referencing a settings profile. Profiles are complete task settings stored once
+(synced to S3 with job artifacts, in the profiles folder) and jobs only keep the settings overriding them.
+"""
+
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from replication_core.s3 import read_s3_json_file
+
+# Constant: Folder (inside the jobs config prefix) where settings profiles are synced
+PROFILES_FOLDER_NAME = 'profiles'
+
+# Constant: Max number of resolved settings kept in memory (one per distinct profile and overrides content)
+RESOLVED_SETTINGS_CACHE_MAX_ENTRIES = 64
+
+# Warm container cache: resolved settings by content hash of profile and overrides, so that unchanged settings are only merged once
+_resolved_settings = OrderedDict()
+_resolved_settings_lock = threading.Lock()
+
+def get_settings_profile(bucket_name, jobs_config_prefix, profile_name):
+    """ Function to retrieve the task settings of a profile (cached across warm invocations and revalidated by ETag) """
+
+    return read_s3_json_file(bucket_name, f'{jobs_config_prefix}/{PROFILES_FOLDER_NAME}/{profile_name}.json')
+
+def resolve_settings(profile_settings, settings_overrides):
+    """ Function to resolve task settings of a job from its profile and overrides. Resolved settings are cached by the content hash
+    of both, so that jobs sharing the same profile and overrides reuse them, and any change in the profile resolves them again.
+
+    Parameters
+    ----------
+    profile_settings : dict
+        task settings of the profile
+    settings_overrides : dict
+        task settings of the job overriding the profile
+
+    Returns
+    -------
+        resolved_settings : dict
+            merged task settings. Shared between invocations and must be treated as read-only
+        settings_hash : str
+            content hash of profile and overrides
+    """
+
+    settings_content = json.dumps([profile_settings, settings_overrides], separators=(',', ':'), sort_keys=True).encode()
+    settings_hash = hashlib.sha256(settings_content).hexdigest()
+
+    with _resolved_settings_lock:
+        if settings_hash in _resolved_settings:
+            _resolved_settings.move_to_end(settings_hash)
+            return _resolved_settings[settings_hash], settings_hash
+
+    resolved_settings = deep_merge(profile_settings, settings_overrides)
+
+    with _resolved_settings_lock:
+        _resolved_settings[settings_hash] = resolved_settings
+        while len(_resolved_settings) > RESOLVED_SETTINGS_CACHE_MAX_ENTRIES:
+            _resolved_settings.popitem(last= False)
+
+    return resolved_settings, settings_hash
+
+def deep_merge(base, overrides):
+    """ Function to merge overrides over base settings. Dicts are merged key by key (recursively) and any other value, lists
+    included, is replaced. Keys keep the order of base followed by new keys of overrides, so that merges are deterministic.
+    Base and overrides are not modified.
+    """
+
+    merged = dict(base)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = value
+
+    return merged
@@ -0,0 +1,81 @@
+""" S3 helpers shared by the framework lambda functions. JSON artifacts (task settings and mappings) only change on 
+deployment, so they are kept parsed in memory across warm invocations and revalidated with conditional requests.
+"""
+
+import os
+import json
+import threading
+from collections import OrderedDict
+
+from replication_core.clients import get_client
+
+# Constants: Lambda environment variables
+S3_JSON_CACHE_MAX_ENTRIES = int(os.getenv('S3_JSON_CACHE_MAX_ENTRIES', '64'))
+
+class S3JsonCache:
+    """ Class representing a LRU bounded cache of parsed JSON S3 objects keyed by bucket and key. Every read is revalidated
+    with a conditional GET (If-None-Match with the cached ETag) so that objects are only downloaded and parsed again when 
+    they changed. Parsed objects are shared between reads and must be treated as read-only by callers.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_json(self, bucket_name, key_path):
+        """ Returns the parsed JSON content of the S3 object, downloading it only when not cached or modified """
+
+        s3 = get_client('s3')
+        cache_key = (bucket_name, key_path)
+        with self._lock: entry = self._entries.get(cache_key)
+
+        get_object_parameters = {'Bucket': bucket_name, 'Key': key_path}
+        if entry: get_object_parameters['IfNoneMatch'] = entry['etag']
+
+        try:
+            object = s3.get_object(**get_object_parameters)
+        except s3.exceptions.ClientError as error:
+            if not (entry and error.response['ResponseMetadata']['HTTPStatusCode'] == 304): raise
+
+            with self._lock:
+                self.hits += 1
+                if cache_key in self._entries: self._entries.move_to_end(cache_key)
+
+            return entry['value']
+
+        json_object = json.loads(object['Body'].read().decode())
+
+        with self._lock:
+            self.misses += 1
+            self._entries[cache_key] = {'etag': object['ETag'], 'value': json_object}
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last= False)
+                self.evictions += 1
+
+        return json_object
+
+    def stats(self):
+        """ Returns cache counters, including hit rate over all reads """
+
+        with self._lock:
+            reads = self.hits + self.misses
+            return {
+                'hits': self.hits, 
+                'misses': self.misses, 
+                'evictions': self.evictions, 
+                'size': len(self._entries),
+                'hit_rate': round(self.hits / reads, 4) if reads else 0.0
+            }
+
+# Warm container cache: task settings and mappings only change on deployment
+s3_json_cache = S3JsonCache(S3_JSON_CACHE_MAX_ENTRIES)
+
+def read_s3_json_file(bucket_name, key_path):
+    """ Function to retrieve json from S3 file (cached across warm invocations and revalidated by ETag) """
+
+    return s3_json_cache.get_json(bucket_name, key_path)
@@ -0,0 +1,36 @@
+""" Helpers to transform AWS API responses into JSON serializable structures """
+
+from datetime import datetime
+
+# Constant: Format used for every datetime value returned by the framework lambda functions
+DATETIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
+
+def normalize_datetimes(obj):
+    """ Function to make an AWS API response JSON serializable in a single pass. Only datetime values are converted 
+    (formatted as strings), in place, so the rest of the payload is neither copied nor serialized.
+
+    Parameters
+    ----------
+    obj : dict | list
+        AWS API response (or any part of it)
+
+    Returns
+    -------
+        obj : dict | list
+            same object received as parameter, with all nested datetime values formatted as strings
+    """
+
+    if isinstance(obj, dict): items = obj.items()
+    elif isinstance(obj, list): items = enumerate(obj)
+    else: return obj
+
+    for key, value in items:
+        if isinstance(value, datetime): obj[key] = value.strftime(DATETIME_FORMAT)
+        elif isinstance(value, (dict, list)): normalize_datetimes(value)
+
+    return obj
+
+def project(obj, keys):
+    """ Function to keep only the specified keys (when present) of a dict, normalizing datetimes on the kept values only """
+
+    return normalize_datetimes({key: obj[key] for key in keys if key in obj})
@@ -0,0 +1,118 @@
+""" Helpers to tune DMS task settings of a job run from the size of its tables and the metrics of previous runs. Tuned values are
+merged over the task settings of the job (only tuned keys are replaced), so that static settings remain the base of every run.
+"""
+
+import math
+import statistics
+
+# Constant: Supported settings tuning modes. 'static' uses task settings as they are, 'auto' merges tuned values over them
+SETTINGS_TUNING_MODES = ['static', 'auto']
+
+# Constant: Range (conservative, aggressive) of every tuned task setting by migration type. Values are interpolated by the load of the run
+TUNED_SETTINGS_RANGES = {
+    'full-load-and-cdc': {
+        ('FullLoadSettings', 'CommitRate'): (5000, 50000),
+        ('TargetMetadata', 'ParallelLoadThreads'): (0, 8),
+        ('TargetMetadata', 'ParallelLoadBufferSize'): (100, 1000)
+    },
+    'cdc': {
+        ('ChangeProcessingTuning', 'BatchApplyTimeoutMin'): (1, 10),
+        ('ChangeProcessingTuning', 'BatchApplyTimeoutMax'): (30, 120),
+        ('ChangeProcessingTuning', 'BatchApplyMemoryLimit'): (500, 1500),
+        ('ChangeProcessingTuning', 'MemoryLimitTotal'): (1024, 2048),
+        ('ChangeProcessingTuning', 'MinTransactionSize'): (1000, 5000),
+        ('ChangeProcessingTuning', 'CommitTimeout'): (1, 5)
+    }
+}
+
+# Constant: Max number of tables DMS loads in parallel during full load
+DMS_MAX_FULL_LOAD_SUBTASKS = 49
+
+# Constant: Ratio applied to the load of a run when tables errored on the previous run, keeping settings closer to the conservative end
+ERRORED_TABLES_LOAD_RATIO = 0.5
+
+def tune_task_settings(settings, migration_type, tables, metrics_history, cdc_plan, tuning_props):
+    """ Function to tune the task settings of a job run. Full load runs tune commit rate and parallel load threads (and buffer) from
+    the size of the largest table (log scale between small and large table sizes), and max full load subtasks from the number of tables
+    (catalog snapshot or tables loaded on previous runs). CDC runs tune batch apply and transaction apply settings from the backlog to drain
+    per second of CDC window. The load of the run is reduced when tables errored on the previous run.
+
+    Parameters
+    ----------
+    settings : dict
+        DMS task settings of the job. Not modified (shared between invocations)
+    migration_type : str
+        migration type of the job
+    tables : list
+        tables of the run with 'size' key (bytes), None when there is no catalog snapshot of the job
+    metrics_history : list
+        most recent metrics records of the job checkpoint (newest first)
+    cdc_plan : dict
+        planned CDC window of the run with 'WindowSeconds' and 'BacklogSeconds' keys (cdc runs)
+    tuning_props : dict
+        dict with 'small_table_bytes', 'large_table_bytes', 'cdc_high_backlog_ratio' and 'max_full_load_subtasks' keys
+
+    Returns
+    -------
+        tuned_settings : dict
+            DMS task settings with tuned values merged over them
+        settings_tuning : dict
+            dict with 'Mode', 'Load' (0 conservative to 1 aggressive), 'Reason' and 'Values' (tuned values by 'Section.Key') keys
+    """
+
+    settings_ranges = TUNED_SETTINGS_RANGES[migration_type]
+    tuned_values = {}
+
+    if migration_type == 'cdc':
+        window_seconds = max(cdc_plan['WindowSeconds'], 1)
+        load = min(1, cdc_plan['BacklogSeconds'] / window_seconds / tuning_props['cdc_high_backlog_ratio'])
+        reason = 'cdc_backlog'
+    else:
+        table_count = len(tables) if tables else None
+        if table_count is None:
+            tables_history = [metrics['tables_loaded'] + metrics.get('tables_errored', 0) for metrics in metrics_history if 'tables_loaded' in metrics]
+            table_count = int(statistics.median(tables_history)) if tables_history else None
+        if table_count:
+            tuned_values[('FullLoadSettings', 'MaxFullLoadSubTasks')] = max(1, min(table_count, tuning_props['max_full_load_subtasks'], DMS_MAX_FULL_LOAD_SUBTASKS))
+
+        if not tables:
+            return merge_settings(settings, tuned_values), format_settings_tuning(None, 'no_catalog', tuned_values)
+
+        largest_table_bytes = max(max(table['size'] for table in tables), 1)
+        small_table_bytes, large_table_bytes = tuning_props['small_table_bytes'], tuning_props['large_table_bytes']
+        load = math.log(max(largest_table_bytes, small_table_bytes) / small_table_bytes) / math.log(large_table_bytes / small_table_bytes)
+        load = min(1, load)
+        reason = 'table_sizes'
+
+    if metrics_history and metrics_history[0].get('tables_errored'):
+        load, reason = load * ERRORED_TABLES_LOAD_RATIO, f'{reason}_with_errors'
+
+    for setting, (conservative_value, aggressive_value) in settings_ranges.items():
+        tuned_values[setting] = int(round(conservative_value + (aggressive_value - conservative_value) * load))
+
+    # Parallel load buffer only applies with more than one parallel load thread
+    parallel_load_threads = tuned_values.get(('TargetMetadata', 'ParallelLoadThreads'))
+    if parallel_load_threads is not None and parallel_load_threads < 2:
+        tuned_values[('TargetMetadata', 'ParallelLoadThreads')] = 0
+        tuned_values.pop(('TargetMetadata', 'ParallelLoadBufferSize'))
+
+    return merge_settings(settings, tuned_values), format_settings_tuning(round(load, 3), reason, tuned_values)
+
+def merge_settings(settings, tuned_values):
+    """ Function to merge tuned values over task settings, copying only the sections that change """
+
+    tuned_settings = dict(settings)
+    for (section, key), value in tuned_values.items():
+        tuned_settings[section] = {**tuned_settings.get(section, {}), key: value}
+
+    return tuned_settings
+
+def format_settings_tuning(load, reason, tuned_values):
+    """ Function to format the tuning details of a run, with tuned values keyed by 'Section.Key' """
+
+    return {
+        'Mode': 'auto',
+        'Load': load,
+        'Reason': reason,
+        'Values': {f'{section}.{key}': value for (section, key), value in tuned_values.items()}
+    }
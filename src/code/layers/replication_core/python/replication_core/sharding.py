@@ -0,0 +1,101 @@
+""" Helpers to split the table mappings of a job into shards (one DMS task per shard). Shard plans assign every table selected
+by the job mappings to a shard, and the mappings of each shard are derived from the job mappings and the plan.
+"""
+
+import re
+
+# Constant: Value DMS object locators use as wildcard (any sequence of characters)
+OBJECT_LOCATOR_WILDCARD = '%'
+
+def get_shard_name(name, shard_index):
+    """ Function to build the name of a shard from the name of the job (task identifier) or job checkpoint (checkpoint lineage) """
+
+    return f'{name}-shard-{shard_index:02d}'
+
+def get_selecting_rule(mappings, schema_name, table_name):
+    """ Function to retrieve the selection rule including a table in the job mappings. Tables matching an exclude rule are not selected.
+
+    Parameters
+    ----------
+    mappings : dict
+        DMS table mappings of the job
+    schema_name : str
+        name of the schema of the table
+    table_name : str
+        name of the table
+
+    Returns
+    -------
+        selection_rule : dict
+            first include selection rule matching the table, None when the table is not selected
+    """
+
+    selection_rules = [rule for rule in mappings['rules'] if rule['rule-type'] == 'selection']
+    matching_rules = [rule for rule in selection_rules if locator_matches(rule['object-locator'], schema_name, table_name)]
+
+    if any(rule['rule-action'] == 'exclude' for rule in matching_rules):
+        return None
+
+    return next((rule for rule in matching_rules if rule['rule-action'] == 'include'), None)
+
+def locator_matches(object_locator, schema_name, table_name):
+    """ Function to check if a table matches the schema and table names (with wildcards) of an object locator """
+
+    return name_matches(object_locator['schema-name'], schema_name) and name_matches(object_locator.get('table-name', OBJECT_LOCATOR_WILDCARD), table_name)
+
+def name_matches(pattern, name):
+    """ Function to check if a name matches an object locator pattern """
+
+    regex = '.*'.join([re.escape(part) for part in pattern.split(OBJECT_LOCATOR_WILDCARD)])
+
+    return re.fullmatch(regex, name) is not None
+
+def get_shard_mappings(mappings, shards, shard_index):
+    """ Function to derive the table mappings of a shard from the job mappings and the shard plan. The first shard keeps the
+    selection rules of the job and excludes the tables of every other shard, so that tables created after the plan are still
+    replicated (by the first shard). Other shards include their tables explicitly (with the filters of the selection rule of the job
+    including them). Transformation and table settings rules are kept on every shard.
+
+    Parameters
+    ----------
+    mappings : dict
+        DMS table mappings of the job
+    shards : list
+        shards of the plan, with 'index' and 'tables' (list of dicts with 'schema_name' and 'table_name') keys
+    shard_index : int
+        index of the shard
+
+    Returns
+    -------
+        shard_mappings : dict
+            DMS table mappings of the shard
+    """
+
+    rule_ids = [int(rule['rule-id']) for rule in mappings['rules'] if str(rule['rule-id']).isdigit()]
+    next_rule_id = max(rule_ids, default= 0) + 1
+
+    if shard_index == 0:
+        shard_rules = list(mappings['rules'])
+        other_tables = [table for shard in shards if shard['index'] != shard_index for table in shard['tables']]
+        rule_action, tables = 'exclude', other_tables
+    else:
+        shard_rules = [rule for rule in mappings['rules'] if rule['rule-type'] != 'selection']
+        shard_tables = next(shard['tables'] for shard in shards if shard['index'] == shard_index)
+        rule_action, tables = 'include', shard_tables
+
+    for offset, table in enumerate(tables):
+        rule_id = str(next_rule_id + offset)
+        selection_rule = get_selecting_rule(mappings, table['schema_name'], table['table_name']) if rule_action == 'include' else None
+        shard_rules.append({
+            'rule-type': 'selection',
+            'rule-id': rule_id,
+            'rule-name': rule_id,
+            'object-locator': {
+                'schema-name': table['schema_name'],
+                'table-name': table['table_name']
+            },
+            'rule-action': rule_action,
+            'filters': selection_rule.get('filters', []) if selection_rule else []
+        })
+
+    return {**mappings, 'rules': shard_rules}
@@ -0,0 +1,53 @@
+from aws_cdk import (
+    aws_lambda as lambda_,
+    aws_iam as iam
+)
+
+from os import path;
+
+from constructs import Construct
+
+class AdaptivePollerConstruct(Construct):
+    """ Class to represent the adaptive poller lambda function. Used by workflows (state machines) to compute the wait before
+    polling again the status of long running operations (exponential backoff with jitter seeded with historical durations)
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, poller_props: dict, replication_core_layer: lambda_.ILayerVersion, **kwargs) -> None:
+        """ Class Constructor. Will create the adaptive poller lambda function based on properties specified as parameter
+        
+        Parameters
+        ----------
+        poller_props : dict
+            dict with required properties for lambda function creation.
+            For more details check config/workflows_config.py documentation and examples.
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+        """
+
+        super().__init__(scope, construct_id, **kwargs)
+
+        lambda_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'lambda-common-role',
+            role_name= poller_props['lambda_replication_common_role_name']
+        )
+
+        self.function = lambda_.Function(
+            scope= self,
+            id= 'adaptive_poller_lambda',
+            function_name= poller_props['function_name'],
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "adaptive_poller")),
+            handler= "adaptive_poller.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            environment= {
+                'REPLICATION_DURATIONS_TABLE_NAME': poller_props['replication_durations_table_name'],
+                'POLL_BASE_INTERVAL_SECONDS': str(poller_props['base_interval_seconds']),
+                'POLL_BACKOFF_FACTOR': str(poller_props['backoff_factor']),
+                'POLL_MAX_INTERVAL_SECONDS': str(poller_props['max_interval_seconds']),
+                'POLL_JITTER_RATIO': str(poller_props['jitter_ratio']),
+                'POLL_HISTORY_SIZE': str(poller_props['history_size'])
+            }
+        )
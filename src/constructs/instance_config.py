@@ -28,35 +28,35 @@ class InstanceConfigConstruct(Construct):
             role_name= instances_config_props['lambda_replication_common_role_name']
         )
         
+        # Records are updated (not replaced) so that lease state and task slots of the instances survive redeployments
         replication_instances_table_name = instances_config_props['replication_instances_table_name']
-        request_items = self.get_request_items(instances_config_props['replication_instances_records'])
-        replication_instances_record_loader = cr.AwsCustomResource(
-            scope= self,
-            id= 'replication-instances-config-lambda',
-            function_name= 'replication_instances_config_lambda',
-            role= lambda_common_role,
-            on_update= cr.AwsSdkCall(
-                service= 'DynamoDB',
-                action= 'batchWriteItem',
-                parameters= {
-                    'RequestItems': {
-                        replication_instances_table_name: request_items
-                    }
-                },
-                physical_resource_id= cr.PhysicalResourceId.of('replication-instances-config-lambda')
+        for record in instances_config_props['replication_instances_records']:
+            instance_name = record['instance_name']
+            replication_instance_record_loader = cr.AwsCustomResource(
+                scope= self,
+                id= f'replication-instance-config-{instance_name}',
+                function_name= 'replication_instances_config_lambda',
+                role= lambda_common_role,
+                on_update= cr.AwsSdkCall(
+                    service= 'DynamoDB',
+                    action= 'updateItem',
+                    parameters= {
+                        'TableName': replication_instances_table_name,
+                        **self.get_update_parameters(record)
+                    },
+                    physical_resource_id= cr.PhysicalResourceId.of(f'replication-instance-config-{instance_name}')
+                )
             )
-        )
 
-    def get_request_items(self, records):
-        """ Function to format instance config records into a DynamoDB command-ready format """
+    def get_update_parameters(self, record):
+        """ Function to format an instance config record into DynamoDB update command parameters, setting only configuration attributes """
         
-        request_items = []
-        for record in records:
-            request_item = {
-                'PutRequest': {
-                    'Item': { attribute: {'S': value} for attribute, value in record.items() }
-                }
-            }
-            request_items.append(request_item)
+        attributes = {attribute: value for attribute, value in record.items() if attribute != 'instance_name'}
+        update_parameters = {
+            'Key': {'instance_name': {'S': record['instance_name']}},
+            'UpdateExpression': 'SET ' + ', '.join(f'#attribute{index} = :value{index}' for index in range(len(attributes))),
+            'ExpressionAttributeNames': {f'#attribute{index}': attribute for index, attribute in enumerate(attributes)},
+            'ExpressionAttributeValues': {f':value{index}': {'S': value} for index, value in enumerate(attributes.values())}
+        }
         
-        return request_items
+        return update_parameters
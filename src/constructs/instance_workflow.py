@@ -1,4 +1,5 @@
 from aws_cdk import (
+    aws_lambda as lambda_,
     aws_stepfunctions as stepfunctions,
     aws_iam as iam
 )
@@ -9,20 +10,51 @@ import json;
 from constructs import Construct
 
 class CreateInstanceWorkflowConstruct(Construct):
-    """ Class to represent the workflow (state machine) that will create a new DMS instance """
+    """ Class to represent the workflow (state machine and belonging lambda functions) that will create a new DMS instance """
 
-    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, **kwargs) -> None:
-        """ Class Constructor. Will create a workflow (state machine) based on properties specified as parameter
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, replication_core_layer: lambda_.ILayerVersion, adaptive_poller_function: lambda_.IFunction, **kwargs) -> None:
+        """ Class Constructor. Will create a workflow (state machine and belonging lambdas) based on properties specified as parameter
+        Lambdas include: 1/ for planning instance creation ahead of scheduled jobs and reporting their start time SLO
         
         Parameters
         ----------
         workflow_props : dict
             dict with required properties for workflow creation.
             For more details check config/workflows_config.py documentation and examples.
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+
+        adaptive_poller_function: IFunction
+            Lambda function computing the wait between status polls of the workflow
         """
 
         super().__init__(scope, construct_id, **kwargs)
 
+        lambda_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'lambda-common-role',
+            role_name= workflow_props['lambda_replication_common_role_name']
+        )
+
+        plan_provisioning_lambda = lambda_.Function(
+            scope= self,
+            id= 'plan_provisioning_lambda',
+            function_name= 'plan_provisioning',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "plan_provisioning")),
+            handler= "plan_provisioning.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            environment= {
+                'REPLICATION_DURATIONS_TABLE_NAME': workflow_props['replication_durations_table_name'],
+                'PROVISIONING_PERCENTILE': str(workflow_props['provisioning_percentile']),
+                'PROVISIONING_SAFETY_SECONDS': str(workflow_props['provisioning_safety_seconds']),
+                'PROVISIONING_HISTORY_SIZE': str(workflow_props['provisioning_history_size']),
+                'START_SLO_SECONDS': str(workflow_props['start_slo_seconds'])
+            }
+        )
+
         workflow_common_role = iam.Role.from_role_name(
             scope= self,
             id= 'workflow-common-role',
@@ -39,7 +71,9 @@ class CreateInstanceWorkflowConstruct(Construct):
             definition= create_instance_state_machine_definition,
             definition_substitutions= {
                 'instance-config-table': workflow_props['replication_instances_table_name'],
-                'replication-event-bus-name': workflow_props['replication_event_bus_name']
+                'replication-event-bus-name': workflow_props['replication_event_bus_name'],
+                'adaptive_poller_lambda_arn': adaptive_poller_function.function_arn,
+                'plan_provisioning_lambda_arn': plan_provisioning_lambda.function_arn
             },
             role_arn= workflow_common_role.role_arn
         )
@@ -47,7 +81,10 @@ class CreateInstanceWorkflowConstruct(Construct):
 class DeleteInstanceWorkflowConstruct(Construct):
     """ Class to represent the workflow (state machine) that will delete an existing DMS instance """
 
-    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, **kwargs) -> None:
+    # Constant: Name of the state deferring instance deletion after its last lease is released
+    IDLE_TIMEOUT_STATE_NAME = 'Wait for idle timeout'
+
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, adaptive_poller_function: lambda_.IFunction, **kwargs) -> None:
         """ Class Constructor. Will create a workflow (state machine) based on properties specified as parameter
         
         Parameters
@@ -55,6 +92,9 @@ class DeleteInstanceWorkflowConstruct(Construct):
         workflow_props : dict
             dict with required properties for workflow creation.
             For more details check conifg/workflows_config.py documentation and examples.
+
+        adaptive_poller_function: IFunction
+            Lambda function computing the wait between status polls of the workflow
         """
         
         super().__init__(scope, construct_id, **kwargs)
@@ -67,6 +107,7 @@ class DeleteInstanceWorkflowConstruct(Construct):
         
         delete_instance_state_machine_file = open('src/code/stepfunctions/delete_instance_workflow.asl.json')
         delete_instance_state_machine_definition = json.load(delete_instance_state_machine_file)
+        delete_instance_state_machine_definition['States'][self.IDLE_TIMEOUT_STATE_NAME]['Seconds'] = workflow_props['idle_timeout_seconds']
         
         delete_instance_state_machine = stepfunctions.CfnStateMachine(
             scope= self,
@@ -74,7 +115,9 @@ class DeleteInstanceWorkflowConstruct(Construct):
             state_machine_name= workflow_props['state_machine_name'],
             definition= delete_instance_state_machine_definition,
             definition_substitutions= {
-                'replication-event-bus-name': workflow_props['replication_event_bus_name']
+                'instance-config-table': workflow_props['replication_instances_table_name'],
+                'replication-event-bus-name': workflow_props['replication_event_bus_name'],
+                'adaptive_poller_lambda_arn': adaptive_poller_function.function_arn
             },
             role_arn= workflow_common_role.role_arn
         )
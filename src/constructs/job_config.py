@@ -5,6 +5,12 @@ from aws_cdk import (
     aws_s3_deployment as s3_deploy
 )
 
+from os import path;
+import json;
+import zlib;
+import base64;
+import hashlib;
+
 from constructs import Construct
 
 class JobConfigConstruct(Construct):
@@ -12,8 +18,41 @@ class JobConfigConstruct(Construct):
     containing details of each DMS task configuration (named Job in this framework)
     """
 
+    # Constant: Default values for optional job record attributes (all attributes are expected by workflows on job config retrieval)
+    JOB_RECORD_DEFAULTS = {
+        'task_mode': 'transient',
+        'settings_tuning': 'static',
+        'settings_profile': ''
+    }
+
+    # Constant: Local path where DMS task files (settings and mappings) are stored partitioned by job name
+    JOBS_ARTIFACTS_PATH = 'src/code/dms'
+
+    # Constant: Folder (inside JOBS_ARTIFACTS_PATH) where settings profiles are stored. Synced to S3 with job artifacts
+    PROFILES_FOLDER_NAME = 'profiles'
+
+    # Constant: Encoding of compiled job artifacts stored inline in job records. Must match replication_core.artifacts
+    JOB_ARTIFACTS_ENCODING = 'zlib+base64'
+
+    # Constant: Default max size (bytes) of encoded job artifacts to be stored inline. Bigger artifacts are read from S3
+    DEFAULT_ARTIFACTS_INLINE_MAX_BYTES = 4096
+
+    # Constant: Max number of job records per custom resource (DynamoDB BatchWriteItem limit)
+    RECORDS_PER_LOADER_MAX_ITEMS = 25
+
+    # Constant: Max size (bytes) of the job records of a custom resource. Update events carry both new and old properties,
+    # so that records take at most half of the Lambda asynchronous invocation payload limit (256 KB)
+    RECORDS_PER_LOADER_MAX_BYTES = 122880
+
+    # Constant: Max size (bytes) of all job records, which are embedded in the CloudFormation template (1 MB limit)
+    RECORDS_MAX_TEMPLATE_BYTES = 524288
+
     def __init__(self, scope: Construct, construct_id: str, jobs_config_props: dict, **kwargs) -> None:
         """ Class Constructor. Will create a set of records in DynamoDB representing a job configuration each.
+        Each record includes the job task settings and mappings compiled into a single compact artifact (minified, compressed 
+        and hashed) so that they can be retrieved with the job record. Artifacts bigger than 'artifacts_inline_max_bytes' 
+        are only referenced and read from the S3 copy synced by this construct. Records are written in chunks (one custom 
+        resource each) within the BatchWriteItem and custom resource payload limits, and synth fails when records are too big.
         
         Parameters
         ----------
@@ -46,40 +85,104 @@ class JobConfigConstruct(Construct):
             destination_bucket= artifact_bucket,
             destination_key_prefix= replication_jobs_config_prefix,
             sources= [
-                s3_deploy.Source.asset('src/code/dms')
+                s3_deploy.Source.asset(self.JOBS_ARTIFACTS_PATH)
             ],
             retain_on_delete= False
         )
         
         replication_jobs_table_name = jobs_config_props['replication_jobs_table_name']
-        request_items = self.get_request_items(jobs_config_props['replication_jobs_records'])
-        replication_jobs_record_loader = cr.AwsCustomResource(
-            scope= self,
-            id= 'replication-jobs-config-lambda',
-            function_name= 'replication_jobs_config_lambda',
-            role= lambda_common_role,
-            on_update= cr.AwsSdkCall(
-                service= 'DynamoDB',
-                action= 'batchWriteItem',
-                parameters= {
-                    'RequestItems': {
-                        replication_jobs_table_name: request_items
-                    }
-                },
-                physical_resource_id= cr.PhysicalResourceId.of('replication-jobs-config-lambda')
+        artifacts_inline_max_bytes = jobs_config_props['artifacts_inline_max_bytes'] if 'artifacts_inline_max_bytes' in jobs_config_props else self.DEFAULT_ARTIFACTS_INLINE_MAX_BYTES
+        request_items = self.get_request_items(jobs_config_props['replication_jobs_records'], artifacts_inline_max_bytes)
+        for index, chunk_request_items in enumerate(self.get_request_items_chunks(request_items)):
+            # First chunk keeps the id of the single loader of previous versions, so that it is updated instead of replaced
+            loader_id = 'replication-jobs-config-lambda' if index == 0 else f'replication-jobs-config-lambda-{index + 1:02d}'
+            replication_jobs_record_loader = cr.AwsCustomResource(
+                scope= self,
+                id= loader_id,
+                function_name= 'replication_jobs_config_lambda',
+                role= lambda_common_role,
+                on_update= cr.AwsSdkCall(
+                    service= 'DynamoDB',
+                    action= 'batchWriteItem',
+                    parameters= {
+                        'RequestItems': {
+                            replication_jobs_table_name: chunk_request_items
+                        }
+                    },
+                    physical_resource_id= cr.PhysicalResourceId.of(loader_id)
+                )
             )
-        )
 
-    def get_request_items(self, records):
-        """ Function to format job config records into a DynamoDB command-ready format """
+    def get_request_items(self, records, artifacts_inline_max_bytes):
+        """ Function to format job config records (including default values and compiled job artifacts) into a DynamoDB command-ready format """
 
         request_items = []
         for record in records:
+            record_artifacts = self.get_compiled_artifacts(record['job_name'], record.get('settings_profile'), artifacts_inline_max_bytes)
             request_item = {
                 'PutRequest': {
-                    'Item': { attribute: {'S': value} for attribute, value in record.items() }
+                    'Item': { attribute: {'S': value} for attribute, value in {**self.JOB_RECORD_DEFAULTS, **record, **record_artifacts}.items() }
                 }
             }
             request_items.append(request_item)
         
         return request_items
+
+    def get_request_items_chunks(self, request_items):
+        """ Function to split request items into chunks within RECORDS_PER_LOADER_MAX_ITEMS and RECORDS_PER_LOADER_MAX_BYTES.
+        Raises ValueError when a single record or all records together exceed the custom resource or template size limits
+        """
+
+        request_items_sizes = [len(json.dumps(request_item, separators=(',', ':'))) for request_item in request_items]
+        if sum(request_items_sizes) > self.RECORDS_MAX_TEMPLATE_BYTES:
+            raise ValueError(f'Job records take {sum(request_items_sizes)} bytes, over the {self.RECORDS_MAX_TEMPLATE_BYTES} bytes template limit. Lower artifacts_inline_max_bytes')
+
+        chunks = []
+        chunk_bytes = 0
+        for request_item, request_item_size in zip(request_items, request_items_sizes):
+            if request_item_size > self.RECORDS_PER_LOADER_MAX_BYTES:
+                job_name = request_item['PutRequest']['Item']['job_name']['S']
+                raise ValueError(f'Job record of {job_name} takes {request_item_size} bytes, over the {self.RECORDS_PER_LOADER_MAX_BYTES} bytes custom resource limit. Lower artifacts_inline_max_bytes')
+
+            if not chunks or len(chunks[-1]) == self.RECORDS_PER_LOADER_MAX_ITEMS or chunk_bytes + request_item_size > self.RECORDS_PER_LOADER_MAX_BYTES:
+                chunks.append([])
+                chunk_bytes = 0
+            chunks[-1].append(request_item)
+            chunk_bytes += request_item_size
+
+        return chunks
+
+    def get_compiled_artifacts(self, job_name, settings_profile, artifacts_inline_max_bytes):
+        """ Function to compile job settings and mappings into a single minified, compressed and hashed artifact. 
+        Returns the job record attributes representing the artifact: 'job_artifacts_hash', 'job_artifacts_location' 
+        ('inline' or 's3'), 'job_artifacts_encoding' and 'job_artifacts' (both empty when not inline, since the job config 
+        retrieval of workflows expects every attribute). Settings of jobs with a settings 
+        profile are the overrides of the profile (resolved on task creation), and their settings file is optional.
+        """
+
+        if settings_profile and not path.exists(f'{self.JOBS_ARTIFACTS_PATH}/{self.PROFILES_FOLDER_NAME}/{settings_profile}.json'):
+            raise ValueError(f'Unsupported settings profile {settings_profile} of job {job_name}. Profiles should be stored in {self.JOBS_ARTIFACTS_PATH}/{self.PROFILES_FOLDER_NAME}')
+
+        job_artifacts = {}
+        for artifact_name in ['settings', 'mappings']:
+            artifact_path = f'{self.JOBS_ARTIFACTS_PATH}/{job_name}/{artifact_name}.json'
+            if artifact_name == 'settings' and settings_profile and not path.exists(artifact_path):
+                job_artifacts[artifact_name] = {}
+                continue
+
+            with open(artifact_path) as artifact_file:
+                job_artifacts[artifact_name] = json.load(artifact_file)
+
+        job_artifacts_minified = json.dumps(job_artifacts, separators=(',', ':'), sort_keys=True).encode()
+        job_artifacts_hash = hashlib.sha256(job_artifacts_minified).hexdigest()
+        job_artifacts_encoded = base64.b64encode(zlib.compress(job_artifacts_minified, 9)).decode()
+
+        if len(job_artifacts_encoded) > artifacts_inline_max_bytes:
+            return {'job_artifacts_hash': job_artifacts_hash, 'job_artifacts_location': 's3', 'job_artifacts_encoding': '', 'job_artifacts': ''}
+
+        return {
+            'job_artifacts_hash': job_artifacts_hash,
+            'job_artifacts_location': 'inline',
+            'job_artifacts_encoding': self.JOB_ARTIFACTS_ENCODING,
+            'job_artifacts': job_artifacts_encoded
+        }
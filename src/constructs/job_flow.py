@@ -1,5 +1,6 @@
 from aws_cdk import (
     aws_iam as iam,
+    aws_lambda as lambda_,
     aws_events as events,
     aws_events_targets as event_targets,
     aws_stepfunctions as stepfunctions
@@ -10,15 +11,27 @@ from constructs import Construct
 class JobFlowConstruct(Construct):
     """ Class to represent the Job Flow (job workflow sequence) that will be triggered when job is executed
     Note that resources will choreograph (coordinate) the execution of each independent workflow (state machine) following a sequence.
-    Resources include eventbridge rules and targets.
+    Resources include eventbridge rules and targets. In 'orchestrated' mode, a parent state machine executing each workflow as a 
+    nested execution is created instead.
     """
 
+    # Constant: Supported flow modes
+    FLOW_MODES = ['choreography', 'orchestrated']
+
+    # Constant: Service integration used by the parent state machine to run each workflow and wait for its completion
+    NESTED_EXECUTION_RESOURCE = 'arn:aws:states:::states:startExecution.sync:2'
+
+    # Constant: Default name of the 'delete_task' workflow state machine, which must not be a step of persistent jobs
+    DEFAULT_DELETE_TASK_STATE_MACHINE_NAME = 'delete_task_workflow'
+
     def __init__(self, scope: Construct, construct_id: str, jobs_flow_props: dict, **kwargs) -> None:
         """ Class Constructor. Will create a Job Flow (job workflow sequence) based on properties specified as parameter
         Events include: 1/ cron event rule / target in case a workflow should start on a schedule. 
         2/ finish event rule that will trigger whenever tge workflows finishes successfully
         3/ target on previous workflow finish rule so that new workflow is executed when successfully finished. 
         This target will apply only if there is a previous workflow within the sequence and if the workflow is not cron based.
+        When 'flow_mode' is 'orchestrated': 1/ a parent state machine running every workflow as a nested execution and 2/ a cron 
+        event rule / target for the parent state machine (when first workflow has a schedule).
         
         Parameters
         ----------
@@ -47,13 +60,27 @@ class JobFlowConstruct(Construct):
         job_name = jobs_flow_props['job_name']
         instance_name = jobs_flow_props['instance_name']
         job_steps_details = jobs_flow_props['job_steps_details']
+        job_queue_function_name = jobs_flow_props.get('job_queue_function_name', 'job_queue')
+
+        flow_mode = jobs_flow_props.get('flow_mode', 'choreography')
+        if flow_mode not in self.FLOW_MODES:
+            raise ValueError(f'Unsupported flow mode {flow_mode} for job {job_name}. Supported modes are {self.FLOW_MODES}')
+
+        self.__validate_task_modes(job_name, job_steps_details, jobs_flow_props)
+
+        if flow_mode == 'orchestrated':
+            self.__create_flow_state_machine(job_name, instance_name, jobs_flow_props, eventbridge_common_role)
+            return
         
         for index, step_props in enumerate(job_steps_details):
-            step_state_machine = self.__get_state_machine(index, step_props)
+            if ('parallel' in step_props) or ('job_name' in step_props):
+                raise ValueError(f'Parallel steps and step job names of job {job_name} are only supported when flow mode is orchestrated')
+
+            step_state_machine = self.__get_state_machine(f'{index:02d}', step_props)
             
             step_cron = step_props['cron'] if 'cron' in step_props else None
             if step_cron:
-                step_cron_rule = self.__create_step_cron_rule(index, job_name, instance_name, step_props, step_state_machine, eventbridge_common_role)
+                step_cron_rule = self.__create_step_cron_rule(index, job_name, instance_name, step_props, step_state_machine, eventbridge_common_role, job_queue_function_name)
                 job_step_rules.append(step_cron_rule)
             else:
                 step_first = False if index > 0 else True
@@ -65,23 +92,168 @@ class JobFlowConstruct(Construct):
             step_finish_rule = self.__create_step_finish_rule(index, job_name, step_props, replication_event_bus)
             job_step_rules.append(step_finish_rule)
  
-    def __get_state_machine(self, index, step_props):
+    def __validate_task_modes(self, job_name, steps_details, jobs_flow_props):
+        """Helper class private method to reject flows deleting the task of a persistent job (parallel branches included), since 
+        persistent tasks are reused by the next execution of the job instead of being created again
+        """
+
+        job_task_modes = jobs_flow_props.get('job_task_modes', {})
+        delete_task_state_machine_name = jobs_flow_props.get('delete_task_state_machine_name', self.DEFAULT_DELETE_TASK_STATE_MACHINE_NAME)
+        for step_props in steps_details:
+            for branch_steps_details in step_props.get('parallel', []):
+                self.__validate_task_modes(job_name, branch_steps_details, jobs_flow_props)
+
+            step_job_name = step_props.get('job_name', job_name)
+            if step_props.get('state_machine_name') == delete_task_state_machine_name and job_task_modes.get(step_job_name) == 'persistent':
+                raise ValueError(f'Job {step_job_name} has persistent task mode and can not be deleted by the flow of job {job_name}. Remove its {delete_task_state_machine_name} step')
+
+    def __create_flow_state_machine(self, job_name, instance_name, jobs_flow_props, eventbridge_common_role):
+        """Helper class private method to create the parent state machine (orchestrated mode) that runs each workflow of the sequence 
+        as a nested execution, and the cron rule in EventBridge targeting it when first workflow has a schedule 
+        """
+
+        job_steps_details = jobs_flow_props['job_steps_details']
+        for index, step_props in enumerate(job_steps_details):
+            if index > 0 and 'cron' in step_props:
+                raise ValueError(f'Only first step of job {job_name} can have a cron when flow mode is orchestrated')
+
+        workflow_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'workflow-common-role',
+            role_name= jobs_flow_props['workflow_replication_common_role_name']
+        )
+
+        flow_state_machine_definition = self.__get_flow_state_machine_definition(job_name, instance_name, job_steps_details)
+        flow_state_machine = stepfunctions.CfnStateMachine(
+            scope= self,
+            id= 'flow_state_machine',
+            state_machine_name= jobs_flow_props.get('flow_state_machine_name', f'{job_name}-flow'),
+            definition= flow_state_machine_definition,
+            role_arn= workflow_common_role.role_arn
+        )
+
+        first_step_props = job_steps_details[0]
+        if 'cron' in first_step_props:
+            flow_state_machine_reference = stepfunctions.StateMachine.from_state_machine_arn(
+                scope= self,
+                id= 'flow_state_machine_reference',
+                state_machine_arn= flow_state_machine.attr_arn
+            )
+            self.__create_step_cron_rule(0, job_name, instance_name, first_step_props, flow_state_machine_reference, eventbridge_common_role, jobs_flow_props.get('job_queue_function_name', 'job_queue'))
+
+        return flow_state_machine
+
+    def __get_flow_state_machine_definition(self, job_name, instance_name, job_steps_details):
+        """Helper class private method to build the definition of the parent state machine (orchestrated mode) """
+
+        flow_start_state_name, flow_states = self.__get_flow_states(job_name, instance_name, job_steps_details, '')
+
+        flow_state_machine_definition = {
+            'Comment': f'State machine to orchestrate the workflow sequence of job {job_name}',
+            'StartAt': flow_start_state_name,
+            'States': flow_states
+        }
+
+        return flow_state_machine_definition
+
+    def __get_flow_states(self, job_name, instance_name, steps_details, steps_path):
+        """Helper class private method to build the states of a sequence of steps of the parent state machine (orchestrated mode).
+        Steps follow the sequence and it ends after the first disabled step, as it happens with disabled finish rules on choreography mode.
+        Parallel steps are built as Parallel states with one branch (sequence of steps) per element, so that all branches must finish 
+        before next step is executed. Steps path identifies the position of the sequence in the flow to keep state names unique.
+        """
+
+        flow_steps_details = []
+        for step_props in steps_details:
+            flow_steps_details.append(step_props)
+            step_enabled = step_props['enabled'] if 'enabled' in step_props else True
+            if not step_enabled: break
+
+        step_ids = [f'{steps_path}{index:02d}' for index in range(len(flow_steps_details))]
+        step_state_names = [
+            f"Step {step_id} {'parallel' if 'parallel' in step_props else step_props['state_machine_name']}" 
+            for step_id, step_props in zip(step_ids, flow_steps_details)
+        ]
+
+        flow_states = {}
+        for index, step_props in enumerate(flow_steps_details):
+            step_id = step_ids[index]
+            if 'parallel' in step_props:
+                step_state = {
+                    'Type': 'Parallel',
+                    'Branches': [],
+                    'ResultPath': f'$.StepsOutput.step_{step_id}'
+                }
+                for branch_index, branch_steps_details in enumerate(step_props['parallel']):
+                    branch_start_state_name, branch_states = self.__get_flow_states(job_name, instance_name, branch_steps_details, f'{step_id}_{branch_index}_')
+                    step_state['Branches'].append({'StartAt': branch_start_state_name, 'States': branch_states})
+            else:
+                step_state_machine = self.__get_state_machine(step_id, step_props)
+                step_input = {
+                    'JobName': step_props.get('job_name', job_name),
+                    'InstanceName': instance_name,
+                    'AWS_STEP_FUNCTIONS_STARTED_BY_EXECUTION_ID.$': '$$.Execution.Id'
+                }
+                if step_id == '00' and 'provisioning_lead_minutes' in step_props:
+                    step_input['ScheduledTime.$'] = '$.ScheduledTime'
+                    step_input['ProvisioningLeadSeconds.$'] = '$.ProvisioningLeadSeconds'
+                step_state = {
+                    'Type': 'Task',
+                    'Resource': self.NESTED_EXECUTION_RESOURCE,
+                    'Parameters': {
+                        'StateMachineArn': step_state_machine.state_machine_arn,
+                        'Input': step_input
+                    },
+                    'ResultPath': f'$.StepsOutput.step_{step_id}',
+                    'ResultSelector': {
+                        'ExecutionArn.$': '$.ExecutionArn',
+                        'Status.$': '$.Status',
+                        'StartDate.$': '$.StartDate',
+                        'StopDate.$': '$.StopDate'
+                    }
+                }
+
+            if index < len(flow_steps_details) - 1:
+                step_state['Next'] = step_state_names[index + 1]
+            else:
+                step_state['End'] = True
+
+            flow_states[step_state_names[index]] = step_state
+
+        return step_state_names[0], flow_states
+
+    def __get_state_machine(self, step_id, step_props):
         """Helper class private method to retrieve state machine (workflow) to be referenced on targets """
         
         state_machine_name = step_props['state_machine_name']
         state_machine = stepfunctions.StateMachine.from_state_machine_name(
             scope=self,
-            id= f'state_machine_{index:02d}',
+            id= f'state_machine_{step_id}',
             state_machine_name=state_machine_name
         )
 
         return state_machine
     
-    def __create_step_cron_rule(self, index, job_name, instance_name, step_props, state_machine, eventbridge_common_role):
-        """Helper class private method to create a cron rule in EventBridge and assign the specified state machine as target """
+    def __create_step_cron_rule(self, index, job_name, instance_name, step_props, state_machine, eventbridge_common_role, job_queue_function_name):
+        """Helper class private method to create a cron rule in EventBridge and assign the specified state machine as target.
+        When step has a provisioning lead, the rule is triggered that lead earlier and the target input includes the scheduled time 
+        and the lead, so that the workflow can plan when to create the instance to be available at the original schedule.
+        When step has a queue definition, the target is the job queue lambda function instead, enqueuing the job run with its priority 
+        and deadline so that it is dispatched when its instance has free task slots.
+        """
 
         step_enabled = step_props['enabled'] if 'enabled' in step_props else True
         step_cron = step_props['cron']
+        step_cron_input = {
+            'InstanceName': instance_name,
+            'JobName': job_name
+        }
+        provisioning_lead_minutes = step_props.get('provisioning_lead_minutes', 0)
+        if provisioning_lead_minutes > 0:
+            step_cron = self.__get_lead_cron(job_name, step_cron, provisioning_lead_minutes)
+            step_cron_input['ScheduledTime'] = events.EventField.time
+            step_cron_input['ProvisioningLeadSeconds'] = provisioning_lead_minutes * 60
+
         step_cron_rule = events.Rule(
             scope= self,
             id= f'job_step_{index:02d}_cron_rule',
@@ -90,20 +262,60 @@ class JobFlowConstruct(Construct):
             schedule=events.Schedule.cron(**step_cron)
         )
         
-        step_cron_rule_target = event_targets.SfnStateMachine(
-            machine=state_machine,
-            role=eventbridge_common_role,
-            input=events.RuleTargetInput.from_object(
-                {
-                    'InstanceName': instance_name,
-                    'JobName': job_name
-                }
+        if 'queue' in step_props:
+            step_queue = step_props['queue']
+            job_queue_function = lambda_.Function.from_function_name(
+                scope= self,
+                id= f'job_step_{index:02d}_job_queue_function',
+                function_name= job_queue_function_name
+            )
+            step_queue_input = {
+                'Action': 'enqueue',
+                'StateMachineArn': state_machine.state_machine_arn,
+                'ExecutionInput': step_cron_input,
+                'Priority': step_queue['priority'],
+                'DeadlineMinutes': step_queue['deadline_minutes'],
+                'EnqueuedTime': events.EventField.time
+            }
+            if 'queue_name' in step_queue: step_queue_input['Queue'] = step_queue['queue_name']
+            step_cron_rule_target = event_targets.LambdaFunction(
+                handler= job_queue_function,
+                event= events.RuleTargetInput.from_object(step_queue_input)
+            )
+        else:
+            step_cron_rule_target = event_targets.SfnStateMachine(
+                machine=state_machine,
+                role=eventbridge_common_role,
+                input=events.RuleTargetInput.from_object(step_cron_input)
             )
-        )
 
         step_cron_rule.add_target(step_cron_rule_target)
 
         return step_cron_rule
+
+    def __get_lead_cron(self, job_name, step_cron, provisioning_lead_minutes):
+        """Helper class private method to shift a cron earlier by the provisioning lead. 
+        Only crons with a single hour and minute are supported, and the lead can only move the schedule to the previous day 
+        when the cron runs every day (no day, week day or month restrictions).
+        """
+
+        cron_minute = str(step_cron.get('minute', '*'))
+        cron_hour = str(step_cron.get('hour', '*'))
+        if not (cron_minute.isdigit() and cron_hour.isdigit()):
+            raise ValueError(f'Provisioning lead of job {job_name} requires a cron with a single hour and minute')
+
+        lead_minute_of_day = int(cron_hour) * 60 + int(cron_minute) - provisioning_lead_minutes
+        if lead_minute_of_day < 0:
+            restricted_fields = [field for field in ['day', 'week_day', 'month'] if step_cron.get(field, '*') not in ['*', '?']]
+            if restricted_fields or lead_minute_of_day < -24 * 60:
+                raise ValueError(f'Provisioning lead of job {job_name} can not move the cron to a previous day')
+            lead_minute_of_day += 24 * 60
+
+        lead_cron = dict(step_cron)
+        lead_cron['hour'] = str(lead_minute_of_day // 60)
+        lead_cron['minute'] = str(lead_minute_of_day % 60)
+
+        return lead_cron
     
     def __create_step_finish_rule(self, index, job_name, step_props, replication_event_bus):
         """Helper class private method to create a finish (custom) rule in EventBridge """
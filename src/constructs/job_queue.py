@@ -0,0 +1,82 @@
+from aws_cdk import (
+    Duration,
+    Environment,
+    aws_lambda as lambda_,
+    aws_iam as iam,
+    aws_events as events,
+    aws_events_targets as event_targets
+)
+
+from os import path;
+
+from constructs import Construct
+
+class JobQueueConstruct(Construct):
+    """ Class to represent the job queue lambda function. Used by cron rules of job flows to enqueue job runs with a priority and deadline,
+    and by a rate rule per queue to dispatch queued job runs onto available instance capacity (priority and earliest deadline order)
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, queue_props: dict, env: Environment, replication_core_layer: lambda_.ILayerVersion, **kwargs) -> None:
+        """ Class Constructor. Will create the job queue lambda function and dispatch rules based on properties specified as parameter
+
+        Parameters
+        ----------
+        queue_props : dict
+            dict with required properties for lambda function and rules creation.
+            For more details check config/workflows_config.py documentation and examples.
+
+        env: Environment
+            Environment object with region and account details (available only on deployment time)
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+        """
+
+        super().__init__(scope, construct_id, **kwargs)
+
+        lambda_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'lambda-common-role',
+            role_name= queue_props['lambda_replication_common_role_name']
+        )
+
+        self.function = lambda_.Function(
+            scope= self,
+            id= 'job_queue_lambda',
+            function_name= queue_props['function_name'],
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "job_queue")),
+            handler= "job_queue.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            timeout= Duration.seconds(60),
+            environment= {
+                'REPLICATION_JOB_QUEUE_TABLE_NAME': queue_props['replication_job_queue_table_name'],
+                'REPLICATION_INSTANCES_TABLE_NAME': queue_props['replication_instances_table_name'],
+                'REPLICATION_DURATIONS_TABLE_NAME': queue_props['replication_durations_table_name'],
+                'DEFAULT_QUEUE_NAME': queue_props['queue_names'][0],
+                'DEFAULT_PRIORITY': str(queue_props['default_priority']),
+                'DEFAULT_DEADLINE_MINUTES': str(queue_props['default_deadline_minutes']),
+                'DEFAULT_MAX_CONCURRENT_TASKS': str(queue_props['max_concurrent_tasks_per_instance'])
+            }
+        )
+
+        # Cron rules of job flows (deployed on config stack) target the function to enqueue job runs
+        self.function.add_permission(
+            id= 'job_flow_cron_rules_permission',
+            principal= iam.ServicePrincipal('events.amazonaws.com'),
+            source_arn= f'arn:aws:events:{env.region}:{env.account}:rule/*-cron-rule'
+        )
+
+        for queue_name in queue_props['queue_names']:
+            dispatch_rule = events.Rule(
+                scope= self,
+                id= f'{queue_name}_dispatch_rule',
+                rule_name= f'replication-job-queue-{queue_name}-dispatch-rule',
+                schedule= events.Schedule.rate(Duration.minutes(queue_props['dispatch_rate_minutes']))
+            )
+
+            dispatch_rule.add_target(event_targets.LambdaFunction(
+                handler= self.function,
+                event= events.RuleTargetInput.from_object({'Action': 'dispatch', 'Queue': queue_name})
+            ))
@@ -0,0 +1,117 @@
+from aws_cdk import (
+    Environment,
+    aws_lambda as lambda_,
+    aws_stepfunctions as stepfunctions,
+    aws_iam as iam
+)
+
+from os import path;
+import json;
+
+from constructs import Construct
+
+class ExecuteJobSetWorkflowConstruct(Construct):
+    """ Class to represent the workflow (state machine and belonging lambda functions) that will execute a set of DMS jobs 
+    (each one with the execute job workflow) with a bounded concurrency and aggregate their results
+    """
+
+    # Constant: Name of the (distributed) map state running the jobs of the set
+    MAP_STATE_NAME = 'Run jobs'
+
+    # Constant: Supported job scheduling modes. 'fixed' runs every job on the input instance, 'bin_packing' packs jobs onto scheduled instances
+    SCHEDULING_MODES = ['fixed', 'bin_packing']
+
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, replication_core_layer: lambda_.ILayerVersion, **kwargs) -> None:
+        """ Class Constructor. Will create a workflow (state machine and belonging lambdas) based on properties specified as parameter
+        Lambdas include: 1/ for listing the jobs of a set from DynamoDB and summarizing the results of their execution and 2/ for scheduling 
+        (bin packing) jobs onto instances based on their estimated needs
+        
+        Parameters
+        ----------
+        workflow_props : dict
+            dict with required properties for workflow creation.
+            For more details check config/workflows_config.py documentation and examples.
+
+        env: Environment
+            Environment object with region and account details (available only on deployment time)
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+        """
+
+        super().__init__(scope, construct_id, **kwargs)
+
+        scheduling_mode = workflow_props['scheduling_mode']
+        if scheduling_mode not in self.SCHEDULING_MODES:
+            raise ValueError(f'Unsupported scheduling mode {scheduling_mode}. Supported modes are {self.SCHEDULING_MODES}')
+        
+        lambda_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'lambda-common-role',
+            role_name= workflow_props['lambda_replication_common_role_name']
+        )
+        
+        job_set_lambda = lambda_.Function(
+            scope= self,
+            id= 'job_set_lambda',
+            function_name= 'job_set',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "job_set")),
+            handler= "job_set.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            environment= {
+                'REPLICATION_JOBS_TABLE_NAME': workflow_props['replication_jobs_table_name']
+            }
+        )
+
+        schedule_jobs_lambda = lambda_.Function(
+            scope= self,
+            id= 'schedule_jobs_lambda',
+            function_name= 'schedule_jobs',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "schedule_jobs")),
+            handler= "schedule_jobs.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            environment= {
+                'REPLICATION_JOBS_TABLE_NAME': workflow_props['replication_jobs_table_name'],
+                'REPLICATION_METRICS_TABLE_NAME': workflow_props['replication_metrics_table_name'],
+                'REPLICATION_INSTANCES_TABLE_NAME': workflow_props['replication_instances_table_name'],
+                'INSTANCE_CLASSES': json.dumps(workflow_props['instance_classes']),
+                'INSTANCE_CAPACITY_RATIO': str(workflow_props['instance_capacity_ratio'])
+            }
+        )
+
+        notifications_topic_arn = f"arn:aws:sns:{env.region}:{env.account}:{workflow_props['notifications_topic_name']}"
+        execute_job_state_machine_arn = f"arn:aws:states:{env.region}:{env.account}:stateMachine:{workflow_props['execute_job_state_machine_name']}"
+        create_instance_state_machine_arn = f"arn:aws:states:{env.region}:{env.account}:stateMachine:{workflow_props['create_instance_state_machine_name']}"
+        delete_instance_state_machine_arn = f"arn:aws:states:{env.region}:{env.account}:stateMachine:{workflow_props['delete_instance_state_machine_name']}"
+        
+        workflow_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'workflow-common-role',
+            role_name= workflow_props['workflow_replication_common_role_name']
+        )
+        
+        execute_job_set_state_machine_file = open('src/code/stepfunctions/execute_job_set_workflow.asl.json')
+        execute_job_set_state_machine_definition = json.load(execute_job_set_state_machine_file)
+        execute_job_set_state_machine_definition['States'][self.MAP_STATE_NAME]['MaxConcurrency'] = workflow_props['max_concurrency']
+        
+        execute_job_set_state_machine = stepfunctions.CfnStateMachine(
+            scope= self,
+            id= 'execute_job_set_state_machine',
+            state_machine_name= workflow_props['state_machine_name'],
+            definition= execute_job_set_state_machine_definition,
+            definition_substitutions= {
+                'job_set_lambda_arn': job_set_lambda.function_arn,
+                'execute_job_state_machine_arn': execute_job_state_machine_arn,
+                'schedule_jobs_lambda_arn': schedule_jobs_lambda.function_arn,
+                'create_instance_state_machine_arn': create_instance_state_machine_arn,
+                'delete_instance_state_machine_arn': delete_instance_state_machine_arn,
+                'scheduling_mode': scheduling_mode,
+                'replication-event-bus-name': workflow_props['replication_event_bus_name'],
+                'notifications-topic-arn': notifications_topic_arn
+            },
+            role_arn= workflow_common_role.role_arn
+        )
@@ -26,7 +26,7 @@ class PostFullTaskWorkflowConstruct(Construct):
         'us-east-1': 2
     }
     
-    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, **kwargs) -> None:
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, replication_core_layer: lambda_.ILayerVersion, **kwargs) -> None:
         """ Class Constructor. Will create a workflow (state machine and belonging lambdas) based on properties specified as parameter
         Lambdas include: 1/ for duplicating replication slot of source postgres database so that checkpoint is preserved with the database
         after task deletion (when it is a full load task)
@@ -39,6 +39,9 @@ class PostFullTaskWorkflowConstruct(Construct):
 
         env: Environment
             Environment object with region and account details (available only on deployment time)
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
         """
 
         super().__init__(scope, construct_id, **kwargs)
@@ -80,7 +83,7 @@ class PostFullTaskWorkflowConstruct(Construct):
             runtime= lambda_.Runtime.PYTHON_3_8,
             code=lambda_.Code.from_asset(path.join('src/code/lambda', "duplicate_replication_slot_postgres")),
             handler= "duplicate_replication_slot_postgres.handler",
-            layers= [psycopg2_lamba_layer],
+            layers= [psycopg2_lamba_layer, replication_core_layer],
             role= lambda_common_role,
             vpc= lambda_vpc,
             security_groups= [lambda_security_group]
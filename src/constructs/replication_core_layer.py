@@ -0,0 +1,50 @@
+from aws_cdk import (
+    aws_lambda as lambda_
+)
+
+import re
+
+from constructs import Construct
+
+class ReplicationCoreLayerConstruct(Construct):
+    """ Class to represent the replication core lambda layer. Shared runtime (lazy boto3 clients, warm container caches and
+    DMS helpers) used by all the lambda functions of the framework.
+    """
+
+    # Constant: Path of the layer code. Python packages are expected under a 'python' folder as required by lambda layers
+    LAYER_CODE_PATH = 'src/code/layers/replication_core'
+
+    # Constant: Runtimes of the lambda functions using the layer
+    COMPATIBLE_RUNTIMES = [lambda_.Runtime.PYTHON_3_8, lambda_.Runtime.PYTHON_3_9]
+
+    def __init__(self, scope: Construct, construct_id: str, layer_props: dict, **kwargs) -> None:
+        """ Class Constructor. Will create a lambda layer version based on properties specified as parameter.
+        Layer version description includes the package version declared in replication_core/__init__.py
+        
+        Parameters
+        ----------
+        layer_props : dict
+            dict with required properties for layer creation.
+            For more details check config/workflows_config.py documentation and examples.
+        """
+
+        super().__init__(scope, construct_id, **kwargs)
+
+        layer_package_version = self.__get_package_version()
+
+        self.layer = lambda_.LayerVersion(
+            scope= self,
+            id= 'replication-core-layer',
+            layer_version_name= layer_props['layer_name'],
+            description= f'Replication core shared runtime version {layer_package_version}',
+            code= lambda_.Code.from_asset(self.LAYER_CODE_PATH),
+            compatible_runtimes= self.COMPATIBLE_RUNTIMES
+        )
+
+    def __get_package_version(self):
+        """Helper class private method to retrieve the version declared in the replication core package """
+
+        with open(f'{self.LAYER_CODE_PATH}/python/replication_core/__init__.py') as package_init_file:
+            package_version = re.search(r"__version__ = '([^']+)'", package_init_file.read()).group(1)
+
+        return package_version
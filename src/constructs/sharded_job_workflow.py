@@ -0,0 +1,92 @@
+from aws_cdk import (
+    Environment,
+    aws_lambda as lambda_,
+    aws_stepfunctions as stepfunctions,
+    aws_iam as iam
+)
+
+from os import path;
+import json;
+
+from constructs import Construct
+
+class ExecuteShardedJobWorkflowConstruct(Construct):
+    """ Class to represent the workflow (state machine and belonging lambda functions) that will execute a DMS job split into shards
+    (each one with the execute job workflow and its own DMS task) and aggregate their results
+    """
+
+    # Constant: Name of the map state running the shards of the job
+    MAP_STATE_NAME = 'Run shards'
+
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, replication_core_layer: lambda_.ILayerVersion, **kwargs) -> None:
+        """ Class Constructor. Will create a workflow (state machine and belonging lambdas) based on properties specified as parameter
+        Lambdas include: 1/ for planning the shards of a job (tables of each shard) from its catalog snapshot and summarizing the results
+        of their execution
+
+        Parameters
+        ----------
+        workflow_props : dict
+            dict with required properties for workflow creation.
+            For more details check config/workflows_config.py documentation and examples.
+
+        env: Environment
+            Environment object with region and account details (available only on deployment time)
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+        """
+
+        super().__init__(scope, construct_id, **kwargs)
+
+        lambda_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'lambda-common-role',
+            role_name= workflow_props['lambda_replication_common_role_name']
+        )
+
+        shard_job_lambda = lambda_.Function(
+            scope= self,
+            id= 'shard_job_lambda',
+            function_name= 'shard_job',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "shard_job")),
+            handler= "shard_job.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            environment= {
+                'REPLICATION_JOBS_TABLE_NAME': workflow_props['replication_jobs_table_name'],
+                'ARTIFACTS_BUCKET_NAME': workflow_props['artifact_bucket_name'],
+                'REPLICATION_JOBS_CONFIG_PREFIX': workflow_props['replication_jobs_config_prefix'],
+                'REPLICATION_SHARD_PLANS_PREFIX': workflow_props['replication_shard_plans_prefix'],
+                'DEFAULT_SHARD_COUNT': str(workflow_props['default_shard_count'])
+            }
+        )
+
+        notifications_topic_arn = f"arn:aws:sns:{env.region}:{env.account}:{workflow_props['notifications_topic_name']}"
+        execute_job_state_machine_arn = f"arn:aws:states:{env.region}:{env.account}:stateMachine:{workflow_props['execute_job_state_machine_name']}"
+        delete_task_state_machine_arn = f"arn:aws:states:{env.region}:{env.account}:stateMachine:{workflow_props['delete_task_state_machine_name']}"
+
+        workflow_common_role = iam.Role.from_role_name(
+            scope= self,
+            id= 'workflow-common-role',
+            role_name= workflow_props['workflow_replication_common_role_name']
+        )
+
+        execute_sharded_job_state_machine_file = open('src/code/stepfunctions/execute_sharded_job_workflow.asl.json')
+        execute_sharded_job_state_machine_definition = json.load(execute_sharded_job_state_machine_file)
+        execute_sharded_job_state_machine_definition['States'][self.MAP_STATE_NAME]['MaxConcurrency'] = workflow_props['max_concurrency']
+
+        execute_sharded_job_state_machine = stepfunctions.CfnStateMachine(
+            scope= self,
+            id= 'execute_sharded_job_state_machine',
+            state_machine_name= workflow_props['state_machine_name'],
+            definition= execute_sharded_job_state_machine_definition,
+            definition_substitutions= {
+                'shard_job_lambda_arn': shard_job_lambda.function_arn,
+                'execute_job_state_machine_arn': execute_job_state_machine_arn,
+                'delete_task_state_machine_arn': delete_task_state_machine_arn,
+                'replication-event-bus-name': workflow_props['replication_event_bus_name'],
+                'notifications-topic-arn': notifications_topic_arn
+            },
+            role_arn= workflow_common_role.role_arn
+        )
@@ -1,8 +1,11 @@
 from aws_cdk import (
+    Duration,
     Environment,
     aws_lambda as lambda_,
     aws_stepfunctions as stepfunctions,
-    aws_iam as iam
+    aws_iam as iam,
+    aws_events as events,
+    aws_events_targets as event_targets
 )
 
 from os import path;
@@ -13,9 +16,20 @@ from constructs import Construct
 class ExecuteTaskWorkflowConstruct(Construct):
     """ Class to represent the workflow (state machine and belonging lambda functions) that will create and run (until completion) a new DMS task """
 
-    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, **kwargs) -> None:
+    # Constant: Supported modes to detect DMS task completion. 'polling' describes the task periodically, 'callback' waits for DMS events
+    TASK_COMPLETION_MODES = ['polling', 'callback']
+
+    # Constant: Name of the state waiting for DMS events when in callback mode. Its timeout is the safety net polling interval
+    CALLBACK_STATE_NAME = 'Wait for task state change'
+
+    # Constant: Name of the state acquiring a task slot of the replication instance. Its retrier queues the workflow until a slot is free
+    ACQUIRE_SLOT_STATE_NAME = 'Acquire instance slot'
+
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, env: Environment, replication_core_layer: lambda_.ILayerVersion, adaptive_poller_function: lambda_.IFunction, **kwargs) -> None:
         """ Class Constructor. Will create a workflow (state machine and belonging lambdas) based on properties specified as parameter
-        Lambdas include: 1/ for task creation and 2/ for persisting checkpoint / metrics details in DynamoDB after DMS task completion
+        Lambdas include: 1/ for task creation, 2/ for persisting checkpoint / metrics details in DynamoDB after DMS task completion
+        3/ for resuming the workflow on DMS task state change events (when in callback completion mode), 4/ for acquiring and releasing
+        task slots of the replication instance (bounding concurrent tasks per instance) and 5/ for sampling DMS task progress on every status poll
         
         Parameters
         ----------
@@ -25,6 +39,12 @@ class ExecuteTaskWorkflowConstruct(Construct):
 
         env: Environment
             Environment object with region and account details (available only on deployment time)
+
+        replication_core_layer: ILayerVersion
+            Lambda layer with the replication core shared runtime used by lambda functions
+
+        adaptive_poller_function: IFunction
+            Lambda function computing the wait between status polls of the workflow
         """
 
         super().__init__(scope, construct_id, **kwargs)
@@ -42,11 +62,22 @@ class ExecuteTaskWorkflowConstruct(Construct):
             runtime= lambda_.Runtime.PYTHON_3_9,
             code=lambda_.Code.from_asset(path.join('src/code/lambda', "create_task")),
             handler= "create_task.handler",
+            layers= [replication_core_layer],
             role= lambda_common_role,
+            timeout= Duration.seconds(60),
             environment= {
                 'REPLICATION_CHECKPOINTS_TABLE_NAME': workflow_props['replication_checkpoints_table_name'],
+                'REPLICATION_JOBS_TABLE_NAME': workflow_props['replication_jobs_table_name'],
                 'ARTIFACTS_BUCKET_NAME': workflow_props['artifact_bucket_name'],
-                'REPLICATION_JOBS_CONFIG_PREFIX': workflow_props['replication_jobs_config_prefix']
+                'REPLICATION_JOBS_CONFIG_PREFIX': workflow_props['replication_jobs_config_prefix'],
+                'REPLICATION_METRICS_TABLE_NAME': workflow_props['replication_metrics_table_name'],
+                'CDC_WINDOW_DEFAULT_SECONDS': str(workflow_props['cdc_window_default_seconds']),
+                'CDC_WINDOW_MIN_SECONDS': str(workflow_props['cdc_window_min_seconds']),
+                'CDC_WINDOW_MAX_SECONDS': str(workflow_props['cdc_window_max_seconds']),
+                'SETTINGS_TUNING_SMALL_TABLE_BYTES': str(workflow_props['settings_tuning_small_table_bytes']),
+                'SETTINGS_TUNING_LARGE_TABLE_BYTES': str(workflow_props['settings_tuning_large_table_bytes']),
+                'SETTINGS_TUNING_CDC_HIGH_BACKLOG_RATIO': str(workflow_props['settings_tuning_cdc_high_backlog_ratio']),
+                'SETTINGS_TUNING_MAX_FULL_LOAD_SUBTASKS': str(workflow_props['settings_tuning_max_full_load_subtasks'])
             }
         )
 
@@ -57,13 +88,87 @@ class ExecuteTaskWorkflowConstruct(Construct):
             runtime= lambda_.Runtime.PYTHON_3_9,
             code=lambda_.Code.from_asset(path.join('src/code/lambda', "persist_task_outputs")),
             handler= "persist_task_outputs.handler",
+            layers= [replication_core_layer],
             role= lambda_common_role,
+            timeout= Duration.seconds(300),
             environment= {
                 'REPLICATION_CHECKPOINTS_TABLE_NAME': workflow_props['replication_checkpoints_table_name'],
                 'REPLICATION_METRICS_TABLE_NAME': workflow_props['replication_metrics_table_name'],
             }
         )
 
+        sample_task_progress_lambda = lambda_.Function(
+            scope= self,
+            id= 'sample_task_progress_lambda',
+            function_name= 'sample_task_progress',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "sample_task_progress")),
+            handler= "sample_task_progress.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            timeout= Duration.seconds(30),
+            environment= {
+                'REPLICATION_PROGRESS_TABLE_NAME': workflow_props['replication_progress_table_name'],
+                'PROGRESS_SAMPLE_TTL_SECONDS': str(workflow_props['progress_sample_ttl_seconds']),
+                'PROGRESS_STALL_SAMPLES': str(workflow_props['progress_stall_samples'])
+            }
+        )
+
+        task_completion_mode = workflow_props.get('task_completion_mode', 'polling')
+        if task_completion_mode not in self.TASK_COMPLETION_MODES:
+            raise ValueError(f'Unsupported task completion mode {task_completion_mode}. Supported modes are {self.TASK_COMPLETION_MODES}')
+
+        if workflow_props['instance_slot_lease_seconds'] <= workflow_props['callback_timeout_seconds']:
+            raise ValueError('Instance slot lease seconds must be longer than callback timeout seconds, since slots are renewed on every task status check')
+
+        task_state_callback_lambda = lambda_.Function(
+            scope= self,
+            id= 'task_state_callback_lambda',
+            function_name= 'task_state_callback',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "task_state_callback")),
+            handler= "task_state_callback.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            timeout= Duration.seconds(30),
+            environment= {
+                'REPLICATION_TASK_TOKENS_TABLE_NAME': workflow_props['replication_task_tokens_table_name'],
+                'TASK_TOKEN_TTL_SECONDS': str(workflow_props['callback_timeout_seconds'] * 2)
+            }
+        )
+
+        task_state_change_rule = events.Rule(
+            scope= self,
+            id= 'task_state_change_rule',
+            rule_name= 'replication-task-state-change-rule',
+            enabled= task_completion_mode == 'callback',
+            event_pattern= events.EventPattern(
+                source= ['aws.dms'],
+                detail_type= ['DMS Replication Task State Change']
+            )
+        )
+
+        task_state_change_rule.add_target(event_targets.LambdaFunction(task_state_callback_lambda))
+
+        instance_semaphore_lambda = lambda_.Function(
+            scope= self,
+            id= 'instance_semaphore_lambda',
+            function_name= 'instance_semaphore',
+            runtime= lambda_.Runtime.PYTHON_3_9,
+            code=lambda_.Code.from_asset(path.join('src/code/lambda', "instance_semaphore")),
+            handler= "instance_semaphore.handler",
+            layers= [replication_core_layer],
+            role= lambda_common_role,
+            timeout= Duration.seconds(30),
+            environment= {
+                'REPLICATION_INSTANCES_TABLE_NAME': workflow_props['replication_instances_table_name'],
+                'REPLICATION_DURATIONS_TABLE_NAME': workflow_props['replication_durations_table_name'],
+                'DEFAULT_MAX_CONCURRENT_TASKS': str(workflow_props['max_concurrent_tasks_per_instance']),
+                'SLOT_LEASE_SECONDS': str(workflow_props['instance_slot_lease_seconds']),
+                'WAITER_LEASE_SECONDS': str(workflow_props['instance_slot_retry_max_delay_seconds'] * 2)
+            }
+        )
+
         notifications_topic_arn = f"arn:aws:sns:{env.region}:{env.account}:{workflow_props['notifications_topic_name']}"
         
         workflow_common_role = iam.Role.from_role_name(
@@ -74,6 +179,12 @@ class ExecuteTaskWorkflowConstruct(Construct):
         
         create_instance_state_machine_file = open('src/code/stepfunctions/execute_job_workflow.asl.json')
         create_instance_state_machine_definition = json.load(create_instance_state_machine_file)
+        create_instance_state_machine_definition['States'][self.CALLBACK_STATE_NAME]['TimeoutSeconds'] = workflow_props['callback_timeout_seconds']
+        acquire_slot_retrier = create_instance_state_machine_definition['States'][self.ACQUIRE_SLOT_STATE_NAME]['Retry'][0]
+        acquire_slot_retrier['IntervalSeconds'] = workflow_props['instance_slot_retry_interval_seconds']
+        acquire_slot_retrier['BackoffRate'] = workflow_props['instance_slot_retry_backoff_rate']
+        acquire_slot_retrier['MaxDelaySeconds'] = workflow_props['instance_slot_retry_max_delay_seconds']
+        acquire_slot_retrier['MaxAttempts'] = workflow_props['instance_slot_retry_max_attempts']
         
         execute_task_state_machine = stepfunctions.CfnStateMachine(
             scope= self,
@@ -85,7 +196,12 @@ class ExecuteTaskWorkflowConstruct(Construct):
                 'create_replication_task_lambda_arn': create_task_lambda.function_arn,
                 'persist_task_outputs_lambda_arn': persist_task_outputs_lambda.function_arn,
                 'replication-event-bus-name': workflow_props['replication_event_bus_name'],
-                'notifications-topic-arn': notifications_topic_arn
+                'notifications-topic-arn': notifications_topic_arn,
+                'adaptive_poller_lambda_arn': adaptive_poller_function.function_arn,
+                'task_state_callback_lambda_arn': task_state_callback_lambda.function_arn,
+                'instance_semaphore_lambda_arn': instance_semaphore_lambda.function_arn,
+                'sample_task_progress_lambda_arn': sample_task_progress_lambda.function_arn,
+                'task_completion_mode': task_completion_mode
             },
             role_arn= workflow_common_role.role_arn
         )
@@ -94,7 +210,7 @@ class ExecuteTaskWorkflowConstruct(Construct):
 class DeleteTaskWorkflowConstruct(Construct):
     """ Class to represent the workflow (state machine) that will delete an existing DMS task """
 
-    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, **kwargs) -> None:
+    def __init__(self, scope: Construct, construct_id: str, workflow_props: dict, adaptive_poller_function: lambda_.IFunction, **kwargs) -> None:
         """ Class Constructor. Will create a workflow (state machine) based on properties specified as parameter
         
         Parameters
@@ -102,6 +218,9 @@ class DeleteTaskWorkflowConstruct(Construct):
         workflow_props : dict
             dict with required properties for workflow creation.
             For more details check conifg/workflows_config.py documentation and examples.
+
+        adaptive_poller_function: IFunction
+            Lambda function computing the wait between status polls of the workflow
         """
 
         super().__init__(scope, construct_id, **kwargs)
@@ -121,7 +240,8 @@ class DeleteTaskWorkflowConstruct(Construct):
             state_machine_name= workflow_props['state_machine_name'],
             definition= delete_task_state_machine_definition,
             definition_substitutions= {
-                'replication-event-bus-name': workflow_props['replication_event_bus_name']
+                'replication-event-bus-name': workflow_props['replication_event_bus_name'],
+                'adaptive_poller_lambda_arn': adaptive_poller_function.function_arn
             },
             role_arn= workflow_common_role.role_arn
         )
\ No newline at end of file
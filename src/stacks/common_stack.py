@@ -189,7 +189,69 @@ class ReplicationCommonStack(Stack):
             removal_policy= RemovalPolicy.DESTROY
         )
         
-        dynamodb_tables = [replication_checkpoint_table, replication_metrics_table, replication_jobs_table, replication_instances_table]
+        replication_durations_table = dynamodb.Table(
+            scope= self, 
+            id= 'replication-durations-table',
+            table_name= common_props['replication_durations_table_name'],
+            partition_key= dynamodb.Attribute(
+                name= 'operation_key', 
+                type= dynamodb.AttributeType.STRING
+            ),
+            sort_key= dynamodb.Attribute(
+                name= 'recorded_at',
+                type= dynamodb.AttributeType.STRING
+            ),
+            billing_mode= dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy= RemovalPolicy.DESTROY
+        )
+        
+        replication_task_tokens_table = dynamodb.Table(
+            scope= self, 
+            id= 'replication-task-tokens-table',
+            table_name= common_props['replication_task_tokens_table_name'],
+            partition_key= dynamodb.Attribute(
+                name= 'replication_task_arn', 
+                type= dynamodb.AttributeType.STRING
+            ),
+            time_to_live_attribute= 'expires_at',
+            billing_mode= dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy= RemovalPolicy.DESTROY
+        )
+        
+        replication_progress_table = dynamodb.Table(
+            scope= self, 
+            id= 'replication-progress-table',
+            table_name= common_props['replication_progress_table_name'],
+            partition_key= dynamodb.Attribute(
+                name= 'replication_task_arn', 
+                type= dynamodb.AttributeType.STRING
+            ),
+            sort_key= dynamodb.Attribute(
+                name= 'sampled_at',
+                type= dynamodb.AttributeType.STRING
+            ),
+            time_to_live_attribute= 'expires_at',
+            billing_mode= dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy= RemovalPolicy.DESTROY
+        )
+        
+        replication_job_queue_table = dynamodb.Table(
+            scope= self, 
+            id= 'replication-job-queue-table',
+            table_name= common_props['replication_job_queue_table_name'],
+            partition_key= dynamodb.Attribute(
+                name= 'queue_name', 
+                type= dynamodb.AttributeType.STRING
+            ),
+            sort_key= dynamodb.Attribute(
+                name= 'queue_key',
+                type= dynamodb.AttributeType.STRING
+            ),
+            billing_mode= dynamodb.BillingMode.PAY_PER_REQUEST,
+            removal_policy= RemovalPolicy.DESTROY
+        )
+        
+        dynamodb_tables = [replication_checkpoint_table, replication_metrics_table, replication_jobs_table, replication_instances_table, replication_durations_table, replication_task_tokens_table, replication_progress_table, replication_job_queue_table]
 
         # ----------------------- IAM for LAMBDA / STEP FUNCTIONS ---------------------------        
         lambda_common_role = iam.Role(
@@ -214,11 +276,11 @@ class ReplicationCommonStack(Stack):
                     resources=[f'arn:aws:logs:{env.region}:{env.account}:*']
                 ),
                 iam.PolicyStatement(
-                    actions=['dynamodb:Query', 'dynamodb:GetItem', 'dynamodb:putItem', 'dynamodb:UpdateItem', 'dynamodb:BatchWriteItem'],
+                    actions=['dynamodb:Query', 'dynamodb:Scan', 'dynamodb:GetItem', 'dynamodb:putItem', 'dynamodb:UpdateItem', 'dynamodb:DeleteItem', 'dynamodb:BatchWriteItem'],
                     resources=[dynamodb_table.table_arn for dynamodb_table in dynamodb_tables]
                 ),
                 iam.PolicyStatement(
-                    actions=['dms:CreateReplicationTask', 'dms:StartReplicationTask', 'dms:DeleteReplicationTask', 'dms:CreateReplicationInstance', 'dms:DeleteReplicationInstance', 'dms:DescribeTableStatistics'],
+                    actions=['dms:CreateReplicationTask', 'dms:ModifyReplicationTask', 'dms:StartReplicationTask', 'dms:DeleteReplicationTask', 'dms:CreateReplicationInstance', 'dms:DeleteReplicationInstance', 'dms:DescribeTableStatistics'],
                     resources=[f'arn:aws:dms:{env.region}:{env.account}:*']
                 ),
                 iam.PolicyStatement(
@@ -237,6 +299,10 @@ class ReplicationCommonStack(Stack):
                     actions=['states:StartExecution', 'states:StopExecution', 'states:ListExecutions'],
                     resources=[f'arn:aws:states:{env.region}:{env.account}:stateMachine:*']
                 ),
+                iam.PolicyStatement(
+                    actions=['states:SendTaskSuccess', 'states:SendTaskFailure', 'states:DescribeExecution'],
+                    resources=[f'arn:aws:states:{env.region}:{env.account}:*']
+                ),
                 iam.PolicyStatement(
                     actions=['events:Put*', 'events:Describe*'],
                     resources=[replication_event_bus.event_bus_arn, f'arn:aws:states:{env.region}:{env.account}:event-bus/default']
@@ -273,6 +339,14 @@ class ReplicationCommonStack(Stack):
                     actions=['states:StartExecution'],
                     resources=[f'arn:aws:states:{env.region}:{env.account}:stateMachine:*']
                 ),
+                iam.PolicyStatement(
+                    actions=['states:DescribeExecution', 'states:StopExecution'],
+                    resources=[f'arn:aws:states:{env.region}:{env.account}:execution:*']
+                ),
+                iam.PolicyStatement(
+                    actions=['events:PutTargets', 'events:PutRule', 'events:DescribeRule'],
+                    resources=[f'arn:aws:events:{env.region}:{env.account}:rule/StepFunctionsGetEventsForStepFunctionsExecutionRule']
+                ),
                 iam.PolicyStatement(
                     actions=['sns:Publish'],
                     resources=[f'arn:aws:sns:{env.region}:{env.account}:*']
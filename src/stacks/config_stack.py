@@ -27,11 +27,14 @@ class ReplicationConfigStack(Stack):
             jobs_config_props= jobs_config_props
         )
 
+        # Task mode of every job, so that job flows can be validated against the jobs they execute
+        job_task_modes = {record['job_name']: record.get('task_mode', 'transient') for record in jobs_config_props['replication_jobs_records']}
+
         jobs_flow_props = config_props['jobs_flow_config']
         for index, jobs_flow_props in enumerate(jobs_flow_props):
             JobFlowConstruct(
                 scope = self, 
                 construct_id = f'JobFlowConstruct{index:02d}',
-                jobs_flow_props= jobs_flow_props
+                jobs_flow_props= {'job_task_modes': job_task_modes, **jobs_flow_props}
             )
 
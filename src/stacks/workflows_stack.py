@@ -6,6 +6,11 @@ from constructs import Construct
 from src.constructs.instance_workflow import CreateInstanceWorkflowConstruct, DeleteInstanceWorkflowConstruct
 from src.constructs.task_workflow import ExecuteTaskWorkflowConstruct, DeleteTaskWorkflowConstruct
 from src.constructs.postgres_workflow import PostFullTaskWorkflowConstruct
+from src.constructs.replication_core_layer import ReplicationCoreLayerConstruct
+from src.constructs.adaptive_poller import AdaptivePollerConstruct
+from src.constructs.job_set_workflow import ExecuteJobSetWorkflowConstruct
+from src.constructs.sharded_job_workflow import ExecuteShardedJobWorkflowConstruct
+from src.constructs.job_queue import JobQueueConstruct
 
 class ReplicationWorkflowsStack(Stack):
 
@@ -15,38 +20,87 @@ class ReplicationWorkflowsStack(Stack):
 
         create_instance_workflow_props = workflows_props['create_instance']
         execute_task_workflow_props = workflows_props['execute_task']
+        execute_job_set_workflow_props = workflows_props['execute_job_set']
+        execute_sharded_job_workflow_props = workflows_props['execute_sharded_job']
         post_full_task_postgres_workflow_props = workflows_props['post_full_task_postgres']
         delete_task_workflow_props = workflows_props['delete_task']
         delete_instance_workflow_props = workflows_props['delete_instance']
+        replication_core_layer_props = workflows_props['replication_core_layer']
+        adaptive_poller_props = workflows_props['adaptive_poller']
+        job_queue_props = workflows_props['job_queue']
+
+        replication_core_layer = ReplicationCoreLayerConstruct(
+            scope = self, 
+            construct_id = 'ReplicationCoreLayerConstruct',
+            layer_props = replication_core_layer_props
+        ).layer
+
+        adaptive_poller_function = AdaptivePollerConstruct(
+            scope = self, 
+            construct_id = 'AdaptivePollerConstruct',
+            poller_props = adaptive_poller_props,
+            replication_core_layer = replication_core_layer
+        ).function
+
+        JobQueueConstruct(
+            scope = self, 
+            construct_id = 'JobQueueConstruct',
+            queue_props = job_queue_props,
+            env = kwargs.get('env'),
+            replication_core_layer = replication_core_layer
+        )
 
         CreateInstanceWorkflowConstruct(
             scope = self, 
             construct_id = 'CreateInstanceWorkflowConstruct',
-            workflow_props = create_instance_workflow_props
+            workflow_props = create_instance_workflow_props,
+            replication_core_layer = replication_core_layer,
+            adaptive_poller_function = adaptive_poller_function
         )
 
         ExecuteTaskWorkflowConstruct(
             scope = self, 
             construct_id = 'ExecuteTaskWorkflowConstruct',
             workflow_props = execute_task_workflow_props,
-            env = kwargs.get('env')
+            env = kwargs.get('env'),
+            replication_core_layer = replication_core_layer,
+            adaptive_poller_function = adaptive_poller_function
+        )
+
+        ExecuteJobSetWorkflowConstruct(
+            scope = self, 
+            construct_id = 'ExecuteJobSetWorkflowConstruct',
+            workflow_props = execute_job_set_workflow_props,
+            env = kwargs.get('env'),
+            replication_core_layer = replication_core_layer
+        )
+
+        ExecuteShardedJobWorkflowConstruct(
+            scope = self, 
+            construct_id = 'ExecuteShardedJobWorkflowConstruct',
+            workflow_props = execute_sharded_job_workflow_props,
+            env = kwargs.get('env'),
+            replication_core_layer = replication_core_layer
         )
 
         PostFullTaskWorkflowConstruct(
             scope = self, 
             construct_id = 'PostFullTaskWorkflowConstruct',
             workflow_props = post_full_task_postgres_workflow_props,
-            env = kwargs.get('env')
+            env = kwargs.get('env'),
+            replication_core_layer = replication_core_layer
         )
 
         DeleteTaskWorkflowConstruct(
             scope = self, 
             construct_id = 'DeleteTaskWorkflowConstruct',
-            workflow_props = delete_task_workflow_props
+            workflow_props = delete_task_workflow_props,
+            adaptive_poller_function = adaptive_poller_function
         )
 
         DeleteInstanceWorkflowConstruct(
             scope = self, 
             construct_id = 'DeleteInstanceWorkflowConstruct',
-            workflow_props = delete_instance_workflow_props
+            workflow_props = delete_instance_workflow_props,
+            adaptive_poller_function = adaptive_poller_function
         )
@@ -0,0 +1,51 @@
+""" Shared test configuration. Lambda functions and the replication core layer are not installable packages, so their source
+folders are added to the import path, and boto3 clients are replaced by stubs so that tests run without AWS access.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LAYER_PATH = os.path.join(ROOT_PATH, 'src', 'code', 'layers', 'replication_core', 'python')
+LAMBDA_PATH = os.path.join(ROOT_PATH, 'src', 'code', 'lambda')
+
+sys.path.insert(0, LAYER_PATH)
+
+def import_lambda(name):
+    """ Function to import the module of a lambda function by its folder name """
+
+    lambda_path = os.path.join(LAMBDA_PATH, name)
+    if lambda_path not in sys.path: sys.path.insert(0, lambda_path)
+
+    return __import__(name)
+
+class StubClient:
+    """ Class representing a boto3 client stub. Calls are recorded, and answered by the handler registered for the operation """
+
+    def __init__(self, **handlers):
+        self.calls = []
+        self.handlers = handlers
+        self.exceptions = types.SimpleNamespace()
+
+    def __getattr__(self, operation):
+        if operation not in self.handlers: raise AttributeError(operation)
+
+        def call(**kwargs):
+            self.calls.append((operation, kwargs))
+            return self.handlers[operation](**kwargs)
+
+        return call
+
+@pytest.fixture
+def stub_clients(monkeypatch):
+    """ Fixture replacing the clients of the replication core layer. Returns the dict of stub clients by service name to fill in """
+
+    from replication_core import clients
+
+    stubs = {}
+    monkeypatch.setattr(clients, '_clients', stubs)
+
+    return stubs
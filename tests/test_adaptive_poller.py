@@ -0,0 +1,41 @@
+""" Poll intervals of long running operations (adaptive_poller lambda) """
+
+import pytest
+
+from conftest import import_lambda
+
+adaptive_poller = import_lambda('adaptive_poller')
+
+@pytest.fixture
+def no_jitter(monkeypatch):
+    """ Fixture making the jitter always apply its max reduction, so that intervals are deterministic """
+
+    monkeypatch.setattr(adaptive_poller.random, 'uniform', lambda low, high: low)
+
+def test_seeded_interval_is_half_of_remaining_expected_time(no_jitter):
+    wait_seconds, phase = adaptive_poller.get_next_interval(100, 500, 0)
+
+    assert phase == 'seeded'
+    assert wait_seconds == int(200 * (1 - adaptive_poller.POLL_JITTER_RATIO))
+
+def test_seeded_interval_capped_at_max_interval(no_jitter):
+    wait_seconds, phase = adaptive_poller.get_next_interval(0, 6 * 3600, 0)
+
+    assert phase == 'seeded'
+    assert wait_seconds == int(adaptive_poller.POLL_MAX_INTERVAL_SECONDS * (1 - adaptive_poller.POLL_JITTER_RATIO))
+
+def test_seeded_interval_has_jitter():
+    wait_seconds = {adaptive_poller.get_next_interval(0, 6 * 3600, 0)[0] for _ in range(50)}
+
+    assert len(wait_seconds) > 1
+    assert max(wait_seconds) <= adaptive_poller.POLL_MAX_INTERVAL_SECONDS
+
+def test_backoff_interval_grows_up_to_max_interval(no_jitter):
+    wait_seconds = [adaptive_poller.get_next_interval(600, 500, backoff_attempt) for backoff_attempt in range(8)]
+
+    assert {phase for _, phase in wait_seconds} == {'backoff'}
+    assert wait_seconds[1][0] == 2 * wait_seconds[0][0]
+    assert wait_seconds[-1][0] == int(adaptive_poller.POLL_MAX_INTERVAL_SECONDS * (1 - adaptive_poller.POLL_JITTER_RATIO))
+
+def test_backoff_without_expected_duration(no_jitter):
+    assert adaptive_poller.get_next_interval(10, 0, 0) == (int(adaptive_poller.POLL_BASE_INTERVAL_SECONDS * (1 - adaptive_poller.POLL_JITTER_RATIO)), 'backoff')
@@ -0,0 +1,61 @@
+""" Job artifacts (task settings and mappings) compiled inline in job records """
+
+import json
+import zlib
+import base64
+import hashlib
+from collections import OrderedDict
+
+import pytest
+
+from conftest import StubClient
+from replication_core import artifacts
+
+def get_job_record(settings, mappings):
+    """ Function to build a job record with artifacts compiled inline as JobConfigConstruct does """
+
+    job_artifacts_minified = json.dumps({'settings': settings, 'mappings': mappings}, separators=(',', ':'), sort_keys=True).encode()
+
+    return {
+        'job_artifacts_hash': hashlib.sha256(job_artifacts_minified).hexdigest(),
+        'job_artifacts_location': 'inline',
+        'job_artifacts_encoding': artifacts.JOB_ARTIFACTS_ENCODING,
+        'job_artifacts': base64.b64encode(zlib.compress(job_artifacts_minified, 9)).decode(),
+        'settings_profile': ''
+    }
+
+@pytest.fixture
+def decoded_artifacts_cache(monkeypatch):
+    """ Fixture replacing the cache of decoded artifacts by an empty one holding 2 entries """
+
+    cache = OrderedDict()
+    monkeypatch.setattr(artifacts, '_decoded_artifacts', cache)
+    monkeypatch.setattr(artifacts, 'DECODED_ARTIFACTS_CACHE_MAX_ENTRIES', 2)
+
+    return cache
+
+def test_job_record_passed_is_not_read_again(stub_clients, decoded_artifacts_cache):
+    stub_clients['dynamodb'] = StubClient()
+    job_record = get_job_record({'Logging': {}}, {'rules': []})
+
+    job_artifacts = artifacts.get_job_artifacts('jobs', 'job-01', 'bucket', 'prefix', job_record= job_record)
+
+    assert job_artifacts == {'settings': {'Logging': {}}, 'mappings': {'rules': []}, 'hash': job_record['job_artifacts_hash'], 'location': 'inline'}
+    assert stub_clients['dynamodb'].calls == []
+
+def test_job_record_read_without_artifacts_attributes(stub_clients, decoded_artifacts_cache):
+    job_record = get_job_record({'Logging': {}}, {'rules': []})
+    stub_clients['dynamodb'] = StubClient(get_item= lambda **kwargs: {'Item': {key: {'S': value} for key, value in job_record.items()}})
+
+    job_artifacts = artifacts.get_job_artifacts('jobs', 'job-01', 'bucket', 'prefix', job_record= {'job_name': 'job-01'})
+
+    assert job_artifacts['location'] == 'inline'
+    assert len(stub_clients['dynamodb'].calls) == 1
+
+def test_decoded_artifacts_cache_evicts_least_recently_used(decoded_artifacts_cache):
+    job_records = [get_job_record({'Index': index}, {'rules': []}) for index in range(3)]
+
+    for job_record in [job_records[0], job_records[1], job_records[0], job_records[2]]:
+        artifacts.decode_job_artifacts(job_record['job_artifacts_hash'], job_record['job_artifacts'])
+
+    assert list(decoded_artifacts_cache) == [job_records[0]['job_artifacts_hash'], job_records[2]['job_artifacts_hash']]
@@ -0,0 +1,60 @@
+""" DynamoDB batch writer: request batching and retry of unprocessed items """
+
+import pytest
+
+from conftest import StubClient
+from replication_core import batch_writes
+from replication_core.batch_writes import BatchWriter
+
+@pytest.fixture(autouse= True)
+def no_backoff(monkeypatch):
+    """ Fixture removing the backoff delay between retries """
+
+    monkeypatch.setattr(batch_writes.time, 'sleep', lambda seconds: None)
+
+def get_item(index):
+    """ Function to build an item serialized as DynamoDB attribute values """
+
+    return {'pk': {'S': f'item-{index}'}}
+
+def test_items_split_in_requests_of_max_items(stub_clients):
+    stub_clients['dynamodb'] = StubClient(batch_write_item= lambda **kwargs: {'UnprocessedItems': {}})
+    batch_writer = BatchWriter()
+    for index in range(30): batch_writer.put('table-a' if index % 2 else 'table-b', get_item(index))
+
+    stats = batch_writer.flush()
+
+    request_sizes = [sum(len(requests) for requests in kwargs['RequestItems'].values()) for _, kwargs in stub_clients['dynamodb'].calls]
+    assert request_sizes == [batch_writes.BATCH_WRITE_MAX_ITEMS, 5]
+    assert stats['WrittenItems'] == 30
+    assert stats['Requests'] == 2
+    assert stats['RetriedItems'] == 0
+
+def test_unprocessed_items_retried(stub_clients):
+    responses = iter([
+        {'UnprocessedItems': {'table-a': [{'PutRequest': {'Item': get_item(1)}}]}},
+        {}
+    ])
+    stub_clients['dynamodb'] = StubClient(batch_write_item= lambda **kwargs: next(responses))
+    batch_writer = BatchWriter()
+    for index in range(3): batch_writer.put('table-a', get_item(index))
+
+    stats = batch_writer.flush()
+
+    retried_request_items = stub_clients['dynamodb'].calls[1][1]['RequestItems']
+    assert retried_request_items == {'table-a': [{'PutRequest': {'Item': get_item(1)}}]}
+    assert stats['WrittenItems'] == 3
+    assert stats['Requests'] == 2
+    assert stats['RetriedItems'] == 1
+    assert stats['ThrottledRequests'] == 1
+
+def test_unprocessed_items_kept_after_max_attempts(stub_clients):
+    stub_clients['dynamodb'] = StubClient(batch_write_item= lambda **kwargs: {'UnprocessedItems': kwargs['RequestItems']})
+    batch_writer = BatchWriter()
+    batch_writer.put('table-a', get_item(0))
+
+    with pytest.raises(RuntimeError):
+        batch_writer.flush()
+
+    assert len(stub_clients['dynamodb'].calls) == batch_writes.BATCH_WRITE_MAX_ATTEMPTS
+    assert batch_writer._pending == [('table-a', {'PutRequest': {'Item': get_item(0)}})]
@@ -0,0 +1,28 @@
+""" TTL cache of DMS details kept across warm invocations """
+
+from replication_core import cache
+from replication_core.cache import TTLCache
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(cache.time, 'monotonic', lambda: now[0])
+    ttl_cache = TTLCache(10)
+
+    ttl_cache.set('instance', {'Status': 'available'})
+    assert ttl_cache.get('instance') == {'Status': 'available'}
+
+    now[0] = 110.0
+    assert ttl_cache.get('instance') is None
+    assert ttl_cache.stats() == {'hits': 1, 'misses': 1, 'size': 0}
+
+def test_ttl_cache_invalidate():
+    ttl_cache = TTLCache(10)
+    ttl_cache.set('a', 1)
+    ttl_cache.set('b', 2)
+
+    ttl_cache.invalidate('a')
+    assert ttl_cache.get('a') is None
+    assert ttl_cache.get('b') == 2
+
+    ttl_cache.invalidate()
+    assert ttl_cache.stats()['size'] == 0
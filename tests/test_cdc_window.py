@@ -0,0 +1,68 @@
+""" CDC window planning of cdc tasks (create_task lambda) """
+
+from datetime import datetime, timedelta
+
+from conftest import import_lambda
+
+create_task = import_lambda('create_task')
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+def get_metrics_record(backlog_seconds, replay_rate, cdc_backlog_seconds=900, cdc_window_seconds=300):
+    """ Function to build a metrics record of a cdc execution stopped backlog_seconds ago, replayed at replay_rate """
+
+    return {
+        'stop_date': (NOW - timedelta(seconds= backlog_seconds)).strftime('%Y-%m-%dT%H:%M:%S'),
+        'cdc_backlog_seconds': cdc_backlog_seconds,
+        'cdc_window_seconds': cdc_window_seconds,
+        'elapsed_time_millis': (cdc_backlog_seconds + cdc_window_seconds) / replay_rate * 1000
+    }
+
+def test_default_window_without_history():
+    cdc_plan = create_task.plan_cdc_window([], NOW)
+
+    assert cdc_plan == {'WindowSeconds': create_task.CDC_WINDOW_DEFAULT_SECONDS, 'BacklogSeconds': 0, 'ReplayRate': None, 'Reason': 'no_history'}
+
+def test_default_window_without_cdc_history():
+    cdc_plan = create_task.plan_cdc_window([{'stop_date': (NOW - timedelta(seconds= 120)).strftime('%Y-%m-%dT%H:%M:%S')}], NOW)
+
+    assert cdc_plan['WindowSeconds'] == create_task.CDC_WINDOW_DEFAULT_SECONDS
+    assert cdc_plan['BacklogSeconds'] == 120
+    assert cdc_plan['Reason'] == 'no_cdc_history'
+
+def test_window_drains_backlog():
+    cdc_plan = create_task.plan_cdc_window([get_metrics_record(1000, replay_rate= 3)], NOW)
+
+    assert cdc_plan == {'WindowSeconds': 500, 'BacklogSeconds': 1000, 'ReplayRate': 3, 'Reason': 'drain_backlog'}
+
+def test_window_uses_median_replay_rate():
+    metrics_history = [get_metrics_record(1000, replay_rate= 3), get_metrics_record(0, replay_rate= 2), get_metrics_record(0, replay_rate= 11)]
+
+    cdc_plan = create_task.plan_cdc_window(metrics_history, NOW)
+
+    assert cdc_plan['ReplayRate'] == 3
+    assert cdc_plan['WindowSeconds'] == 500
+
+def test_window_clamped_to_min():
+    cdc_plan = create_task.plan_cdc_window([get_metrics_record(10, replay_rate= 2)], NOW)
+
+    assert cdc_plan['WindowSeconds'] == create_task.CDC_WINDOW_MIN_SECONDS
+    assert cdc_plan['Reason'] == 'drain_backlog'
+
+def test_window_clamped_to_max():
+    cdc_plan = create_task.plan_cdc_window([get_metrics_record(100000, replay_rate= 2)], NOW)
+
+    assert cdc_plan['WindowSeconds'] == create_task.CDC_WINDOW_MAX_SECONDS
+    assert cdc_plan['Reason'] == 'drain_backlog'
+
+def test_max_window_when_replay_slower_than_changes():
+    for replay_rate in [0.5, 1]:
+        cdc_plan = create_task.plan_cdc_window([get_metrics_record(1000, replay_rate= replay_rate)], NOW)
+
+        assert cdc_plan['WindowSeconds'] == create_task.CDC_WINDOW_MAX_SECONDS
+        assert cdc_plan['Reason'] == 'replay_slower_than_changes'
+
+def test_backlog_never_negative():
+    cdc_plan = create_task.plan_cdc_window([get_metrics_record(-60, replay_rate= 2)], NOW)
+
+    assert cdc_plan['BacklogSeconds'] == 0
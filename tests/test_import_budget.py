@@ -0,0 +1,73 @@
+""" Import-time budget of the replication core layer. Importing the layer must not import boto3 (clients are created on first use)
+and must stay within the budget, since every framework lambda imports it on cold start.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+from conftest import LAYER_PATH
+
+# Constant: Max seconds to import every module of the replication core layer
+IMPORT_BUDGET_SECONDS = 0.15
+
+# Minimal boto3 (and botocore) packages, so that client creation can be checked without AWS dependencies installed
+BOTO3_STUB = {
+    'boto3/__init__.py': 'def client(service_name, config=None):\n    return (service_name, config)\n',
+    'botocore/__init__.py': '',
+    'botocore/config.py': 'class Config:\n    def __init__(self, **kwargs):\n        self.kwargs = kwargs\n'
+}
+
+IMPORT_SCRIPT = textwrap.dedent('''
+    import sys
+    import time
+    import pkgutil
+    import importlib
+
+    started_at = time.perf_counter()
+    import replication_core
+    for module in pkgutil.iter_modules(replication_core.__path__):
+        importlib.import_module(f'replication_core.{module.name}')
+    import_seconds = time.perf_counter() - started_at
+
+    boto3_imported_on_import = 'boto3' in sys.modules
+    from replication_core.clients import get_client
+    get_client('dms')
+    print(import_seconds, boto3_imported_on_import, 'boto3' in sys.modules)
+''')
+
+def run_import_script(stub_path):
+    """ Function to import the layer in a fresh interpreter (so that no module is already imported) with the boto3 stub """
+
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SCRIPT],
+        env= {**os.environ, 'PYTHONPATH': os.pathsep.join([LAYER_PATH, str(stub_path)]), 'PYTHONDONTWRITEBYTECODE': '1'},
+        capture_output= True, text= True, check= True
+    ).stdout.split()
+
+    return float(output[0]), output[1] == 'True', output[2] == 'True'
+
+@pytest.fixture
+def boto3_stub_path(tmp_path):
+    """ Fixture writing the boto3 stub packages. Returns the folder to add to the import path """
+
+    for file_name, content in BOTO3_STUB.items():
+        (tmp_path / file_name).parent.mkdir(exist_ok= True)
+        (tmp_path / file_name).write_text(content)
+
+    return tmp_path
+
+def test_layer_import_does_not_import_boto3_until_client_is_requested(boto3_stub_path):
+    _, boto3_imported_on_import, boto3_imported_on_client = run_import_script(boto3_stub_path)
+
+    assert not boto3_imported_on_import
+    assert boto3_imported_on_client
+
+def test_layer_import_stays_within_budget(boto3_stub_path):
+    # Best of several runs, so that a busy host does not fail the budget
+    import_seconds = min(run_import_script(boto3_stub_path)[0] for _ in range(3))
+
+    assert import_seconds < IMPORT_BUDGET_SECONDS
@@ -0,0 +1,49 @@
+""" Structured logging of the framework lambda functions """
+
+import json
+import logging
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from replication_core.logs import get_logger, log
+
+class RecordsHandler(logging.Handler):
+    """ Class representing a logging handler keeping the messages of the records it handles """
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+@pytest.fixture
+def log_messages():
+    """ Fixture collecting the messages logged by the framework logger """
+
+    handler = RecordsHandler()
+    logger = get_logger()
+    logger.addHandler(handler)
+    yield handler.messages
+    logger.removeHandler(handler)
+
+def test_log_writes_fields_as_json_line(log_messages):
+    log(JobName= 'job-01', Elapsed= Decimal('1.5'), StartedAt= datetime(2024, 1, 1), **{'Tables': 3})
+
+    assert len(log_messages) == 1
+    assert '\n' not in log_messages[0]
+    assert json.loads(log_messages[0]) == {'JobName': 'job-01', 'Elapsed': '1.5', 'StartedAt': '2024-01-01 00:00:00', 'Tables': 3}
+
+def test_log_skips_disabled_levels(log_messages):
+    log(logging.DEBUG, JobName= 'job-01')
+
+    assert log_messages == []
+
+def test_logger_configured_once():
+    logger = get_logger()
+
+    assert get_logger() is logger
+    assert len([handler for handler in logger.handlers if type(handler) is logging.StreamHandler]) == 1
+    assert logger.propagate is False
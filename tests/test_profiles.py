@@ -0,0 +1,57 @@
+""" Task settings profiles: merge of job overrides and LRU cache of resolved settings """
+
+from collections import OrderedDict
+
+import pytest
+
+from replication_core import profiles
+
+@pytest.fixture
+def resolved_settings_cache(monkeypatch):
+    """ Fixture replacing the cache of resolved settings by an empty one holding 2 entries """
+
+    cache = OrderedDict()
+    monkeypatch.setattr(profiles, '_resolved_settings', cache)
+    monkeypatch.setattr(profiles, 'RESOLVED_SETTINGS_CACHE_MAX_ENTRIES', 2)
+
+    return cache
+
+def test_deep_merge_merges_dicts_and_replaces_other_values():
+    base = {'Logging': {'EnableLogging': False, 'LogComponents': [{'Id': 'SOURCE_UNLOAD'}]}, 'TargetMetadata': {'LobMaxSize': 32}}
+    overrides = {'Logging': {'EnableLogging': True, 'LogComponents': []}, 'ErrorBehavior': {'DataErrorPolicy': 'LOG_ERROR'}}
+
+    merged = profiles.deep_merge(base, overrides)
+
+    assert merged == {
+        'Logging': {'EnableLogging': True, 'LogComponents': []},
+        'TargetMetadata': {'LobMaxSize': 32},
+        'ErrorBehavior': {'DataErrorPolicy': 'LOG_ERROR'}
+    }
+    assert list(merged) == ['Logging', 'TargetMetadata', 'ErrorBehavior']
+    assert base['Logging'] == {'EnableLogging': False, 'LogComponents': [{'Id': 'SOURCE_UNLOAD'}]}
+
+def test_deep_merge_replaces_dict_with_scalar():
+    assert profiles.deep_merge({'Section': {'Key': 1}}, {'Section': None}) == {'Section': None}
+
+def test_resolve_settings_reuses_cached_settings(resolved_settings_cache):
+    resolved_settings, settings_hash = profiles.resolve_settings({'A': {'B': 1}}, {'A': {'C': 2}})
+    cached_settings, cached_hash = profiles.resolve_settings({'A': {'B': 1}}, {'A': {'C': 2}})
+
+    assert resolved_settings == {'A': {'B': 1, 'C': 2}}
+    assert cached_settings is resolved_settings
+    assert cached_hash == settings_hash
+
+def test_resolve_settings_changes_hash_with_profile(resolved_settings_cache):
+    _, settings_hash = profiles.resolve_settings({'A': 1}, {})
+    _, changed_hash = profiles.resolve_settings({'A': 2}, {})
+
+    assert changed_hash != settings_hash
+
+def test_resolve_settings_evicts_least_recently_used(resolved_settings_cache):
+    _, first_hash = profiles.resolve_settings({'A': 1}, {})
+    _, second_hash = profiles.resolve_settings({'A': 2}, {})
+    profiles.resolve_settings({'A': 1}, {})
+    _, third_hash = profiles.resolve_settings({'A': 3}, {})
+
+    assert list(resolved_settings_cache) == [first_hash, third_hash]
+    assert second_hash not in resolved_settings_cache
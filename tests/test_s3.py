@@ -0,0 +1,79 @@
+""" ETag revalidated cache of S3 JSON objects (task settings and mappings) kept across warm invocations """
+
+import io
+import json
+
+import pytest
+
+from conftest import StubClient
+from replication_core.s3 import S3JsonCache
+
+class ClientError(Exception):
+    """ Class representing a botocore client error, with the response of the failed request """
+
+    def __init__(self, status_code):
+        super().__init__(status_code)
+        self.response = {'ResponseMetadata': {'HTTPStatusCode': status_code}}
+
+class StubBucket:
+    """ Class representing an S3 bucket answering conditional GETs like S3 does """
+
+    def __init__(self, objects):
+        self.objects = objects
+        self.etags = {key: 'etag-1' for key in objects}
+
+    def update(self, key, value):
+        self.objects[key] = value
+        self.etags[key] = f'etag-{int(self.etags.get(key, "etag-0").split("-")[1]) + 1}'
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        if Key not in self.objects: raise ClientError(404)
+        if IfNoneMatch == self.etags[Key]: raise ClientError(304)
+
+        return {'ETag': self.etags[Key], 'Body': io.BytesIO(json.dumps(self.objects[Key]).encode())}
+
+@pytest.fixture
+def stub_bucket(stub_clients):
+    """ Fixture replacing the S3 client by a stub serving a bucket with two JSON objects """
+
+    bucket = StubBucket({'settings.json': {'Logging': {}}, 'mappings.json': {'rules': []}})
+    s3 = StubClient(get_object= bucket.get_object)
+    s3.exceptions.ClientError = ClientError
+    stub_clients['s3'] = s3
+
+    return bucket
+
+def test_s3_json_cache_revalidates_with_etag(stub_clients, stub_bucket):
+    s3_json_cache = S3JsonCache(4)
+
+    first_read = s3_json_cache.get_json('bucket', 'settings.json')
+    second_read = s3_json_cache.get_json('bucket', 'settings.json')
+
+    assert second_read is first_read
+    assert stub_clients['s3'].calls[1] == ('get_object', {'Bucket': 'bucket', 'Key': 'settings.json', 'IfNoneMatch': 'etag-1'})
+    assert s3_json_cache.stats() == {'hits': 1, 'misses': 1, 'evictions': 0, 'size': 1, 'hit_rate': 0.5}
+
+def test_s3_json_cache_downloads_modified_objects(stub_clients, stub_bucket):
+    s3_json_cache = S3JsonCache(4)
+    s3_json_cache.get_json('bucket', 'settings.json')
+
+    stub_bucket.update('settings.json', {'Logging': {'EnableLogging': True}})
+
+    assert s3_json_cache.get_json('bucket', 'settings.json') == {'Logging': {'EnableLogging': True}}
+    assert s3_json_cache.stats()['misses'] == 2
+
+def test_s3_json_cache_raises_errors_other_than_not_modified(stub_clients, stub_bucket):
+    s3_json_cache = S3JsonCache(4)
+
+    with pytest.raises(ClientError):
+        s3_json_cache.get_json('bucket', 'missing.json')
+
+def test_s3_json_cache_evicts_least_recently_used(stub_clients, stub_bucket):
+    s3_json_cache = S3JsonCache(1)
+
+    s3_json_cache.get_json('bucket', 'settings.json')
+    s3_json_cache.get_json('bucket', 'mappings.json')
+    s3_json_cache.get_json('bucket', 'settings.json')
+
+    assert 'IfNoneMatch' not in stub_clients['s3'].calls[2][1]
+    assert s3_json_cache.stats()['evictions'] == 2
@@ -0,0 +1,46 @@
+""" In-flight progress sampling of DMS tasks (sample_task_progress lambda) """
+
+import pytest
+
+from conftest import StubClient, import_lambda
+
+sample_task_progress = import_lambda('sample_task_progress')
+
+EVENT = {'JobName': 'job-01', 'ReplicationTaskArn': 'arn:aws:dms:task:01'}
+
+@pytest.fixture
+def stub_dms(stub_clients):
+    """ Fixture replacing the DMS client by a stub describing a running full load task """
+
+    task = {
+        'Status': 'running',
+        'MigrationType': 'full-load-and-cdc',
+        'ReplicationTaskStats': {'FullLoadProgressPercent': 40, 'TablesLoaded': 2, 'TablesLoading': 1, 'ElapsedTimeMillis': 60000}
+    }
+    stub_clients['dms'] = StubClient(describe_replication_tasks= lambda **kwargs: {'ReplicationTasks': [task]})
+
+    return stub_clients['dms']
+
+def raise_throttling(**kwargs):
+    raise RuntimeError('ProvisionedThroughputExceededException')
+
+def test_progress_sampled(stub_clients, stub_dms):
+    stub_clients['dynamodb'] = StubClient(query= lambda **kwargs: {'Items': []}, put_item= lambda **kwargs: {})
+
+    task_status = sample_task_progress.handler(EVENT, None)
+
+    assert task_status['LatestStatus'] == 'running'
+    assert task_status['Progress']['full_load_progress_percent'] == 40
+    assert task_status['Progress']['stalled'] is False
+    assert [operation for operation, _ in stub_clients['dynamodb'].calls] == ['query', 'put_item']
+
+@pytest.mark.parametrize('failing_operation', ['query', 'put_item'])
+def test_status_returned_when_progress_table_fails(stub_clients, stub_dms, failing_operation):
+    handlers = {'query': lambda **kwargs: {'Items': []}, 'put_item': lambda **kwargs: {}}
+    handlers[failing_operation] = raise_throttling
+    stub_clients['dynamodb'] = StubClient(**handlers)
+
+    task_status = sample_task_progress.handler(EVENT, None)
+
+    assert task_status['LatestStatus'] == 'running'
+    assert task_status['Progress']['tables_loaded'] == 2
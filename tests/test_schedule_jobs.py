@@ -0,0 +1,48 @@
+""" Bin-packing of jobs onto replication instances (schedule_jobs lambda) """
+
+from conftest import import_lambda
+
+schedule_jobs = import_lambda('schedule_jobs')
+
+INSTANCE_CLASSES = {
+    'dms.t3.medium': {'memory_mb': 4096, 'vcpu': 2, 'max_tasks': 3},
+    'dms.c5.xlarge': {'memory_mb': 8192, 'vcpu': 4, 'max_tasks': 5}
+}
+
+def get_job_demands(*demands):
+    """ Function to build job demands from (memory, vcpu) tuples """
+
+    return [{'JobName': f'job-{index}', 'MemoryMb': memory_mb, 'Vcpu': vcpu} for index, (memory_mb, vcpu) in enumerate(demands)]
+
+def test_jobs_packed_first_fit_decreasing():
+    job_demands = get_job_demands((1000, 0.4), (3000, 0.5), (1000, 0.4), (2000, 0.5))
+
+    instance_bins = schedule_jobs.pack_jobs(job_demands, INSTANCE_CLASSES, 0.5)
+
+    assert [instance_bin['JobNames'] for instance_bin in instance_bins] == [['job-1', 'job-0'], ['job-3', 'job-2']]
+    assert [instance_bin['InstanceClass'] for instance_bin in instance_bins] == ['dms.c5.xlarge', 'dms.c5.xlarge']
+    assert instance_bins[0]['MemoryMb'] == 4000
+    assert instance_bins[0]['Vcpu'] == 0.9
+
+def test_smallest_class_picked():
+    instance_bins = schedule_jobs.pack_jobs(get_job_demands((500, 0.25), (500, 0.25)), INSTANCE_CLASSES, 0.5)
+
+    assert len(instance_bins) == 1
+    assert instance_bins[0]['InstanceClass'] == 'dms.t3.medium'
+
+def test_max_tasks_respected():
+    instance_bins = schedule_jobs.pack_jobs(get_job_demands(*[(100, 0.1)] * 7), INSTANCE_CLASSES, 0.5)
+
+    assert [len(instance_bin['JobNames']) for instance_bin in instance_bins] == [5, 2]
+    assert [instance_bin['InstanceClass'] for instance_bin in instance_bins] == ['dms.c5.xlarge', 'dms.t3.medium']
+
+def test_vcpu_bound_jobs():
+    instance_bins = schedule_jobs.pack_jobs(get_job_demands((100, 1.5), (100, 1.5)), INSTANCE_CLASSES, 0.5)
+
+    assert len(instance_bins) == 2
+
+def test_oversized_job_runs_alone_on_largest_class():
+    instance_bins = schedule_jobs.pack_jobs(get_job_demands((6000, 1), (500, 0.25)), INSTANCE_CLASSES, 0.5)
+
+    assert [instance_bin['JobNames'] for instance_bin in instance_bins] == [['job-0'], ['job-1']]
+    assert instance_bins[0]['InstanceClass'] == 'dms.c5.xlarge'
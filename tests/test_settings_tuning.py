@@ -0,0 +1,64 @@
+""" Tuning of DMS task settings from table sizes and CDC backlog """
+
+import pytest
+
+from replication_core.settings_tuning import tune_task_settings
+
+TUNING_PROPS = {'small_table_bytes': 100, 'large_table_bytes': 10000, 'cdc_high_backlog_ratio': 4, 'max_full_load_subtasks': 16}
+
+SETTINGS = {'FullLoadSettings': {'CommitRate': 10000, 'CreatePkAfterFullLoad': False}, 'Logging': {'EnableLogging': True}}
+
+def test_full_load_interpolates_by_largest_table():
+    tables = [{'size': 50}, {'size': 1000}]
+
+    tuned_settings, settings_tuning = tune_task_settings(SETTINGS, 'full-load-and-cdc', tables, [], None, TUNING_PROPS)
+
+    assert settings_tuning['Load'] == 0.5
+    assert settings_tuning['Reason'] == 'table_sizes'
+    assert settings_tuning['Values'] == {
+        'FullLoadSettings.MaxFullLoadSubTasks': 2,
+        'FullLoadSettings.CommitRate': 27500,
+        'TargetMetadata.ParallelLoadThreads': 4,
+        'TargetMetadata.ParallelLoadBufferSize': 550
+    }
+    assert tuned_settings['FullLoadSettings'] == {'CommitRate': 27500, 'CreatePkAfterFullLoad': False, 'MaxFullLoadSubTasks': 2}
+    assert tuned_settings['Logging'] is SETTINGS['Logging']
+    assert SETTINGS['FullLoadSettings'] == {'CommitRate': 10000, 'CreatePkAfterFullLoad': False}
+
+@pytest.mark.parametrize('table_bytes, load, commit_rate', [(10, 0, 5000), (100, 0, 5000), (10000, 1, 50000), (10 ** 9, 1, 50000)])
+def test_full_load_load_bounded(table_bytes, load, commit_rate):
+    _, settings_tuning = tune_task_settings(SETTINGS, 'full-load-and-cdc', [{'size': table_bytes}], [], None, TUNING_PROPS)
+
+    assert settings_tuning['Load'] == load
+    assert settings_tuning['Values']['FullLoadSettings.CommitRate'] == commit_rate
+
+def test_full_load_drops_parallel_load_buffer_without_parallel_threads():
+    _, settings_tuning = tune_task_settings(SETTINGS, 'full-load-and-cdc', [{'size': 100}], [], None, TUNING_PROPS)
+
+    assert settings_tuning['Values']['TargetMetadata.ParallelLoadThreads'] == 0
+    assert 'TargetMetadata.ParallelLoadBufferSize' not in settings_tuning['Values']
+
+def test_full_load_without_catalog_tunes_subtasks_from_history():
+    metrics_history = [{'tables_loaded': 30}, {'tables_loaded': 10, 'tables_errored': 2}, {'tables_loaded': 4}]
+
+    _, settings_tuning = tune_task_settings(SETTINGS, 'full-load-and-cdc', None, metrics_history, None, TUNING_PROPS)
+
+    assert settings_tuning == {'Mode': 'auto', 'Load': None, 'Reason': 'no_catalog', 'Values': {'FullLoadSettings.MaxFullLoadSubTasks': 12}}
+
+def test_cdc_interpolates_by_backlog():
+    cdc_plan = {'WindowSeconds': 300, 'BacklogSeconds': 600}
+
+    tuned_settings, settings_tuning = tune_task_settings(SETTINGS, 'cdc', None, [], cdc_plan, TUNING_PROPS)
+
+    assert settings_tuning['Load'] == 0.5
+    assert settings_tuning['Reason'] == 'cdc_backlog'
+    assert tuned_settings['ChangeProcessingTuning']['BatchApplyTimeoutMax'] == 75
+    assert tuned_settings['ChangeProcessingTuning']['MemoryLimitTotal'] == 1536
+
+def test_errored_tables_reduce_load():
+    cdc_plan = {'WindowSeconds': 300, 'BacklogSeconds': 6000}
+
+    _, settings_tuning = tune_task_settings(SETTINGS, 'cdc', None, [{'tables_errored': 1}], cdc_plan, TUNING_PROPS)
+
+    assert settings_tuning['Load'] == 0.5
+    assert settings_tuning['Reason'] == 'cdc_backlog_with_errors'
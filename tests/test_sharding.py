@@ -0,0 +1,52 @@
+""" Table mappings of job shards """
+
+from replication_core.sharding import get_shard_mappings, get_selecting_rule
+
+MAPPINGS = {
+    'rules': [
+        {'rule-type': 'selection', 'rule-id': '1', 'rule-name': '1', 'object-locator': {'schema-name': 'public', 'table-name': '%'}, 'rule-action': 'include', 'filters': []},
+        {
+            'rule-type': 'selection', 'rule-id': '2', 'rule-name': '2', 'object-locator': {'schema-name': 'sales', 'table-name': 'orders'}, 'rule-action': 'include',
+            'filters': [{'filter-type': 'source', 'column-name': 'region', 'filter-conditions': [{'filter-operator': 'eq', 'value': 'eu'}]}]
+        },
+        {'rule-type': 'selection', 'rule-id': '3', 'rule-name': '3', 'object-locator': {'schema-name': 'public', 'table-name': 'audit_%'}, 'rule-action': 'exclude'},
+        {'rule-type': 'transformation', 'rule-id': '4', 'rule-name': '4', 'rule-target': 'schema', 'object-locator': {'schema-name': 'public'}, 'rule-action': 'rename', 'value': 'replica'}
+    ]
+}
+
+SHARDS = [
+    {'index': 0, 'tables': [{'schema_name': 'public', 'table_name': 'customers'}]},
+    {'index': 1, 'tables': [{'schema_name': 'public', 'table_name': 'invoices'}, {'schema_name': 'sales', 'table_name': 'orders'}]}
+]
+
+def test_selecting_rule():
+    assert get_selecting_rule(MAPPINGS, 'public', 'invoices')['rule-id'] == '1'
+    assert get_selecting_rule(MAPPINGS, 'sales', 'orders')['rule-id'] == '2'
+    assert get_selecting_rule(MAPPINGS, 'public', 'audit_log') is None
+    assert get_selecting_rule(MAPPINGS, 'sales', 'customers') is None
+
+def test_first_shard_keeps_job_rules_and_excludes_other_shards():
+    shard_mappings = get_shard_mappings(MAPPINGS, SHARDS, 0)
+
+    assert shard_mappings['rules'][:4] == MAPPINGS['rules']
+    assert [(rule['rule-id'], rule['rule-action'], rule['object-locator']) for rule in shard_mappings['rules'][4:]] == [
+        ('5', 'exclude', {'schema-name': 'public', 'table-name': 'invoices'}),
+        ('6', 'exclude', {'schema-name': 'sales', 'table-name': 'orders'})
+    ]
+
+def test_other_shards_include_their_tables_with_job_filters():
+    shard_mappings = get_shard_mappings(MAPPINGS, SHARDS, 1)
+
+    assert shard_mappings['rules'][0] == MAPPINGS['rules'][3]
+    assert [(rule['rule-id'], rule['rule-action'], rule['object-locator'], rule['filters']) for rule in shard_mappings['rules'][1:]] == [
+        ('5', 'include', {'schema-name': 'public', 'table-name': 'invoices'}, []),
+        ('6', 'include', {'schema-name': 'sales', 'table-name': 'orders'}, MAPPINGS['rules'][1]['filters'])
+    ]
+
+def test_job_mappings_not_modified():
+    rules = list(MAPPINGS['rules'])
+
+    get_shard_mappings(MAPPINGS, SHARDS, 0)
+    get_shard_mappings(MAPPINGS, SHARDS, 1)
+
+    assert MAPPINGS['rules'] == rules